@@ -1,7 +1,12 @@
 #!/usr/bin/env python
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
 import argparse, time
-from bs4 import BeautifulSoup
-from utils import session, save_jsonl
+from src.utils import session, save_jsonl
+from src.utils.extract import extract_article, extract_links
 
 BASE = "https://consumer.ftc.gov/scams"
 
@@ -14,31 +19,19 @@ def main():
     sess = session()
     r = sess.get(BASE)
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-
-    cards = soup.select("h3 a")
+    cards = extract_links(r.text, ("//h3//a",), BASE)
     out = []
-    for a in cards:
-        href = a.get("href")
-        if not href or href.startswith("#"):
-            continue
-        url = href if href.startswith("http") else ("https://consumer.ftc.gov" + href)
+    for url, title in cards:
         body = ""
         pub = ""
         try:
             ar = sess.get(url)
             ar.raise_for_status()
-            asoup = BeautifulSoup(ar.text, "html.parser")
-            main = asoup.select_one("main") or asoup.select_one("article") or asoup.body
-            if main:
-                paras = [p.get_text(" ", strip=True) for p in main.find_all("p")]
-                body = "\n".join([p for p in paras if p])
-            dt = asoup.select_one("time[datetime]") or asoup.select_one("time")
-            if dt:
-                pub = dt.get("datetime") or dt.get_text(" ", strip=True)
+            article = extract_article(ar.text, "scams")
+            body, pub = article.body, article.published
         except Exception:
             pass
-        out.append({"title": a.get_text(strip=True), "url": url, "published": pub, "body": body})
+        out.append({"title": title, "url": url, "published": pub, "body": body})
         if len(out) >= args.limit:
             break
         time.sleep(0.35)
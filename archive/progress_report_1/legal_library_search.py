@@ -1,8 +1,13 @@
 #!/usr/bin/env python
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
 import argparse, time
 from urllib.parse import urlencode
-from bs4 import BeautifulSoup
-from utils import session, save_jsonl
+from src.utils import session, save_jsonl
+from src.utils.extract import extract_article, extract_links, has_class
 
 BASE = "https://www.ftc.gov/legal-library/search?search=fraud"
 
@@ -17,32 +22,21 @@ def main():
     url = f"{BASE}?{urlencode({'search': args.q})}"
     r = sess.get(url)
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-
-    tiles = soup.select("h3 a, .search-results a")
+    tiles = extract_links(r.text, ("//h3//a", f"//*[{has_class('search-results')}]//a"),
+                          "https://www.ftc.gov", sep=" ")
     out = []
     seen = set()
-    for a in tiles:
-        href = a.get("href")
-        if not href:
-            continue
-        link = href if href.startswith("http") else ("https://www.ftc.gov" + href)
+    for link, title in tiles:
         if link in seen:
             continue
         seen.add(link)
-        title = a.get_text(" ", strip=True)
         body = ""
         published = ""
         try:
             ar = sess.get(link)
             ar.raise_for_status()
-            psoup = BeautifulSoup(ar.text, "html.parser")
-            main = psoup.select_one(".field--name-body") or psoup.find("article") or psoup.body
-            paras = [p.get_text(" ", strip=True) for p in (main.find_all("p") if main else [])]
-            body = "\n".join([p for p in paras if p])
-            dt = psoup.select_one("time[datetime]") or psoup.select_one("time")
-            if dt:
-                published = dt.get("datetime") or dt.get_text(" ", strip=True)
+            article = extract_article(ar.text, "body")
+            body, published = article.body, article.published
         except Exception:
             pass
 
@@ -1,7 +1,12 @@
 #!/usr/bin/env python
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
 import argparse, time, feedparser
-from bs4 import BeautifulSoup
-from utils import session, save_jsonl
+from src.utils import session, save_jsonl
+from src.utils.extract import extract_article
 
 # Known FTC feed endpoints (from https://www.ftc.gov/news-events/stay-connected/ftc-rss-feeds)
 FEEDS = {
@@ -16,10 +21,7 @@ def extract_body(sess, url):
     try:
         r = sess.get(url)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        container = soup.select_one(".field--name-body") or soup.find("article") or soup.body
-        paras = [p.get_text(" ", strip=True) for p in (container.find_all("p") if container else [])]
-        return "\n".join([p for p in paras if p])
+        return extract_article(r.text, "body").body
     except Exception:
         return ""
 
@@ -7,6 +7,8 @@ import re
 import numpy as np
 from pathlib import Path
 
+from src.detect.taxonomy import FRAUD_TAXONOMY
+
 def render(loader):
     """Render the enhanced analytics page"""
     
@@ -286,23 +288,13 @@ def calculate_cooccurrence(df, keywords):
     if len(df) == 0:
         return None
     
-    n = len(keywords)
-    cooccurrence = np.zeros((n, n))
-    
-    for _, row in df.iterrows():
-        # Convert to string to handle NaN/float values
-        body = str(row.get('body', '')) if pd.notna(row.get('body')) else ''
-        body_lower = body.lower()
-        
-        # Check which keywords appear in this article
-        present_keywords = [i for i, kw in enumerate(keywords) if kw in body_lower]
-        
-        # Increment co-occurrence for all pairs
-        for i in present_keywords:
-            for j in present_keywords:
-                cooccurrence[i][j] += 1
+    # Keyword presence per article, read from the precomputed term counts
+    presence = np.array([
+        [bool(counts.get(kw) or counts.get(kw + '*')) for kw in keywords]
+        for counts in df['term_counts']
+    ], dtype=int).reshape(len(df), len(keywords))
     
-    return cooccurrence
+    return (presence.T @ presence).astype(float)
 
 def render_geographic_analysis(df):
     """Geographic analysis of fraud data"""
@@ -361,42 +353,16 @@ def render_network_analysis(df):
     
     st.info("This visualization shows how different fraud categories relate to each other based on keyword co-occurrence")
     
-    # Define fraud categories
-    categories = {
-        'Identity Theft': ['identity', 'theft', 'personal information', 'ssn'],
-        'Phishing': ['phishing', 'email scam', 'fake email'],
-        'Investment': ['investment', 'ponzi', 'pyramid', 'cryptocurrency'],
-        'Credit Card': ['credit card', 'debit card', 'unauthorized charge'],
-        'Wire Transfer': ['wire transfer', 'wire fraud', 'money transfer'],
-        'Ransomware': ['ransomware', 'malware', 'encryption'],
-        'Romance Scam': ['romance', 'dating', 'relationship'],
-        'Tech Support': ['tech support', 'computer repair', 'virus']
-    }
-    
-    # Categorize articles
-    article_categories = []
-    for _, row in df.iterrows():
-        # Convert to string to handle NaN/float values
-        title = str(row.get('title', '')) if pd.notna(row.get('title')) else ''
-        body = str(row.get('body', '')) if pd.notna(row.get('body')) else ''
-        text = (title + ' ' + body).lower()
-        
-        article_cats = []
-        for category, keywords in categories.items():
-            if any(kw in text for kw in keywords):
-                article_cats.append(category)
-        article_categories.append(article_cats)
-    
-    # Calculate category co-occurrence
-    cat_names = list(categories.keys())
+    # Category membership per article, read from the precomputed bitmasks
+    cat_names = list(FRAUD_TAXONOMY.names('network'))
     n_cats = len(cat_names)
-    co_matrix = np.zeros((n_cats, n_cats))
+    masks = df['fraud_categories'].to_numpy(dtype=np.uint64)
+    membership = np.column_stack([
+        FRAUD_TAXONOMY.has(masks, 'network', cat) for cat in cat_names
+    ]).astype(int)
     
-    for cats in article_categories:
-        for i, cat1 in enumerate(cat_names):
-            for j, cat2 in enumerate(cat_names):
-                if cat1 in cats and cat2 in cats:
-                    co_matrix[i][j] += 1
+    # Calculate category co-occurrence
+    co_matrix = (membership.T @ membership).astype(float)
     
     # Create network visualization using scatter plot
     fig = go.Figure()
@@ -429,7 +395,7 @@ def render_network_analysis(df):
         fig.add_trace(edge)
     
     # Add nodes
-    node_sizes = [sum(1 for cats in article_categories if cat in cats) for cat in cat_names]
+    node_sizes = membership.sum(axis=0).tolist()
     
     fig.add_trace(go.Scatter(
         x=x_pos,
@@ -465,8 +431,7 @@ def render_network_analysis(df):
     st.markdown("### 📊 Category Statistics")
     
     category_stats = []
-    for cat in cat_names:
-        count = sum(1 for cats in article_categories if cat in cats)
+    for cat, count in zip(cat_names, node_sizes):
         category_stats.append({'Category': cat, 'Article Count': count})
     
     stats_df = pd.DataFrame(category_stats).sort_values('Article Count', ascending=False)
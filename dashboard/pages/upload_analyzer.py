@@ -2,7 +2,6 @@ import os
 import sys
 import pandas as pd
 import streamlit as st
-import re
 
 # -------------------------------------------------------------------
 # Ensure project root is on PYTHONPATH
@@ -14,7 +13,8 @@ if ROOT not in sys.path:
 # -------------------------------------------------------------------
 # Import your actual fraud functions
 # -------------------------------------------------------------------
-from src.detect.fraud_detector import detect_fraud_for_record, count_hits
+from src.detect.fraud_detector import detect_fraud_for_record, analyze_text
+from dashboard.utils.highlight import highlight_html
 
 def render(loader):
     """Render the upload and analyze page"""
@@ -71,12 +71,8 @@ def render_text_analysis():
     
     if analyze_button and text_input:
         with st.spinner("Analyzing..."):
-            # Create a record for detection
-            record = {
-                'title': '',
-                'body': text_input
-            }
-            result = detect_fraud_for_record(record)
+            # One scan gives the score, per-keyword counts and highlight spans
+            result = analyze_text(text_input)
             
             st.markdown("---")
             st.subheader("📊 Analysis Results")
@@ -105,17 +101,8 @@ def render_text_analysis():
             if result['fraud_hits'] > 0:
                 st.markdown("#### Fraud Keywords Found:")
                 
-                # Find which keywords were detected
-                from src.detect.fraud_detector import KEYWORDS
-                detected_keywords = []
-                text_lower = text_input.lower()
-                
-                for keyword in KEYWORDS:
-                    pattern = r"\b" + re.escape(keyword.lower()) + r"\b"
-                    matches = re.findall(pattern, text_lower)
-                    if matches:
-                        count = len(matches)
-                        detected_keywords.append((keyword, count))
+                detected_keywords = sorted(result['keyword_counts'].items(),
+                                           key=lambda kv: (-kv[1], kv[0]))
                 
                 if detected_keywords:
                     keyword_df = pd.DataFrame(detected_keywords, columns=['Keyword', 'Occurrences'])
@@ -125,14 +112,7 @@ def render_text_analysis():
                 st.markdown("---")
                 st.markdown("#### 📝 Text Preview with Highlights")
                 
-                highlighted_text = text_input
-                for keyword, _ in detected_keywords:
-                    # Simple highlighting (case-insensitive)
-                    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-                    highlighted_text = pattern.sub(
-                        f'<mark style="background-color: #ffeb3b;">{keyword}</mark>',
-                        highlighted_text
-                    )
+                highlighted_text = highlight_html(text_input, result['spans'])
                 
                 st.markdown(
                     f'<div style="padding: 1rem; background-color: #f5f5f5; border-radius: 0.5rem; max-height: 400px; overflow-y: auto;">{highlighted_text}</div>',
@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import os
 from pathlib import Path
 from datetime import datetime
@@ -12,17 +13,33 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 try:
-    from src.detect.fraud_detector import detect_fraud_for_record
+    from src.detect.fraud_detector import detect_fraud_batch, frame_texts
+    from src.detect.cache import DetectionCache
+    from src.detect.parallel import scan_taxonomy_parallel
+    from src.detect.taxonomy import FRAUD_TAXONOMY
 except ImportError:
-    detect_fraud_for_record = None
+    detect_fraud_batch = None
+    frame_texts = None
+    DetectionCache = None
+    scan_taxonomy_parallel = None
+    FRAUD_TAXONOMY = None
 
 class DataLoader:
     """Handles loading and processing fraud intelligence data"""
     
-    def __init__(self):
+    def __init__(self, workers=None, use_cache=True):
         # Get project root directory
         self.project_root = Path(__file__).parent.parent.parent
         self.data_dir = self.project_root / "data"
+        # Process-pool size for the taxonomy scan (None = scan in-process)
+        self.workers = workers
+        # Persistent detection cache so reruns don't rescan unchanged articles
+        self.cache = None
+        if use_cache and DetectionCache:
+            try:
+                self.cache = DetectionCache(self.data_dir / "cache" / "detections.sqlite")
+            except Exception as e:
+                print(f"Detection cache unavailable: {e}")
         
     def load_articles(self, filters=None):
         """
@@ -52,13 +69,7 @@ class DataLoader:
                 with open(jsonl_file, 'r', encoding='utf-8') as f:
                     for line in f:
                         if line.strip():
-                            article = json.loads(line)
-                            
-                            # Apply fraud detection if not already present
-                            if 'fraud_score' not in article and detect_fraud_for_record:
-                                article = detect_fraud_for_record(article)
-                            
-                            articles.append(article)
+                            articles.append(json.loads(line))
             except Exception as e:
                 print(f"Error reading {jsonl_file}: {e}")
                 continue
@@ -69,6 +80,12 @@ class DataLoader:
         # Convert to DataFrame
         df = pd.DataFrame(articles)
         
+        # One taxonomy scan per article: term counts, fraud category bitmask,
+        # and the fraud scores of articles that have none yet
+        scan = self._tag_taxonomy(df)
+        if detect_fraud_batch and scan is not None:
+            self._score_missing(df, scan)
+        
         # DEBUG
         print(f"\n=== DEBUG DATA_LOADER ===")
         print(f"Total articles loaded from files: {len(df)}")
@@ -97,6 +114,46 @@ class DataLoader:
         
         return df
     
+    def _score_missing(self, df, scan):
+        """Fill fraud scores for rows without a fraud_score from their taxonomy scan"""
+        if 'fraud_score' not in df.columns:
+            detect_fraud_batch(df, scan=scan)
+            return
+        
+        missing = df['fraud_score'].isna().to_numpy()
+        if not missing.any():
+            return
+        
+        rows = scan._replace(counts=scan.counts[missing], categories=scan.categories[missing])
+        scores = detect_fraud_batch(df.loc[missing].copy(), scan=rows)
+        for col, values in scores.items():
+            df.loc[missing, col] = values
+    
+    def _tag_taxonomy(self, df):
+        """
+        Add 'term_counts' (sparse dict per article) and 'fraud_categories'
+        (bitmask); returns the TaxonomyScan (None without the taxonomy)
+        """
+        if FRAUD_TAXONOMY is None:
+            df['term_counts'] = [{} for _ in range(len(df))]
+            df['fraud_categories'] = np.zeros(len(df), dtype=np.uint64)
+            return None
+        
+        # Same text the detector scores, so its hits can be read from the scan
+        texts = frame_texts(df)
+        def scan_texts(texts):
+            return scan_taxonomy_parallel(texts, workers=self.workers)
+        if self.cache is not None:
+            scan = self.cache.cached_scan(texts, FRAUD_TAXONOMY, scan_texts)
+        else:
+            scan = scan_texts(texts)
+        terms = FRAUD_TAXONOMY.terms
+        df['term_counts'] = [
+            {terms[j]: int(row[j]) for j in np.flatnonzero(row)} for row in scan.counts
+        ]
+        df['fraud_categories'] = scan.categories
+        return scan
+    
     def _normalize_dataframe(self, df):
         """Normalize the dataframe structure and data types"""
         
@@ -278,30 +335,18 @@ class DataLoader:
         if len(df) == 0:
             return pd.DataFrame()
         
-        # Define fraud keywords to look for
-        fraud_keywords = [
-            'fraud', 'scam', 'phishing', 'identity theft', 'identity-theft',
-            'wire transfer', 'ransomware', 'malware', 'ponzi', 'pyramid scheme',
-            'money mule', 'business email compromise', 'fake invoice', 
-            'refund scam', 'tech support scam', 'romance scam', 
-            'cryptocurrency scam', 'investment fraud', 'credit card fraud',
-            'debit card', 'social security', 'personal information',
-            'unauthorized', 'victim', 'cybercrime', 'hacker', 'breach'
-        ]
+        if 'term_counts' not in df.columns:
+            df = df.copy()
+            self._tag_taxonomy(df)
         
-        # Count keyword occurrences
+        # Sum the precomputed counts of the dashboard keyword list
+        fraud_keywords = set(FRAUD_TAXONOMY.terms_in('list', 'dashboard')) if FRAUD_TAXONOMY else set()
         keyword_counts = Counter()
         
-        for _, row in df.iterrows():
-            # Convert to string to handle NaN/float values
-            title = str(row.get('title', '')) if pd.notna(row.get('title')) else ''
-            body = str(row.get('body', '')) if pd.notna(row.get('body')) else ''
-            text = (title + ' ' + body).lower()
-            
-            for keyword in fraud_keywords:
-                count = text.count(keyword)
-                if count > 0:
-                    keyword_counts[keyword] += count
+        for counts in df['term_counts']:
+            for term, count in counts.items():
+                if term in fraud_keywords:
+                    keyword_counts[term.rstrip('*')] += count
         
         # Convert to DataFrame
         if not keyword_counts:
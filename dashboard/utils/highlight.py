@@ -0,0 +1,25 @@
+"""HTML highlighting of keyword matches."""
+import html
+from typing import Sequence, Tuple
+
+DEFAULT_MARK_STYLE = "background-color: #ffeb3b;"
+
+
+def highlight_html(text: str, spans: Sequence[Tuple[int, int, Tuple[str, ...]]],
+                   style: str = DEFAULT_MARK_STYLE) -> str:
+    """
+    Escape ``text`` and wrap each span in ``<mark>``, in one pass.
+
+    ``spans`` must be sorted and non-overlapping ``(start, end, keywords)``
+    regions, as returned by ``analyze_text``. The tooltip lists the keywords
+    that matched inside each region.
+    """
+    parts = []
+    pos = 0
+    for start, end, keywords in spans:
+        parts.append(html.escape(text[pos:start]))
+        title = html.escape(", ".join(keywords), quote=True)
+        parts.append(f'<mark style="{style}" title="{title}">{html.escape(text[start:end])}</mark>')
+        pos = end
+    parts.append(html.escape(text[pos:]))
+    return "".join(parts).replace("\n", "<br>")
@@ -4,7 +4,8 @@ Main entry point for FTC Fraud Scrapers.
 
 Usage:
     python main.py scrape [scraper_name] [options]
-    python main.py load
+    python main.py load [--workers N] [--rescore]
+    python main.py detect [input.jsonl|-] [--out output.jsonl] [--workers N]
     python main.py all
 
 Examples:
@@ -12,6 +13,8 @@ Examples:
     python main.py scrape legal --specific-only
     python main.py scrape scams --limit 30
     python main.py load
+    python main.py load --rescore          # after editing KEYWORDS
+    python main.py detect data/dnc_complaints.jsonl --out data/dnc_complaints_scored.jsonl
     python main.py all
 """
 import sys
@@ -66,13 +69,20 @@ def run_all_scrapers():
         print("\nAll scrapers completed successfully!")
         return 0
 
-def load_to_database():
+def load_to_database(args=None):
     """Load scraped data to Supabase."""
     script = Path(__file__).parent / "src/database/supabase_load.py"
-    cmd = [sys.executable, str(script)]
+    cmd = [sys.executable, str(script)] + (args or [])
     print(f"Running: {' '.join(cmd)}")
     return subprocess.run(cmd).returncode
 
+def run_detect(args):
+    """Stream a JSONL file (or stdin) through fraud detection."""
+    script = Path(__file__).parent / "src/detect/stream.py"
+    cmd = [sys.executable, str(script)] + (args or ["-"])
+    print(f"Running: {' '.join(cmd)}", file=sys.stderr)
+    return subprocess.run(cmd).returncode
+
 def run_all():
     """Run all scrapers and load to database."""
     print("="*60)
@@ -114,7 +124,10 @@ def main():
         sys.exit(run_scraper(scraper_name, args))
 
     elif command == "load":
-        sys.exit(load_to_database())
+        sys.exit(load_to_database(sys.argv[2:]))
+
+    elif command == "detect":
+        sys.exit(run_detect(sys.argv[2:]))
 
     elif command == "all":
         sys.exit(run_all())
@@ -4,10 +4,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import os
-from supabase import create_client, Client
 import json
 from datetime import datetime
-from src.detect import detect_fraud_for_record
+from src.detect import detect_fraud_for_record, detect_fraud_batch, DetectionCache, KEYWORDS
+from src.detect.cache import content_key
+from src.detect.fraud_detector import record_text
+from src.detect.term_store import TermCountStore
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,9 +17,18 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+_client = None
+
+def get_client():
+    """Supabase client, created on first use (so importing needs no credentials)."""
+    global _client
+    if _client is None:
+        from supabase import create_client
+        _client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+    return _client
 
 TABLE = "fraud_articles"
+SCORE_CHUNK = 5_000      # records scored per detect_fraud_batch call
 
 FILE_SOURCES = {
     "ftc_press_releases.jsonl": {"source": "ftc_press", "feed": "press"},
@@ -53,24 +64,40 @@ def load_jsonl(path: Path):
                 continue
             yield json.loads(line)
 
-def normalize_record(rec: dict, source_meta: dict):
-    enriched = detect_fraud_for_record(rec, min_hits=2)
-    title = (enriched.get("title") or "").strip()
-    url = (enriched.get("url") or "").strip()
-    body = enriched.get("body") or enriched.get("content") or ""
+def build_row(rec: dict, source_meta: dict, is_fraud: bool, hits: int, score: float):
+    title = (rec.get("title") or "").strip()
+    url = (rec.get("url") or "").strip()
+    body = rec.get("body") or rec.get("content") or ""
     return {
         "source": source_meta["source"],
         "feed": source_meta.get("feed"),
         "title": title,
         "url": url,
-        "published_at": parse_ts(enriched.get("published")),
+        "published_at": parse_ts(rec.get("published")),
         "body": body,
-        "is_fraud": bool(enriched.get("is_fraud", False)),
-        "fraud_hits": int(enriched.get("fraud_hits", 0)),
-        "fraud_score": float(enriched.get("fraud_score", 0.0)),
-        "summary": enriched.get("summary"),
+        "is_fraud": is_fraud,
+        "fraud_hits": hits,
+        "fraud_score": score,
+        "summary": rec.get("summary"),
     }
 
+def normalize_record(rec: dict, source_meta: dict):
+    enriched = detect_fraud_for_record(rec, min_hits=2)
+    return build_row(
+        rec, source_meta,
+        bool(enriched.get("is_fraud", False)),
+        int(enriched.get("fraud_hits", 0)),
+        float(enriched.get("fraud_score", 0.0)),
+    )
+
+def normalize_records(records: list, source_meta: dict, workers: int = None, cache=None):
+    """Batch version of normalize_record: scores all records in one pass."""
+    scores = detect_fraud_batch(records, min_hits=2, workers=workers, cache=cache)
+    for rec, is_fraud, hits, score in zip(
+        records, scores["is_fraud"], scores["fraud_hits"], scores["fraud_score"]
+    ):
+        yield build_row(rec, source_meta, bool(is_fraud), int(hits), float(score))
+
 def chunked(iterable, size=500):
     batch = []
     for item in iterable:
@@ -81,39 +108,106 @@ def chunked(iterable, size=500):
     if batch:
         yield batch
 
-def main():
+def main(workers: int = None, use_cache: bool = True, chunk_size: int = SCORE_CHUNK):
     data_dir = Path("data")
-    all_rows = []
+    cache = DetectionCache(data_dir / "cache" / "detections.sqlite") if use_cache else None
+    # Files are scored chunk_size records at a time; only the fraud rows,
+    # de-duplicated by URL, are kept for the upsert.
+    prepared = 0
+    deduped = {}
     for filename, meta in FILE_SOURCES.items():
         path = data_dir / filename
         if not path.exists():
             print(f"Skipping missing file: {filename}")
             continue
         print(f"Loading {filename} ...")
-        for rec in load_jsonl(path):
-            row = normalize_record(rec, meta)
-            if not row["is_fraud"]:
-                continue
-            if not row["title"] or not row["url"]:
-                continue
-            all_rows.append(row)
-    print(f"Prepared {len(all_rows)} fraud articles for upsert")
-    if not all_rows:
+        for chunk in chunked(load_jsonl(path), size=chunk_size):
+            for row in normalize_records(chunk, meta, workers=workers, cache=cache):
+                if not row["is_fraud"]:
+                    continue
+                if not row["title"] or not row["url"]:
+                    continue
+                prepared += 1
+                url = row["url"]
+                if url not in deduped or row["fraud_score"] > deduped[url]["fraud_score"]:
+                    deduped[url] = row
+    print(f"Prepared {prepared} fraud articles for upsert")
+    if not deduped:
         print("No rows to insert")
         return
-    deduped = {}
-    for row in all_rows:
-        url = row["url"]
-        if url in deduped:
-            if row["fraud_score"] > deduped[url]["fraud_score"]:
-                deduped[url] = row
-        else:
-            deduped[url] = row
     rows = list(deduped.values())
     print(f"After de-dupe: {len(rows)} unique fraud articles for upsert")
     for batch in chunked(rows, size=500):
-        supabase.table(TABLE).upsert(batch, on_conflict="url").execute()
+        get_client().table(TABLE).upsert(batch, on_conflict="url").execute()
     print("Upsert complete.")
 
+def rescore(min_hits: int = 2):
+    """
+    Re-score after a KEYWORDS change without a full rescan.
+
+    Per-keyword counts are kept in data/cache/term_counts.sqlite; only the
+    added keywords are scanned for. Rows whose fraud_hits changed are
+    upserted to Supabase (if they are, or were, fraud) before the new
+    counts are committed, and the detection cache is refreshed so the next
+    load is all cache hits.
+    """
+    data_dir = Path("data")
+    records, metas = [], []
+    for filename, meta in FILE_SOURCES.items():
+        path = data_dir / filename
+        if not path.exists():
+            print(f"Skipping missing file: {filename}")
+            continue
+        for rec in load_jsonl(path):
+            records.append(rec)
+            metas.append(meta)
+    texts = [record_text(r) for r in records]
+
+    def upsert_changed(result):
+        # Runs before the store commits the new counts: if an upsert fails
+        # they are rolled back, so the next --rescore retries the same rows
+        full = len(set(texts)) * len(KEYWORDS)
+        print(f"Scanned {result.scanned_terms:,} article-keyword pairs "
+              f"(full rescan: {full:,}); {len(result.changed)} articles changed")
+        deduped = {}
+        for i in result.changed.tolist():
+            hits = int(result.hits[i])
+            if hits < min_hits and result.previous[i] < min_hits:
+                continue
+            row = build_row(records[i], metas[i], hits >= min_hits, hits, float(hits))
+            if not row["title"] or not row["url"]:
+                continue
+            url = row["url"]
+            if url not in deduped or row["fraud_score"] > deduped[url]["fraud_score"]:
+                deduped[url] = row
+        rows = list(deduped.values())
+        if not rows:
+            print("No rows to update")
+            return
+        for batch in chunked(rows, size=500):
+            get_client().table(TABLE).upsert(batch, on_conflict="url").execute()
+        print(f"Upserted {len(rows)} re-scored articles.")
+
+    store = TermCountStore(data_dir / "cache" / "term_counts.sqlite")
+    result = store.update(texts, KEYWORDS, before_commit=upsert_changed)
+
+    cache = DetectionCache(data_dir / "cache" / "detections.sqlite")
+    cache.put_many(zip((content_key(t) for t in texts), result.hits.tolist()), min_hits=min_hits)
+
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=None,
+                    help="Score records in a process pool with this many workers")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Re-score every record instead of using data/cache/detections.sqlite")
+    ap.add_argument("--chunk-size", type=int, default=SCORE_CHUNK,
+                    help="Records scored per batch; bounds memory on large files")
+    ap.add_argument("--rescore", action="store_true",
+                    help="Only re-score after a KEYWORDS change and upsert rows that changed")
+    args = ap.parse_args()
+    if args.rescore:
+        rescore()
+    else:
+        main(workers=args.workers, use_cache=not args.no_cache, chunk_size=args.chunk_size)
@@ -1,5 +1,15 @@
 """Fraud detection and classification modules."""
 
-from .fraud_detector import detect_fraud_for_record, count_hits, KEYWORDS
+from .fraud_detector import detect_fraud_for_record, detect_fraud_batch, count_hits, analyze_text, KEYWORDS
+from .matcher import KeywordMatcher, MatchResult, get_matcher, merge_spans
+from .parallel import count_hits_parallel, detect_fraud_stream, detect_fraud_jsonl, scan_taxonomy_parallel
+from .cache import DetectionCache
+from .cascade import FraudCascade, CascadeResult
 
-__all__ = ["detect_fraud_for_record", "count_hits", "KEYWORDS"]
+__all__ = [
+    "detect_fraud_for_record", "detect_fraud_batch", "count_hits", "analyze_text", "KEYWORDS",
+    "KeywordMatcher", "MatchResult", "get_matcher", "merge_spans",
+    "count_hits_parallel", "detect_fraud_stream", "detect_fraud_jsonl", "scan_taxonomy_parallel",
+    "DetectionCache",
+    "FraudCascade", "CascadeResult",
+]
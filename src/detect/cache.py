@@ -0,0 +1,178 @@
+"""
+On-disk cache of fraud detection results.
+
+Results are keyed by a hash of the record text (title + body) and by a
+version derived from the keyword list, so editing KEYWORDS silently
+invalidates every cached entry. Taxonomy scans (sparse per-term counts)
+are cached the same way, versioned by the taxonomy's term list; category
+bitmasks are rebuilt from the counts. Lookups and writes are done in bulk with
+one short-lived SQLite connection per call, which keeps the cache safe to
+use from Streamlit's script threads.
+"""
+import hashlib
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .taxonomy import Taxonomy, TaxonomyScan
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / "data" / "cache" / "detections.sqlite"
+
+# Bump when the matching rules change without the keyword list changing.
+DETECTOR_VERSION = 1
+
+# Stay well below SQLite's bound-parameter limit.
+_SQL_BATCH = 900
+
+
+def content_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def keyword_version(keywords: Iterable[str]) -> str:
+    joined = "\n".join(sorted({kw.strip().lower() for kw in keywords}))
+    return hashlib.sha1(f"{DETECTOR_VERSION}\n{joined}".encode("utf-8")).hexdigest()[:16]
+
+
+class DetectionCache:
+    """SQLite store of (text hash, keyword version) -> hits/score/is_fraud."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, keywords: Sequence[str] = None):
+        if keywords is None:
+            from .fraud_detector import KEYWORDS
+            keywords = KEYWORDS
+        self.path = Path(path)
+        self.version = keyword_version(keywords)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS detections (
+                    key TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    fraud_hits INTEGER NOT NULL,
+                    fraud_score REAL NOT NULL,
+                    is_fraud INTEGER NOT NULL,
+                    PRIMARY KEY (key, version)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scans (
+                    key TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    term_counts TEXT NOT NULL,
+                    PRIMARY KEY (key, version)
+                ) WITHOUT ROWID
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits (or rolls back) on exit and is then closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, int]:
+        """Cached hit counts for whichever of ``keys`` are present."""
+        found: Dict[str, int] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._connect() as conn:
+            for i in range(0, len(unique), _SQL_BATCH):
+                batch = unique[i:i + _SQL_BATCH]
+                marks = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, fraud_hits FROM detections "
+                    f"WHERE version = ? AND key IN ({marks})",
+                    [self.version, *batch],
+                )
+                found.update(rows)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, int]], min_hits: int = 2):
+        """Store ``(key, hits)`` pairs under the current keyword version."""
+        rows = [(key, self.version, int(hits), float(hits), int(hits >= min_hits))
+                for key, hits in entries]
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO detections "
+                "(key, version, fraud_hits, fraud_score, is_fraud) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def prune(self) -> int:
+        """Delete entries left over from older keyword lists."""
+        with self._connect() as conn:
+            cur = conn.execute("DELETE FROM detections WHERE version != ?", (self.version,))
+            return cur.rowcount
+
+    def cached_hits(self, texts: Sequence[str], score: Callable[[List[str]], Sequence[int]],
+                    min_hits: int = 2) -> np.ndarray:
+        """
+        Hit counts for ``texts``, calling ``score`` only on cache misses.
+
+        ``score`` receives the list of uncached texts and must return their
+        hit counts in the same order; the new results are written back.
+        """
+        keys = [content_key(t) for t in texts]
+        known = self.get_many(keys)
+        hits = np.fromiter((known.get(k, 0) for k in keys), dtype=np.int64, count=len(keys))
+        missing = [i for i, k in enumerate(keys) if k not in known]
+        if missing:
+            fresh = np.asarray(score([texts[i] for i in missing]), dtype=np.int64)
+            hits[missing] = fresh
+            self.put_many(zip((keys[i] for i in missing), fresh.tolist()), min_hits=min_hits)
+        return hits
+
+    def cached_scan(self, texts: Sequence[str], taxonomy: Taxonomy,
+                    scan: Callable[[List[str]], TaxonomyScan]) -> TaxonomyScan:
+        """
+        ``taxonomy.scan_many(texts)``, calling ``scan`` only on cache misses.
+
+        ``scan`` receives the list of uncached texts and must return their
+        TaxonomyScan in the same order; the new counts are written back.
+        """
+        version = keyword_version(taxonomy.terms)
+        keys = [content_key(t) for t in texts]
+        unique = list(dict.fromkeys(keys))
+        known: Dict[str, str] = {}
+        with self._connect() as conn:
+            for i in range(0, len(unique), _SQL_BATCH):
+                batch = unique[i:i + _SQL_BATCH]
+                marks = ",".join("?" * len(batch))
+                known.update(conn.execute(
+                    f"SELECT key, term_counts FROM scans WHERE version = ? AND key IN ({marks})",
+                    [version, *batch],
+                ))
+
+        counts = np.zeros((len(texts), len(taxonomy.terms)), dtype=np.int32)
+        index = taxonomy.term_index
+        missing = []
+        for i, key in enumerate(keys):
+            row = known.get(key)
+            if row is None:
+                missing.append(i)
+                continue
+            for term, n in json.loads(row).items():
+                counts[i, index[term]] = n
+        if missing:
+            fresh = scan([texts[i] for i in missing]).counts
+            counts[missing] = fresh
+            terms = taxonomy.terms
+            rows = [(keys[i], version, json.dumps({terms[j]: int(row[j]) for j in np.flatnonzero(row)}))
+                    for i, row in zip(missing, fresh)]
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO scans (key, version, term_counts) VALUES (?, ?, ?)", rows)
+        return TaxonomyScan(counts, taxonomy.masks_from_counts(counts))
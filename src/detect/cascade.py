@@ -0,0 +1,141 @@
+"""
+Cheap-first fraud scoring cascade.
+
+Most text the scrapers see is not fraud-related, so the full keyword scan
+is wasted on it. A cascade runs the cheapest test first and only hands
+survivors to the next stage:
+
+1. ``prefilter``: plain substring checks for the keywords' minimal
+   substrings (see ``KeywordMatcher.needles``); rejects most text.
+2. ``count``: keyword counting that stops once ``min_hits`` is reached.
+3. ``refine`` (optional): an expensive check, e.g. embedding similarity
+   against known fraud articles, run only for borderline hit counts.
+
+Each stage records how many texts it saw, how many it passed and the time
+spent, so the thresholds can be tuned from ``cascade.stats``.
+"""
+import time
+from typing import Callable, Dict, NamedTuple, Sequence, Tuple
+
+from .matcher import KeywordMatcher, get_matcher
+
+STAGES = ("prefilter", "count", "refine")
+
+
+class CascadeResult(NamedTuple):
+    is_fraud: bool
+    hits: int       # capped at min_hits by the early exit
+    stage: str      # stage that made the decision
+
+
+class StageStats:
+    """Counters for one cascade stage."""
+
+    __slots__ = ("seen", "passed", "seconds")
+
+    def __init__(self):
+        self.seen = 0
+        self.passed = 0
+        self.seconds = 0.0
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.seen if self.seen else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "seen": self.seen,
+            "passed": self.passed,
+            "pass_rate": round(self.pass_rate, 4),
+            "seconds": round(self.seconds, 6),
+            "us_per_text": round(1e6 * self.seconds / self.seen, 2) if self.seen else 0.0,
+        }
+
+    def __repr__(self):
+        return f"StageStats(seen={self.seen}, passed={self.passed}, seconds={self.seconds:.4f})"
+
+
+class FraudCascade:
+    """
+    Decide ``hits >= min_hits`` as cheaply as possible.
+
+    ``refine(text, hits) -> bool`` is called only when the hit count falls
+    inside ``borderline`` (inclusive ``(low, high)``, default
+    ``(1, min_hits - 1)``); its answer is final for those texts. Counts at
+    or above ``min_hits`` inside the band can be vetoed by ``refine`` too.
+    """
+
+    def __init__(self, keywords: Sequence[str] = None, min_hits: int = 2,
+                 refine: Callable[[str, int], bool] = None,
+                 borderline: Tuple[int, int] = None, matcher: KeywordMatcher = None):
+        if matcher is None:
+            if keywords is None:
+                from .fraud_detector import KEYWORDS
+                keywords = KEYWORDS
+            matcher = get_matcher(keywords)
+        self.matcher = matcher
+        self.min_hits = min_hits
+        self.refine = refine
+        low, high = borderline or (1, min_hits - 1)
+        self.borderline = (max(low, 0), min(high, min_hits))
+        self._needles = matcher.needles()
+        self.stats: Dict[str, StageStats] = {}
+        self.reset_stats()
+
+    def __repr__(self):
+        return (f"FraudCascade(min_hits={self.min_hits}, {len(self._needles)} needles, "
+                f"refine={'yes' if self.refine else 'no'})")
+
+    def reset_stats(self):
+        self.stats = {name: StageStats() for name in STAGES}
+
+    def prefilter(self, text: str) -> bool:
+        """False when no keyword can possibly occur in ``text``."""
+        low = text.lower()
+        return any(n in low for n in self._needles)
+
+    def score(self, text: str) -> CascadeResult:
+        """Run the cascade on one text."""
+        stats = self.stats
+        clock = time.perf_counter
+
+        if self.min_hits <= 0:
+            return CascadeResult(True, 0, "prefilter")
+
+        stage = stats["prefilter"]
+        start = clock()
+        passed = bool(text) and self.prefilter(text)
+        stage.seconds += clock() - start
+        stage.seen += 1
+        if not passed:
+            return CascadeResult(False, 0, "prefilter")
+        stage.passed += 1
+
+        stage = stats["count"]
+        start = clock()
+        hits = self.matcher.count_upto(text, self.min_hits)
+        stage.seconds += clock() - start
+        stage.seen += 1
+        is_fraud = hits >= self.min_hits
+        stage.passed += is_fraud
+
+        low, high = self.borderline
+        if self.refine is None or not low <= hits <= high:
+            return CascadeResult(is_fraud, hits, "count")
+
+        stage = stats["refine"]
+        start = clock()
+        is_fraud = bool(self.refine(text, hits))
+        stage.seconds += clock() - start
+        stage.seen += 1
+        stage.passed += is_fraud
+        return CascadeResult(is_fraud, hits, "refine")
+
+    def check(self, text: str) -> bool:
+        return self.score(text).is_fraud
+
+    __call__ = check
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage counters as plain dicts (JSON-friendly)."""
+        return {name: s.as_dict() for name, s in self.stats.items()}
@@ -0,0 +1,256 @@
+"""
+Structured statistics ("facts") from data spotlight text.
+
+One precompiled regex walks the text once. It finds both sentence ends and
+numbers, so each number comes back as a typed Fact together with the
+sentence it appeared in:
+
+    "Consumers reported losing $1.2 billion to impostors in 2023."
+    -> Fact(value=1.2e9, unit="usd", currency="USD", metric="losses", ...)
+    -> Fact(value=2023.0, unit="year", ...)
+
+Facts are stored in a small SQLite index (``FactIndex``) with an index on
+(metric, unit, value), so articles can be filtered by queries such as
+"losses > $1 billion" without reparsing them. ``extract_facts_many`` runs
+the extractor in a process pool for backfills.
+"""
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .parallel import default_workers, iter_chunks
+
+DEFAULT_FACTS_PATH = Path(__file__).parent.parent.parent / "data" / "cache" / "spotlight_facts.sqlite"
+
+SCALES = {"thousand": 1e3, "million": 1e6, "billion": 1e9, "trillion": 1e12,
+          "K": 1e3, "M": 1e6, "B": 1e9}
+
+# A sentence end (not "U.S. adults"), a footnote marker or month-day date
+# to skip, or a number with optional "$", scale ("million", "$1.7B") and
+# percent sign. The leading lookahead lets the scan skip ordinary text
+# quickly; case is spelled out instead of using IGNORECASE, which would
+# also make the sentence-start [A-Z] match lowercase letters.
+_TOKEN = re.compile(
+    r"""
+    (?=[.!?\[$\dJFMASOND])
+    (?:
+      (?P<end>[.!?])(?=\s*\[\d|\s+["'\u201c(]?[A-Z0-9]|\s*$)
+    | (?P<skip>\[\d+\]|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2}\b(?!,\d))
+    | (?:(?P<cur>\$)\s?|(?<![\w.,]))
+      (?P<num>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)(?![\d,]\d)
+      (?:\s*(?P<scale>[Tt]housand|[Mm]illion|[Bb]illion|[Tt]rillion)\b|(?P<abbr>[KMB])\b)?
+      (?:\s*(?P<pct>%|[Pp]ercent\b))?
+    )
+    """,
+    re.VERBOSE,
+)
+
+# What a number in a sentence counts; nearest keyword wins.
+METRICS = {
+    "losses": r"los(?:s|ses|t|ing|e)|paid|payments?|cost",
+    "reports": r"reports|complaints|fraud reports",
+    "people": r"people|consumers|victims|individuals|adults|older adults",
+}
+_METRIC = re.compile(
+    "|".join(rf"(?P<{name}>\b(?:{pattern})\b)" for name, pattern in METRICS.items()),
+    re.IGNORECASE,
+)
+
+_QUERY = re.compile(r"^\s*(?P<metric>[a-z ]+?)\s*(?P<op>>=|<=|!=|>|<|=)\s*(?P<amount>.+?)\s*$", re.IGNORECASE)
+_OPS = (">=", "<=", "!=", ">", "<", "=")
+
+
+class Fact(NamedTuple):
+    value: float
+    raw: str
+    unit: str                 # usd, percent, count or year
+    currency: Optional[str]
+    percent: bool
+    metric: Optional[str]     # losses, reports, people or None
+    sentence: str
+
+
+def _typed(m: re.Match) -> Tuple[float, str]:
+    num = m.group("num")
+    value = float(num.replace(",", ""))
+    scale = m.group("scale") or m.group("abbr")
+    if scale:
+        value *= SCALES[scale if scale in SCALES else scale.lower()]
+    if m.group("pct"):
+        return value, "percent"
+    if m.group("cur"):
+        return value, "usd"
+    if not scale and len(num) == 4 and 1900 <= value <= 2100:
+        return value, "year"
+    return value, "count"
+
+
+def _metric(keywords: List[Tuple[int, int, str]], unit: str, start: int, end: int) -> Optional[str]:
+    """The metric a number at [start, end) most likely counts, given the
+    sentence's metric keywords as (start, end, metric)."""
+    if unit == "year":
+        return None
+    best, best_dist = None, None
+    for kw_start, kw_end, name in keywords:
+        if unit == "usd" and name == "losses":
+            return name
+        dist = kw_start - end if kw_start >= end else start - kw_end
+        if best_dist is None or dist < best_dist:
+            best, best_dist = name, dist
+    return best
+
+
+def extract_facts(text: str) -> List[Fact]:
+    """Typed numbers in ``text``, in order, each with its (whitespace-normalized) sentence."""
+    if not text:
+        return []
+    facts = []
+    pending = []          # matches in the current sentence
+    sent_start = 0
+
+    def close(sent_end):
+        if not pending:
+            return
+        sentence = " ".join(text[sent_start:sent_end].split())
+        keywords = [(m.start(), m.end(), m.lastgroup)
+                    for m in _METRIC.finditer(text, sent_start, sent_end)]
+        for m in pending:
+            value, unit = _typed(m)
+            facts.append(Fact(
+                value=value,
+                raw=m.group(0).strip(),
+                unit=unit,
+                currency="USD" if m.group("cur") else None,
+                percent=unit == "percent",
+                metric=_metric(keywords, unit, m.start(), m.end()),
+                sentence=sentence,
+            ))
+        pending.clear()
+
+    for m in _TOKEN.finditer(text):
+        if m.group("end"):
+            close(m.end())
+            sent_start = m.end()
+        elif not m.group("skip"):
+            pending.append(m)
+    close(len(text))
+    return facts
+
+
+def _extract_chunk(texts: List[str]) -> List[List[Fact]]:
+    return [extract_facts(text) for text in texts]
+
+
+def extract_facts_many(texts: Iterable[str], workers: int = None,
+                       chunk_size: int = 64) -> Iterator[List[Fact]]:
+    """Facts for each text, in input order, extracted across ``workers`` processes."""
+    workers = workers or default_workers()
+    chunks = iter_chunks(texts, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _extract_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_extract_chunk, chunks):
+            yield from result
+
+
+def parse_query(query: str) -> Tuple[str, str, float, str]:
+    """
+    Parse "losses > $1 billion" into (metric, op, value, unit).
+
+    Raises ValueError for an unknown metric or an amount that is not a number.
+    """
+    m = _QUERY.match(query or "")
+    if not m:
+        raise ValueError(f"Expected '<metric> <op> <amount>', got {query!r}")
+    word = m.group("metric").strip().lower()
+    metric = word if word in METRICS else None
+    if metric is None:
+        found = _METRIC.search(word)
+        metric = found.lastgroup if found else None
+    if metric is None:
+        raise ValueError(f"Unknown metric {word!r}; expected one of {', '.join(METRICS)}")
+    amount = extract_facts(m.group("amount"))
+    if len(amount) != 1:
+        raise ValueError(f"Expected one amount, got {m.group('amount')!r}")
+    return metric, m.group("op"), amount[0].value, amount[0].unit
+
+
+class FactIndex:
+    """SQLite index of facts per article URL, queryable by metric/unit/value."""
+
+    def __init__(self, path=DEFAULT_FACTS_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        with self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS facts (
+                    url TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    value REAL NOT NULL,
+                    raw TEXT NOT NULL,
+                    unit TEXT NOT NULL,
+                    currency TEXT,
+                    metric TEXT,
+                    sentence TEXT NOT NULL,
+                    PRIMARY KEY (url, position)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS facts_by_value ON facts (metric, unit, value);
+                """
+            )
+
+    def close(self):
+        self._conn.close()
+
+    def add(self, url: str, facts: Sequence):
+        """Replace the facts stored for ``url`` (Facts or their dicts)."""
+        self.add_many([(url, facts)])
+
+    def add_many(self, articles: Iterable[Tuple[str, Sequence]]):
+        """``add`` for many (url, facts) pairs in one transaction."""
+        with self._conn:
+            for url, facts in articles:
+                rows = []
+                for i, fact in enumerate(facts):
+                    f = fact._asdict() if isinstance(fact, Fact) else fact
+                    rows.append((url, i, f["value"], f["raw"], f["unit"], f["currency"],
+                                 f["metric"], f["sentence"]))
+                self._conn.execute("DELETE FROM facts WHERE url = ?", (url,))
+                self._conn.executemany(
+                    "INSERT INTO facts (url, position, value, raw, unit, currency, metric, sentence) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    def query(self, metric: str, op: str, value: float, unit: str = None) -> Dict[str, List[Fact]]:
+        """Matching facts grouped by article URL."""
+        if op not in _OPS:
+            raise ValueError(f"Unsupported operator {op!r}")
+        sql = ("SELECT url, value, raw, unit, currency, metric, sentence FROM facts "
+               f"WHERE metric = ? AND value {'<>' if op == '!=' else op} ?")
+        params = [metric, value]
+        if unit:
+            sql += " AND unit = ?"
+            params.append(unit)
+        out: Dict[str, List[Fact]] = {}
+        for url, value, raw, unit, currency, metric, sentence in self._conn.execute(
+                sql + " ORDER BY url, position", params):
+            out.setdefault(url, []).append(
+                Fact(value, raw, unit, currency, unit == "percent", metric, sentence))
+        return out
+
+    def search(self, query: str) -> Dict[str, List[Fact]]:
+        """``query`` parsed with ``parse_query``, e.g. "losses > $1 billion"."""
+        metric, op, value, unit = parse_query(query)
+        # A bare number ("reports > 1000") compares against counts
+        return self.query(metric, op, value, None if unit == "year" else unit)
+
+    def summary(self) -> dict:
+        facts, urls = self._conn.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM facts").fetchone()
+        by_unit = dict(self._conn.execute("SELECT unit, COUNT(*) FROM facts GROUP BY unit"))
+        return {"facts": facts, "articles": urls, "by_unit": by_unit}
@@ -1,35 +1,27 @@
-import re
-
-KEYWORDS = [
-    "fraud", "frauds", "scam", "scams", "scheme", "schemes",
-    "phishing", "smishing", "vishing",
-    "identity theft", "id theft",
-    "imposter", "impersonation",
-    "business email compromise", "bec",
-    "investment scam", "investment fraud",
-    "account takeover",
-    "money mule", "money mules",
-    "skimming", "carding",
-    "check fraud", "wire fraud",
-    "refund scam", "refund fraud",
-    "crypto scam", "cryptocurrency scam", "ransomware"
-]
-
-def count_hits(text: str) -> int:
-    if not text:
-        return 0
-    t = text.lower()
-    hits = 0
-    for kw in KEYWORDS:
-        pattern = r"\b" + re.escape(kw.lower()) + r"\b"
-        hits += len(re.findall(pattern, t))
-    return hits
-
-def detect_fraud_for_record(rec: dict, min_hits: int = 2):
+import numpy as np
+
+from .matcher import KeywordMatcher, get_matcher
+from .taxonomy import FRAUD_TAXONOMY
+
+# Tier 2 scoring terms; edit them in src/detect/taxonomy.py
+KEYWORDS = list(FRAUD_TAXONOMY.terms_in("list", "detector"))
+
+def default_matcher() -> KeywordMatcher:
+    """Shared matcher for the current KEYWORDS list."""
+    return get_matcher(KEYWORDS)
+
+def record_text(rec: dict) -> str:
     title = (rec.get("title") or "").strip()
     body = (rec.get("body") or "").strip()
-    text = f"{title}\n{body}"
-    hits = count_hits(text)
+    return f"{title}\n{body}"
+
+def count_hits(text: str, matcher: KeywordMatcher = None) -> int:
+    if not text:
+        return 0
+    return (matcher or default_matcher()).count(text)
+
+def detect_fraud_for_record(rec: dict, min_hits: int = 2, matcher: KeywordMatcher = None):
+    hits = count_hits(record_text(rec), matcher)
     is_fraud = hits >= min_hits
     return {
         **rec,
@@ -37,3 +29,89 @@ def detect_fraud_for_record(rec: dict, min_hits: int = 2):
         "fraud_hits": hits,
         "fraud_score": float(hits),
     }
+
+def analyze_text(text: str, min_hits: int = 2, matcher: KeywordMatcher = None):
+    """
+    Score free text and keep the match details, from a single scan.
+
+    ``keyword_counts`` maps each keyword to its hits and ``spans`` holds
+    sorted, non-overlapping ``(start, end, keywords)`` regions into ``text``
+    (e.g. for highlighting).
+    """
+    result = (matcher or default_matcher()).scan(text or "")
+    return {
+        "is_fraud": result.total >= min_hits,
+        "fraud_hits": result.total,
+        "fraud_score": float(result.total),
+        "keyword_counts": result.counts,
+        "spans": result.regions(),
+    }
+
+
+BATCH_SIZE = 5000
+
+def frame_texts(df):
+    """title + newline + body for every row of a DataFrame, vectorized."""
+    def col(name):
+        if name not in df.columns:
+            return ""
+        return df[name].fillna("").astype(str).str.strip()
+    texts = col("title") + "\n" + col("body")
+    if isinstance(texts, str):
+        return [texts] * len(df)
+    return texts.tolist()
+
+def detect_fraud_batch(records, min_hits: int = 2, matcher: KeywordMatcher = None,
+                       batch_size: int = BATCH_SIZE, workers: int = None, cache=None,
+                       scan=None):
+    """
+    Score many records at once.
+
+    Accepts a list of record dicts or a pandas DataFrame with title/body
+    columns. Returns a dict of NumPy arrays (is_fraud, fraud_hits,
+    fraud_score) aligned with the input. A DataFrame also gets the three
+    arrays assigned as columns in place; record dicts are never copied.
+    With ``workers`` > 1 the chunks are scored in a process pool; None
+    (the default) or 1 scores them in-process. A
+    ``DetectionCache`` (built for the same keywords) skips texts that were
+    already scored.
+
+    ``scan`` is a ``TaxonomyScan`` of the same records (e.g. from
+    ``FRAUD_TAXONOMY.scan_many``); the hits are then read from its KEYWORDS
+    columns instead of scanning the texts again.
+    """
+    is_frame = hasattr(records, "columns")
+    if scan is not None:
+        hits = FRAUD_TAXONOMY.hits(scan.counts, "list", "detector")
+        return _assign(records, is_frame, hits, min_hits)
+
+    matcher = matcher or default_matcher()
+    texts = frame_texts(records) if is_frame else [record_text(r) for r in records]
+
+    def score(texts):
+        if workers and workers > 1:
+            from .parallel import count_hits_parallel
+            return count_hits_parallel(texts, matcher.keywords, workers=workers,
+                                       chunk_size=batch_size)
+        hits = np.zeros(len(texts), dtype=np.int64)
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            hits[start:start + len(chunk)] = matcher.count_many(chunk)
+        return hits
+
+    if cache is not None:
+        hits = cache.cached_hits(texts, score, min_hits=min_hits)
+    else:
+        hits = score(texts)
+    return _assign(records, is_frame, hits, min_hits)
+
+def _assign(records, is_frame, hits, min_hits):
+    result = {
+        "is_fraud": hits >= min_hits,
+        "fraud_hits": hits,
+        "fraud_score": hits.astype(np.float64),
+    }
+    if is_frame:
+        for name, values in result.items():
+            records[name] = values
+    return result
@@ -0,0 +1,251 @@
+"""
+Single-pass multi-keyword matcher.
+
+All keywords are folded into one regex (a prefix trie, so
+the engine never retries alternatives that share a prefix) and each text is
+scanned once. Counts follow the same rules as matching every keyword on its
+own with ``\\b...\\b``: a hit for "investment scam" also counts "scam".
+
+A keyword ending in ``*`` is a stem: ``impersonat*`` matches any word that
+starts with "impersonat" ("impersonate", "impersonation", ...).
+"""
+import re
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+STEM = "*"
+_WORD_RUN = re.compile(r"\w*")
+
+
+class MatchResult(NamedTuple):
+    """Outcome of scanning one text."""
+    total: int
+    counts: Dict[str, int]
+    spans: List[Tuple[str, int, int]]
+
+    def regions(self) -> List[Tuple[int, int, Tuple[str, ...]]]:
+        """Sorted, non-overlapping ``(start, end, keywords)`` regions of ``spans``."""
+        return merge_spans(self.spans)
+
+
+def merge_spans(spans: Iterable[Tuple[str, int, int]]) -> List[Tuple[int, int, Tuple[str, ...]]]:
+    """
+    Collapse ``(keyword, start, end)`` hits into sorted, non-overlapping
+    ``(start, end, keywords)`` regions, in one pass over start-ordered hits
+    (as ``KeywordMatcher.finditer`` yields them).
+    """
+    merged: List[Tuple[int, int, Tuple[str, ...]]] = []
+    cur_start = cur_end = -1
+    cur_kws: List[str] = []
+    for kw, start, end in spans:
+        if start < cur_end:
+            if end > cur_end:
+                cur_end = end
+            if kw not in cur_kws:
+                cur_kws.append(kw)
+            continue
+        if cur_kws:
+            merged.append((cur_start, cur_end, tuple(cur_kws)))
+        cur_start, cur_end, cur_kws = start, end, [kw]
+    if cur_kws:
+        merged.append((cur_start, cur_end, tuple(cur_kws)))
+    return merged
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation from a prefix trie of ``words``."""
+    trie: dict = {}
+    for word in words:
+        stem = word.endswith(STEM)
+        node = trie
+        for ch in word[:-1] if stem else word:
+            node = node.setdefault(ch, {})
+        node[""] = STEM if stem or node.get("") == STEM else True
+
+    def render(node: dict) -> str:
+        terminal = node.get("")
+        branches = [re.escape(ch) + render(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if terminal == STEM:
+            # Longer keywords first, otherwise swallow the rest of the word.
+            return "(?:" + "|".join(branches + [r"\w*"]) + ")"
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional: try the longer keyword first, fall back to
+            # the shorter one if the trailing word boundary fails.
+            body = "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Match a fixed keyword set against text in one regex scan."""
+
+    def __init__(self, keywords: Iterable[str]):
+        seen = {}
+        for kw in keywords:
+            kw = kw.strip().lower()
+            if kw:
+                seen.setdefault(kw, None)
+        self.keywords: Tuple[str, ...] = tuple(seen)
+
+        # A zero-width lookahead lets every start position report a match,
+        # so keywords that overlap each other are all counted. The leading
+        # first-character class lets the engine skip most positions cheaply.
+        if self.keywords:
+            first = "".join(sorted({re.escape(kw[0]) for kw in self.keywords}))
+            body = rf"(?=[{first}])\b(?=({_trie_pattern(self.keywords)})\b)"
+        else:
+            body = "(?!)"
+        # Texts are lowercased before scanning (as the per-keyword version
+        # did); the case-insensitive twin is only for texts whose length
+        # changes under lower(), where spans must point into the original.
+        self.pattern = re.compile(body)
+        self._ci_pattern = re.compile(body, re.IGNORECASE)
+
+        # The regex reports only the longest keyword at each start position;
+        # shorter keywords that are whole-word prefixes of it (and stems it
+        # starts with) match there too. Expansions are memoized per string.
+        self._stems = tuple(kw for kw in self.keywords if kw.endswith(STEM))
+        self._expansions: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        for kw in self.keywords:
+            if not kw.endswith(STEM):
+                self._expand(kw)
+
+    def _expand(self, found: str) -> Tuple[Tuple[str, int], ...]:
+        """``(keyword, length)`` for every keyword matching at the start of ``found``."""
+        cached = self._expansions.get(found)
+        if cached is not None:
+            return cached
+        terms = []
+        for kw in self.keywords:
+            if kw.endswith(STEM):
+                stem = kw[:-1]
+                if found.startswith(stem):
+                    terms.append((kw, _WORD_RUN.match(found, len(stem)).end()))
+            elif found.startswith(kw) and (
+                len(kw) == len(found)
+                or not (_is_word_char(kw[-1]) and _is_word_char(found[len(kw)]))
+            ):
+                terms.append((kw, len(kw)))
+        # Longest first, so the regex's own match leads.
+        terms.sort(key=lambda t: -t[1])
+        result = tuple(terms)
+        self._expansions[found] = result
+        return result
+
+    def __repr__(self):
+        return f"KeywordMatcher({len(self.keywords)} keywords)"
+
+    def finditer(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """Yield ``(keyword, start, end)`` for every hit, in text order."""
+        if not text:
+            return
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self.pattern.finditer(lowered)
+        else:
+            matches = self._ci_pattern.finditer(text)
+        expand = self._expand
+        for m in matches:
+            start = m.start()
+            for kw, length in expand(m.group(1).lower()):
+                yield kw, start, start + length
+
+    def search(self, text: str) -> bool:
+        """True as soon as any keyword is found (stops at the first hit)."""
+        return bool(text) and self.pattern.search(text.lower()) is not None
+
+    def count(self, text: str) -> int:
+        """Total number of keyword hits in ``text``."""
+        if not text:
+            return 0
+        expand = self._expand
+        return sum(len(expand(m.group(1))) for m in self.pattern.finditer(text.lower()))
+
+    def count_upto(self, text: str, limit: int) -> int:
+        """Hit count that stops scanning once ``limit`` is reached (capped at ``limit``)."""
+        if not text or limit <= 0:
+            return 0
+        expand = self._expand
+        total = 0
+        for m in self.pattern.finditer(text.lower()):
+            total += len(expand(m.group(1)))
+            if total >= limit:
+                return limit
+        return total
+
+    def needles(self) -> Tuple[str, ...]:
+        """
+        Minimal substrings that any hit must contain.
+
+        A text whose lowercased form contains none of these cannot match, so
+        ``any(n in text for n in needles)`` is a cheap reject test.
+        """
+        needles: List[str] = []
+        for word in sorted({kw.rstrip(STEM) for kw in self.keywords}, key=len):
+            if not any(n in word for n in needles):
+                needles.append(word)
+        return tuple(needles)
+
+    def _iter_joined(self, texts: Iterable[str]):
+        """Yield ``(text_index, match)`` scanning all texts as one string.
+
+        Joining avoids a regex call per text; a NUL separator keeps matches
+        from running across neighbouring texts.
+        """
+        offsets: List[int] = []
+        parts: List[str] = []
+        pos = 0
+        for text in texts:
+            text = (text or "").lower()
+            offsets.append(pos)
+            parts.append(text)
+            pos += len(text) + 1
+        for m in self.pattern.finditer("\x00".join(parts)):
+            yield bisect_right(offsets, m.start()) - 1, m
+
+    def count_many(self, texts: Iterable[str]) -> List[int]:
+        """Hit totals for many texts, scanned as one joined string."""
+        texts = list(texts)
+        totals = [0] * len(texts)
+        expand = self._expand
+        for idx, m in self._iter_joined(texts):
+            totals[idx] += len(expand(m.group(1)))
+        return totals
+
+    def hits_many(self, texts: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        """Yield ``(text_index, keyword)`` for every hit across ``texts``."""
+        expand = self._expand
+        for idx, m in self._iter_joined(texts):
+            for kw, _ in expand(m.group(1)):
+                yield idx, kw
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Per-keyword hit counts for ``text`` (only keywords that matched)."""
+        return dict(Counter(kw for kw, _, _ in self.finditer(text)))
+
+    def scan(self, text: str) -> MatchResult:
+        """Total, per-keyword counts and spans from a single pass."""
+        spans = list(self.finditer(text))
+        counts = Counter(kw for kw, _, _ in spans)
+        return MatchResult(len(spans), dict(counts), spans)
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def get_matcher(keywords: Iterable[str]) -> KeywordMatcher:
+    """Return a shared matcher for ``keywords``, compiling it on first use."""
+    return _cached_matcher(tuple(keywords))
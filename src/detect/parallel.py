@@ -0,0 +1,144 @@
+"""
+Process-pool fraud detection for large corpora.
+
+Records are split into chunks and scored in worker processes. Each worker
+compiles the keyword matcher once (in the pool initializer) and only plain
+text is sent across the process boundary. Results always come back in
+input order, and only a few chunks are in flight at a time so memory stays
+bounded for streamed input.
+"""
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from .fraud_detector import KEYWORDS, BATCH_SIZE, record_text
+from .matcher import KeywordMatcher, get_matcher
+from .taxonomy import FRAUD_TAXONOMY, TaxonomyScan
+
+_worker_matcher: KeywordMatcher = None
+
+
+def _init_worker(keywords: Tuple[str, ...]):
+    global _worker_matcher
+    _worker_matcher = get_matcher(keywords)
+
+
+def _count_chunk(texts: List[str]) -> List[int]:
+    return _worker_matcher.count_many(texts)
+
+
+def _scan_chunk(texts: List[str]) -> TaxonomyScan:
+    return FRAUD_TAXONOMY.scan_many(texts)
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def iter_chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of up to ``size`` items."""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_hit_chunks(text_chunks: Iterable[List[str]], keywords: Sequence[str] = None,
+                    workers: int = None) -> Iterator[List[int]]:
+    """
+    Count keyword hits for each chunk of texts in a process pool.
+
+    Yields one list of hit counts per input chunk, in input order. At most
+    ``2 * workers`` chunks are pending at once. ``workers`` of None or 1
+    counts in-process, as in ``detect_fraud_batch``; pass
+    ``default_workers()`` to use every CPU.
+    """
+    keywords = tuple(keywords or KEYWORDS)
+    if not workers or workers <= 1:
+        matcher = get_matcher(keywords)
+        for texts in text_chunks:
+            yield matcher.count_many(texts)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(keywords,)) as pool:
+        pending = deque()
+        for texts in text_chunks:
+            pending.append(pool.submit(_count_chunk, texts))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def count_hits_parallel(texts: Sequence[str], keywords: Sequence[str] = None,
+                        workers: int = None, chunk_size: int = BATCH_SIZE) -> np.ndarray:
+    """Hit counts for ``texts`` as an int64 array, computed across ``workers`` (None: in-process)."""
+    hits = np.zeros(len(texts), dtype=np.int64)
+    pos = 0
+    chunks = (texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size))
+    for counts in iter_hit_chunks(chunks, keywords, workers):
+        hits[pos:pos + len(counts)] = counts
+        pos += len(counts)
+    return hits
+
+
+def scan_taxonomy_parallel(texts: Sequence[str], workers: int = None,
+                           chunk_size: int = BATCH_SIZE) -> TaxonomyScan:
+    """``FRAUD_TAXONOMY.scan_many(texts)`` across ``workers`` processes (None: in-process)."""
+    if not workers or workers <= 1 or len(texts) <= chunk_size:
+        return FRAUD_TAXONOMY.scan_many(texts)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        scans = list(pool.map(_scan_chunk, chunks))
+    return TaxonomyScan(np.concatenate([s.counts for s in scans]),
+                        np.concatenate([s.categories for s in scans]))
+
+
+def detect_fraud_stream(records: Iterable[dict], min_hits: int = 2, workers: int = None,
+                        chunk_size: int = BATCH_SIZE, keywords: Sequence[str] = None):
+    """
+    Score a (possibly unbounded) stream of records in parallel.
+
+    Yields ``(records_chunk, scores)`` pairs in input order, where
+    ``scores`` has the same NumPy arrays as ``detect_fraud_batch``.
+    ``workers`` follows ``iter_hit_chunks`` (None: in-process).
+    """
+    record_chunks = deque()
+
+    def text_chunks():
+        for chunk in iter_chunks(records, chunk_size):
+            record_chunks.append(chunk)
+            yield [record_text(r) for r in chunk]
+
+    for counts in iter_hit_chunks(text_chunks(), keywords, workers):
+        chunk = record_chunks.popleft()
+        hits = np.asarray(counts, dtype=np.int64)
+        yield chunk, {
+            "is_fraud": hits >= min_hits,
+            "fraud_hits": hits,
+            "fraud_score": hits.astype(np.float64),
+        }
+
+
+def iter_jsonl(path) -> Iterator[dict]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def detect_fraud_jsonl(path, min_hits: int = 2, workers: int = None,
+                       chunk_size: int = BATCH_SIZE, keywords: Sequence[str] = None):
+    """``detect_fraud_stream`` over the records of a JSONL file."""
+    return detect_fraud_stream(iter_jsonl(path), min_hits=min_hits, workers=workers,
+                               chunk_size=chunk_size, keywords=keywords)
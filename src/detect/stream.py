@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Streaming detection stage: JSONL in, enriched JSONL out.
+
+Reads records from a JSONL file (or stdin), adds is_fraud / fraud_hits /
+fraud_score, and writes them to a JSONL file (or stdout). Records are
+processed in fixed-size chunks, so memory stays flat regardless of input
+size. Progress and records/sec go to stderr.
+
+Usage:
+    python src/detect/stream.py data/dnc_complaints.jsonl --out data/dnc_scored.jsonl
+    python src/detect/stream.py data/dnc_complaints.jsonl --in-place   # refused if any line is malformed
+    cat data/dnc_complaints.jsonl | python src/detect/stream.py - --workers 4 > scored.jsonl
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import os
+import time
+from src.detect.fraud_detector import BATCH_SIZE
+from src.detect.parallel import detect_fraud_stream
+
+
+def read_records(lines, stats):
+    """Parse JSONL lines, skipping blanks and counting malformed ones."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            stats["bad_lines"] += 1
+
+
+def run(src, dst, min_hits=2, workers=1, chunk_size=BATCH_SIZE, progress_every=50_000, log=sys.stderr):
+    """Score every record from ``src`` lines into ``dst``; returns stats."""
+    stats = {"records": 0, "fraud": 0, "bad_lines": 0, "seconds": 0.0}
+    started = time.perf_counter()
+    next_report = progress_every
+
+    records = read_records(src, stats)
+    for chunk, scores in detect_fraud_stream(records, min_hits=min_hits, workers=workers,
+                                             chunk_size=chunk_size):
+        for rec, is_fraud, hits in zip(chunk, scores["is_fraud"].tolist(),
+                                       scores["fraud_hits"].tolist()):
+            rec["is_fraud"] = is_fraud
+            rec["fraud_hits"] = hits
+            rec["fraud_score"] = float(hits)
+            dst.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        stats["records"] += len(chunk)
+        stats["fraud"] += int(scores["is_fraud"].sum())
+
+        if progress_every and stats["records"] >= next_report:
+            elapsed = time.perf_counter() - started
+            print(f"  {stats['records']:,} records ({stats['records'] / elapsed:,.0f}/s)", file=log)
+            next_report += progress_every
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Score JSONL records for fraud")
+    ap.add_argument("input", help="Input JSONL file, or - for stdin")
+    ap.add_argument("--out", default="-", help="Output JSONL file, or - for stdout (default)")
+    ap.add_argument("--in-place", action="store_true",
+                    help="Replace the input file with the scored output "
+                         "(not done if any input line is malformed)")
+    ap.add_argument("--min-hits", type=int, default=2)
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1, in-process)")
+    ap.add_argument("--chunk-size", type=int, default=BATCH_SIZE)
+    ap.add_argument("--progress-every", type=int, default=50_000,
+                    help="Report progress every N records (0 to disable)")
+    args = ap.parse_args()
+    if args.in_place:
+        if args.input == "-":
+            ap.error("--in-place needs an input file")
+        args.out = args.input + ".tmp"
+
+    src = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    if args.out == "-":
+        dst = sys.stdout
+    else:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        dst = open(args.out, "w", encoding="utf-8")
+
+    try:
+        stats = run(src, dst, min_hits=args.min_hits, workers=args.workers,
+                    chunk_size=args.chunk_size, progress_every=args.progress_every)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+
+    rate = stats["records"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(f"Scored {stats['records']:,} records ({stats['fraud']:,} fraud) "
+          f"in {stats['seconds']:.2f}s ({rate:,.0f} records/s)", file=sys.stderr)
+    if stats["bad_lines"]:
+        print(f"Skipped {stats['bad_lines']:,} malformed lines", file=sys.stderr)
+    if args.in_place:
+        if stats["bad_lines"]:
+            # Replacing the input would silently delete the skipped lines
+            print(f"Not replacing {args.input}; scored output kept in {args.out}", file=sys.stderr)
+            sys.exit(1)
+        # Like save_jsonl: drop the key index first; the next JsonlStore
+        # open rebuilds it from the new file
+        index = Path(args.input + ".idx")
+        if index.exists():
+            index.unlink()
+        os.replace(args.out, args.input)
+
+
+if __name__ == "__main__":
+    main()
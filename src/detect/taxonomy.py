@@ -0,0 +1,220 @@
+"""
+Fraud taxonomy: every fraud term list in the project, in one registry.
+
+Each category maps to the terms that signal it. Categories are grouped in
+families:
+
+- ``list``: the term lists used for filtering and scoring (the detector's
+  KEYWORDS, the scraper prefilter, the DNC filter, dashboard keywords)
+- ``network``: fraud types shown in the dashboard's network view
+- ``trend``: fraud trends counted by the data summary report
+
+All terms are compiled into one KeywordMatcher, so a single scan of a
+document yields per-term counts and a bitmask of the categories it hits.
+Callers read what they need from that scan (``hits`` for one term list's
+total, ``has`` for a category, ``DocScan.spans`` for match positions)
+instead of scanning again with a matcher of their own.
+Terms match as whole words; a trailing ``*`` matches any word with that
+prefix (see ``src/detect/matcher.py``).
+"""
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from .matcher import KeywordMatcher, get_matcher
+
+TAXONOMY: Dict[str, Dict[str, List[str]]] = {
+    "list": {
+        # Tier 2 classification terms (fraud_detector.KEYWORDS)
+        "detector": [
+            "fraud", "frauds", "scam", "scams", "scheme", "schemes",
+            "phishing", "smishing", "vishing",
+            "identity theft", "id theft",
+            "imposter", "impersonation",
+            "business email compromise", "bec",
+            "investment scam", "investment fraud",
+            "account takeover",
+            "money mule", "money mules",
+            "skimming", "carding",
+            "check fraud", "wire fraud",
+            "refund scam", "refund fraud",
+            "crypto scam", "cryptocurrency scam", "ransomware",
+        ],
+        # Tier 1 scraper prefilter (utils.keywords.FRAUD_TERMS)
+        "scraper": [
+            "fraud", "scam", "scams", "scammer", "scammers",
+            "phishing",
+            "identity theft", "identity fraud",
+        ],
+        # DNC complaint filter (ftc_dnc_csv.is_fraud)
+        "dnc": [
+            "fraud*", "scam*", "phishing", "identity theft", "robocall*",
+            "impersonat*", "deceptive", "unauthorized", "fake*", "illegal*",
+            "telemarket*", "spam*", "spoof*", "theft*", "debt*", "medicare",
+            "social security", "irs", "warranty", "prize*", "sweepstakes",
+        ],
+        # Dashboard "top keywords" chart (DataLoader.get_top_keywords)
+        "dashboard": [
+            "fraud*", "scam*", "phishing", "identity theft", "identity-theft",
+            "wire transfer*", "ransomware", "malware", "ponzi", "pyramid scheme*",
+            "money mule*", "business email compromise", "fake invoice*",
+            "refund scam*", "tech support scam*", "romance scam*",
+            "cryptocurrency scam*", "investment fraud*", "credit card fraud*",
+            "debit card*", "social security", "personal information",
+            "unauthorized", "victim*", "cybercrime*", "hacker*", "breach*",
+        ],
+    },
+    "network": {
+        "Identity Theft": ["identity", "theft*", "personal information", "ssn"],
+        "Phishing": ["phish*", "email scam*", "fake email*"],
+        "Investment": ["investment*", "ponzi", "pyramid*", "cryptocurrenc*"],
+        "Credit Card": ["credit card*", "debit card*", "unauthorized charge*"],
+        "Wire Transfer": ["wire transfer*", "wire fraud*", "money transfer*"],
+        "Ransomware": ["ransomware", "malware", "encrypt*"],
+        "Romance Scam": ["romance*", "dating", "relationship*"],
+        "Tech Support": ["tech support", "computer repair*", "virus*"],
+    },
+    "trend": {
+        "robocall": ["robocall*", "robo call*", "automated call*"],
+        "telemarketing": ["telemarket*", "unsolicited call*"],
+        "debt collection": ["debt*", "collection*", "collector*"],
+        "impersonation": ["impersonat*", "pretend*", "posing as", "claimed to be"],
+        "phishing": ["phish*", "fake email*", "suspicious link*"],
+        "identity theft": ["identity theft", "stolen identity", "ssn", "social security"],
+        "investment scam": ["investment*", "crypto*", "bitcoin*", "ponzi", "pyramid*"],
+        "tech support": ["tech support", "computer*", "virus*", "malware"],
+        "irs/tax scam": ["irs", "tax*", "revenue service"],
+        "medicare/health": ["medicare", "health insurance", "medical"],
+        "warranty scam": ["warrant*", "extended warrant*", "car warrant*"],
+        "prize/lottery": ["prize*", "lotter*", "winner*", "sweepstakes"],
+        "romance scam": ["romance*", "dating", "relationship*"],
+        "utility scam": ["utilit*", "electric*", "power compan*"],
+    },
+}
+
+
+class TaxonomyScan(NamedTuple):
+    """Per-document output of ``Taxonomy.scan_many``."""
+    counts: np.ndarray       # (n_docs, n_terms) int32 hit counts
+    categories: np.ndarray   # (n_docs,) uint64 category bitmask
+
+
+class DocScan(NamedTuple):
+    """Output of ``Taxonomy.scan_doc`` for one text."""
+    spans: List[Tuple[str, int, int]]   # (term, start, end) in text order
+    counts: Dict[str, int]
+    mask: int
+
+
+class Taxonomy:
+    """Categories of fraud terms compiled into a single matcher."""
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, Sequence[str]]]):
+        self.categories: Tuple[str, ...] = tuple(
+            f"{family}/{name}" for family, cats in taxonomy.items() for name in cats
+        )
+        if len(self.categories) > 64:
+            raise ValueError("Taxonomy supports at most 64 categories")
+        self._families = {family: tuple(cats) for family, cats in taxonomy.items()}
+
+        term_masks: Dict[str, int] = {}
+        self._category_terms: Dict[str, Tuple[str, ...]] = {}
+        for bit, key in enumerate(self.categories):
+            family, name = key.split("/", 1)
+            terms = tuple(dict.fromkeys(t.strip().lower() for t in taxonomy[family][name]))
+            self._category_terms[key] = terms
+            for term in terms:
+                term_masks[term] = term_masks.get(term, 0) | (1 << bit)
+
+        self.matcher = KeywordMatcher(term_masks)
+        self.terms: Tuple[str, ...] = self.matcher.keywords
+        self.term_index = {term: i for i, term in enumerate(self.terms)}
+        self.term_masks = np.array([term_masks[t] for t in self.terms], dtype=np.uint64)
+
+    def __repr__(self):
+        return f"Taxonomy({len(self.categories)} categories, {len(self.terms)} terms)"
+
+    def names(self, family: str) -> Tuple[str, ...]:
+        """Category names in ``family``, in registry order."""
+        return self._families[family]
+
+    def terms_in(self, family: str, name: str) -> Tuple[str, ...]:
+        return self._category_terms[f"{family}/{name}"]
+
+    def matcher_for(self, family: str, name: str) -> KeywordMatcher:
+        """Shared matcher over one category's terms, for yes/no checks."""
+        return get_matcher(self.terms_in(family, name))
+
+    def bit(self, family: str, name: str) -> int:
+        return 1 << self.categories.index(f"{family}/{name}")
+
+    def term_columns(self, family: str, name: str) -> np.ndarray:
+        """Column indices of a category's terms in ``TaxonomyScan.counts``."""
+        return np.array([self.term_index[t] for t in self.terms_in(family, name)], dtype=np.intp)
+
+    def mask_of(self, term_counts: Dict[str, int]) -> int:
+        mask = 0
+        for term, n in term_counts.items():
+            if n:
+                mask |= int(self.term_masks[self.term_index[term]])
+        return mask
+
+    def scan(self, text: str) -> Tuple[Dict[str, int], int]:
+        """Per-term counts and category bitmask for one text."""
+        counts = self.matcher.counts(text)
+        return counts, self.mask_of(counts)
+
+    def scan_doc(self, text: str) -> DocScan:
+        """Spans, per-term counts and category bitmask for one text, from one scan."""
+        spans = list(self.matcher.finditer(text or ""))
+        counts: Dict[str, int] = {}
+        for term, _, _ in spans:
+            counts[term] = counts.get(term, 0) + 1
+        return DocScan(spans, counts, self.mask_of(counts))
+
+    def hits(self, counts, family: str, name: str):
+        """
+        Total hits on one category's terms: an int64 array for a
+        ``TaxonomyScan.counts`` matrix, an int for a term -> count dict.
+        """
+        if isinstance(counts, np.ndarray):
+            return counts[:, self.term_columns(family, name)].sum(axis=1, dtype=np.int64)
+        return sum(counts.get(term, 0) for term in self.terms_in(family, name))
+
+    def spans_in(self, spans: Iterable[Tuple[str, int, int]], family: str, name: str):
+        """The ``DocScan.spans`` whose term belongs to one category."""
+        terms = set(self.terms_in(family, name))
+        return [span for span in spans if span[0] in terms]
+
+    def scan_many(self, texts: Iterable[str]) -> TaxonomyScan:
+        """Count matrix and category bitmasks for many texts in one pass."""
+        texts = list(texts)
+        counts = np.zeros((len(texts), len(self.terms)), dtype=np.int32)
+        index = self.term_index
+        rows, cols = [], []
+        for idx, term in self.matcher.hits_many(texts):
+            rows.append(idx)
+            cols.append(index[term])
+        np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1)
+        return TaxonomyScan(counts, self.masks_from_counts(counts))
+
+    def masks_from_counts(self, counts: np.ndarray) -> np.ndarray:
+        masks = np.zeros(len(counts), dtype=np.uint64)
+        for col in np.flatnonzero(counts.any(axis=0)):
+            present = counts[:, col] > 0
+            masks[present] |= self.term_masks[col]
+        return masks
+
+    def has(self, masks, family: str, name: str):
+        """Boolean test of category membership for a mask or array of masks."""
+        bit = self.bit(family, name)
+        if isinstance(masks, np.ndarray):
+            return (masks & np.uint64(bit)) != 0
+        return bool(int(masks) & bit)
+
+    def category_labels(self, mask: int, family: str) -> List[str]:
+        """Names of the ``family`` categories set in ``mask``."""
+        return [name for name in self.names(family) if self.has(mask, family, name)]
+
+
+FRAUD_TAXONOMY = Taxonomy(TAXONOMY)
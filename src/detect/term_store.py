@@ -0,0 +1,198 @@
+"""
+Per-keyword hit counts per article, for incremental re-scoring.
+
+The store remembers, for every article (keyed by text hash like the
+detection cache), how often each keyword matched and which keyword set it
+was scanned with. When KEYWORDS changes, ``update`` rescans each article
+only for the terms that were added, drops the counts of terms that were
+removed, and reports which articles' ``fraud_hits`` changed. Matching
+rules make per-term counts independent of the other keywords, so a
+partial rescan gives exactly the counts a full rescan would.
+"""
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from .cache import content_key, keyword_version
+from .matcher import get_matcher
+
+DEFAULT_STORE_PATH = Path(__file__).parent.parent.parent / "data" / "cache" / "term_counts.sqlite"
+
+_SQL_BATCH = 900
+
+
+class RescoreResult(NamedTuple):
+    hits: np.ndarray        # (n,) fraud_hits for every input text
+    previous: np.ndarray    # (n,) stored fraud_hits before the update, -1 for new texts
+    changed: np.ndarray     # indices whose fraud_hits differ from the stored value
+    scanned_terms: int      # sum over texts of terms actually scanned for
+
+
+class TermCountStore:
+    """SQLite store of article -> per-keyword hit counts."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS term_sets (
+                    version TEXT PRIMARY KEY,
+                    terms TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS articles (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    fraud_hits INTEGER NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS term_counts (
+                    key TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    hits INTEGER NOT NULL,
+                    PRIMARY KEY (key, term)
+                ) WITHOUT ROWID;
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits (or rolls back) on exit and is then closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _load_articles(self, conn, keys: Sequence[str]) -> Dict[str, tuple]:
+        found = {}
+        for i in range(0, len(keys), _SQL_BATCH):
+            batch = keys[i:i + _SQL_BATCH]
+            marks = ",".join("?" * len(batch))
+            for key, version, hits in conn.execute(
+                f"SELECT key, version, fraud_hits FROM articles WHERE key IN ({marks})", batch
+            ):
+                found[key] = (version, hits)
+        return found
+
+    def _term_sets(self, conn) -> Dict[str, frozenset]:
+        return {v: frozenset(t.split("\n")) if t else frozenset()
+                for v, t in conn.execute("SELECT version, terms FROM term_sets")}
+
+    def term_counts(self, text: str) -> Dict[str, int]:
+        """Stored per-keyword counts for one text (empty if never scanned)."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT term, hits FROM term_counts WHERE key = ?",
+                                (content_key(text),))
+            return dict(rows)
+
+    def update(self, texts: Sequence[str], keywords: Sequence[str] = None,
+               before_commit: Callable[[RescoreResult], None] = None) -> RescoreResult:
+        """
+        Bring the stored counts for ``texts`` up to date with ``keywords``.
+
+        New texts are scanned for every keyword; known texts only for the
+        keywords their last scan did not include. Returns the current hit
+        totals and the indices whose totals changed (new texts count as
+        changed).
+
+        ``before_commit(result)`` runs before the new counts are committed,
+        e.g. to push the changed rows elsewhere; if it raises, the store is
+        left as it was, so the next update reports the same changes.
+        """
+        if keywords is None:
+            from .fraud_detector import KEYWORDS
+            keywords = KEYWORDS
+        terms = frozenset(kw.strip().lower() for kw in keywords if kw.strip())
+        version = keyword_version(terms)
+
+        keys = [content_key(t) for t in texts]
+        unique = list(dict.fromkeys(keys))
+        first_index = {}
+        for i, key in enumerate(keys):
+            first_index.setdefault(key, i)
+
+        with self._connect() as conn:
+            known = self._load_articles(conn, unique)
+            term_sets = self._term_sets(conn)
+
+            # Group articles by the term set they were last scanned with, so
+            # each distinct diff is one joined scan over its texts.
+            groups: Dict[str, List[str]] = defaultdict(list)
+            for key in unique:
+                old = known.get(key)
+                groups[old[0] if old else None].append(key)
+
+            new_counts = []   # (key, term, hits)
+            removed = []      # (key, term)
+            reset = []        # keys whose counts predate a DETECTOR_VERSION bump
+            scanned_terms = 0
+            for old_version, group in groups.items():
+                if old_version == version:
+                    continue
+                old_terms = term_sets.get(old_version, frozenset())
+                if old_version is not None and keyword_version(old_terms) != old_version:
+                    # Matching rules changed since that scan: start over.
+                    reset.extend(group)
+                    old_terms = frozenset()
+                elif old_version is not None:
+                    removed.extend((key, term) for key in group
+                                   for term in old_terms - terms)
+                added = sorted(terms - old_terms)
+                if not added:
+                    continue
+                scanned_terms += len(added) * len(group)
+                group_texts = [texts[first_index[key]] for key in group]
+                tally: Dict[tuple, int] = defaultdict(int)
+                for idx, term in get_matcher(added).hits_many(group_texts):
+                    tally[(group[idx], term)] += 1
+                new_counts.extend((key, term, n) for (key, term), n in tally.items())
+
+            conn.execute("INSERT OR IGNORE INTO term_sets (version, terms) VALUES (?, ?)",
+                         (version, "\n".join(sorted(terms))))
+            conn.executemany("DELETE FROM term_counts WHERE key = ?", ((k,) for k in reset))
+            conn.executemany("DELETE FROM term_counts WHERE key = ? AND term = ?", removed)
+            conn.executemany(
+                "INSERT OR REPLACE INTO term_counts (key, term, hits) VALUES (?, ?, ?)", new_counts
+            )
+
+            totals: Dict[str, int] = {}
+            stale = [key for key in unique if key not in known or known[key][0] != version]
+            for i in range(0, len(stale), _SQL_BATCH):
+                batch = stale[i:i + _SQL_BATCH]
+                marks = ",".join("?" * len(batch))
+                totals.update(conn.execute(
+                    f"SELECT key, SUM(hits) FROM term_counts WHERE key IN ({marks}) GROUP BY key",
+                    batch,
+                ))
+            conn.executemany(
+                "INSERT OR REPLACE INTO articles (key, version, fraud_hits) VALUES (?, ?, ?)",
+                [(key, version, int(totals.get(key, 0))) for key in stale],
+            )
+
+            current = {key: known[key][1] for key in unique if key in known}
+            current.update((key, int(totals.get(key, 0))) for key in stale)
+            hits = np.fromiter((current[k] for k in keys), dtype=np.int64, count=len(keys))
+            changed_keys = {key for key in stale
+                            if key not in known or known[key][1] != current[key]}
+            changed = np.array([i for i, k in enumerate(keys) if k in changed_keys], dtype=np.intp)
+            previous = np.fromiter((known[k][1] if k in known else -1 for k in keys),
+                                   dtype=np.int64, count=len(keys))
+            result = RescoreResult(hits, previous, changed, scanned_terms)
+            if before_commit is not None:
+                before_commit(result)   # raising rolls the transaction back
+        return result
+
+    def prune(self, texts: Sequence[str]) -> int:
+        """Drop articles that are not in ``texts``; returns how many were removed."""
+        keep = {content_key(t) for t in texts}
+        with self._connect() as conn:
+            gone = [k for (k,) in conn.execute("SELECT key FROM articles") if k not in keep]
+            conn.executemany("DELETE FROM articles WHERE key = ?", ((k,) for k in gone))
+            conn.executemany("DELETE FROM term_counts WHERE key = ?", ((k,) for k in gone))
+        return len(gone)
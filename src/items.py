@@ -35,6 +35,7 @@ class DataSpotlightItem(scrapy.Item):
     # Statistics and sources
     relevant_data = scrapy.Field()
     sources = scrapy.Field()
+    facts = scrapy.Field()
 
     # Metadata
     scraped_at = scrapy.Field()
@@ -0,0 +1,341 @@
+"""
+Scrapy middlewares for the FTC spiders.
+
+AdaptiveConcurrencyMiddleware tunes each download slot (one per domain) to
+what the server can take, AIMD-style:
+
+- every ``ADAPTIVE_WINDOW`` responses with a low error rate and an average
+  latency under ``ADAPTIVE_TARGET_LATENCY``, concurrency goes up by one
+  and the delay down by ``ADAPTIVE_DELAY_STEP`` (additive increase)
+- a 429/503 response, or a window with too many errors or too slow
+  responses, multiplies concurrency by ``ADAPTIVE_DECREASE_FACTOR`` and
+  doubles the delay (at least to Retry-After), at most once per
+  ``ADAPTIVE_COOLDOWN`` seconds (multiplicative decrease)
+
+Both stay within the ADAPTIVE_MIN/MAX_CONCURRENCY and ADAPTIVE_MIN/MAX_DELAY
+bounds, starting from CONCURRENT_REQUESTS_PER_DOMAIN and DOWNLOAD_DELAY.
+Every decision is counted in the crawl stats under ``adaptive/``.
+
+DeltaFetchMiddleware skips article pages that produced items on an earlier
+crawl: the URL of every response that yields an item is stored in the
+persistent crawl state (data/cache/crawl_state.sqlite, per spider), and
+later requests for a stored URL are dropped before they are downloaded.
+Pages that never yield items, like listings, are always fetched.
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import logging
+import threading
+import time
+
+from itemadapter import ItemAdapter
+from scrapy import Request, signals
+from scrapy.exceptions import NotConfigured
+from w3lib.url import canonicalize_url
+
+from src.utils.crawl_state import DEFAULT_STATE_PATH, CrawlState, items_stored, store_opened
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class _SlotWindow:
+    """Responses seen for one slot since its last decision."""
+
+    def __init__(self):
+        self.responses = 0
+        self.errors = 0
+        self.latency = 0.0
+        self.timed = 0
+        self.last_decrease = 0.0
+        self.slot = None
+
+    def reset(self):
+        self.responses = self.errors = self.timed = 0
+        self.latency = 0.0
+
+
+class AdaptiveConcurrencyMiddleware:
+    """Adjusts per-domain concurrency and delay from latency, errors and 429s."""
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        if not settings.getbool('ADAPTIVE_CONCURRENCY_ENABLED', True):
+            raise NotConfigured
+        if settings.getbool('AUTOTHROTTLE_ENABLED'):
+            raise NotConfigured('AdaptiveConcurrencyMiddleware replaces AutoThrottle; enable only one')
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.logger = logging.getLogger(__name__)
+
+        self.min_concurrency = max(1, settings.getint('ADAPTIVE_MIN_CONCURRENCY', 1))
+        self.max_concurrency = max(self.min_concurrency, settings.getint('ADAPTIVE_MAX_CONCURRENCY', 16))
+        self.min_delay = settings.getfloat('ADAPTIVE_MIN_DELAY', 0.0)
+        self.max_delay = max(self.min_delay, settings.getfloat('ADAPTIVE_MAX_DELAY', 30.0))
+        self.delay_step = settings.getfloat('ADAPTIVE_DELAY_STEP', 0.25)
+        self.target_latency = settings.getfloat('ADAPTIVE_TARGET_LATENCY', 2.0)
+        self.max_error_rate = settings.getfloat('ADAPTIVE_MAX_ERROR_RATE', 0.1)
+        self.window = max(1, settings.getint('ADAPTIVE_WINDOW', 10))
+        self.factor = settings.getfloat('ADAPTIVE_DECREASE_FACTOR', 0.5)
+        self.cooldown = settings.getfloat('ADAPTIVE_COOLDOWN', 5.0)
+        self.windows = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        mw = cls(crawler)
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        return mw
+
+    # -- observations ----------------------------------------------------
+
+    def process_response(self, request, response, spider=None):
+        key, slot = self._slot(request)
+        if slot is None:
+            return response
+        win = self._window(key, slot)
+        win.responses += 1
+        latency = request.meta.get('download_latency')
+        if latency is not None:
+            win.latency += latency
+            win.timed += 1
+
+        if response.status in THROTTLE_STATUSES:
+            self.stats.inc_value('adaptive/throttled')
+            win.errors += 1
+            retry_after = response.headers.get('Retry-After', b'').decode('latin-1').strip()
+            self._decrease(key, slot, 'throttled',
+                           float(retry_after) if retry_after.isdigit() else 0.0)
+        else:
+            if response.status >= 500:
+                self.stats.inc_value('adaptive/errors')
+                win.errors += 1
+            self._evaluate(key, slot, win)
+        return response
+
+    def process_exception(self, request, exception, spider=None):
+        key, slot = self._slot(request)
+        if slot is not None:
+            win = self._window(key, slot)
+            win.responses += 1
+            win.errors += 1
+            self.stats.inc_value('adaptive/errors')
+            self._evaluate(key, slot, win)
+        return None
+
+    def _slot(self, request):
+        key = request.meta.get('download_slot')
+        engine = self.crawler.engine
+        if key is None or engine is None:
+            return key, None
+        return key, engine.downloader.slots.get(key)
+
+    def _window(self, key, slot):
+        win = self.windows.get(key)
+        if win is None:
+            win = self.windows[key] = _SlotWindow()
+            # Start from the configured values, clamped to the bounds
+            slot.concurrency = min(self.max_concurrency, max(self.min_concurrency, slot.concurrency))
+            slot.delay = min(self.max_delay, max(self.min_delay, slot.delay))
+            self._record(key, slot)
+        elif win.slot is not slot:
+            # Scrapy drops idle slots; carry the learned values over to the new one
+            slot.concurrency, slot.delay = win.slot.concurrency, win.slot.delay
+        win.slot = slot
+        return win
+
+    # -- decisions -------------------------------------------------------
+
+    def _evaluate(self, key, slot, win):
+        if win.responses < self.window:
+            return
+        error_rate = win.errors / win.responses
+        latency = win.latency / win.timed if win.timed else 0.0
+        self.stats.set_value(f'adaptive/{key}/latency_ms', round(latency * 1000))
+        if error_rate > self.max_error_rate:
+            self._decrease(key, slot, 'errors')
+        elif latency > self.target_latency:
+            self._decrease(key, slot, 'latency')
+        else:
+            self._increase(key, slot)
+        win.reset()
+
+    def _increase(self, key, slot):
+        concurrency = min(self.max_concurrency, slot.concurrency + 1)
+        delay = max(self.min_delay, slot.delay - self.delay_step)
+        if (concurrency, delay) == (slot.concurrency, slot.delay):
+            self.stats.inc_value('adaptive/hold')
+            return
+        slot.concurrency, slot.delay = concurrency, delay
+        self.stats.inc_value('adaptive/increase')
+        self._record(key, slot)
+
+    def _decrease(self, key, slot, reason, retry_after=0.0):
+        win = self.windows[key]
+        now = time.monotonic()
+        # Responses already in flight report the same congestion; react once
+        if now - win.last_decrease < self.cooldown:
+            self.stats.inc_value('adaptive/decrease_suppressed')
+            return
+        win.last_decrease = now
+        win.reset()
+        slot.concurrency = max(self.min_concurrency, int(slot.concurrency * self.factor))
+        slot.delay = min(self.max_delay, max(slot.delay * 2, self.delay_step, retry_after))
+        self.stats.inc_value('adaptive/decrease')
+        self.stats.inc_value(f'adaptive/decrease/{reason}')
+        self.logger.debug(f"Slowing down {key} ({reason}): concurrency {slot.concurrency}, "
+                          f"delay {slot.delay:.2f}s")
+        self._record(key, slot)
+
+    def _record(self, key, slot):
+        self.stats.set_value(f'adaptive/{key}/concurrency', slot.concurrency)
+        self.stats.set_value(f'adaptive/{key}/delay', round(slot.delay, 3))
+        self.stats.max_value(f'adaptive/{key}/max_concurrency', slot.concurrency)
+        self.stats.min_value(f'adaptive/{key}/min_concurrency', slot.concurrency)
+
+    def spider_closed(self, spider):
+        for key, win in self.windows.items():
+            slot = win.slot
+            if slot is not None:
+                self.logger.info(f"Adaptive concurrency for {key}: concurrency {slot.concurrency}, "
+                                 f"delay {slot.delay:.2f}s")
+
+
+class DeltaFetchMiddleware:
+    """
+    Spider middleware that drops requests for pages which already yielded
+    items. Keys are canonical URLs (or ``request.meta['deltafetch_key']``),
+    stored per spider in ``CrawlState`` with a hash of the item text.
+
+    A page is recorded only once its item is safe: from the ``items_stored``
+    signal when a storing pipeline (SupabasePipeline) announced itself with
+    ``store_opened``, otherwise from ``item_scraped``, i.e. once every item
+    pipeline has accepted the item. Dropped items, and items in a batch
+    the pipeline failed to store, are fetched again next time. Records are
+    buffered and written in one transaction per DELTAFETCH_BATCH_SIZE
+    items, when the spider goes idle and when it closes.
+
+    DELTAFETCH_RESET (or ``-a deltafetch_reset=1``) forgets the stored keys
+    first; DELTAFETCH_FORCE (or ``-a deltafetch_force=1``) fetches
+    everything this run but still records what it finds. Skipped requests
+    are counted in the ``deltafetch/skipped`` stat.
+    """
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        if not settings.getbool('DELTAFETCH_ENABLED', True):
+            raise NotConfigured
+        self.stats = crawler.stats
+        self.path = settings.get('DELTAFETCH_PATH') or DEFAULT_STATE_PATH
+        self.reset = settings.getbool('DELTAFETCH_RESET')
+        self.force = settings.getbool('DELTAFETCH_FORCE')
+        self.batch_size = max(1, settings.getint('DELTAFETCH_BATCH_SIZE', 100))
+        self.logger = logging.getLogger(__name__)
+        self.state = None
+        self.known = set()
+        self.confirm = False  # wait for items_stored before recording
+        self._awaiting = {}  # item url -> (key, item text) until the item is stored
+        self._pending = {}   # key -> item text, not yet written to the state
+        # items_stored arrives on the pipeline's writer thread
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        mw = cls(crawler)
+        crawler.signals.connect(mw.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(mw.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(mw.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(mw.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(mw.store_opened, signal=store_opened)
+        crawler.signals.connect(mw.items_stored, signal=items_stored)
+        return mw
+
+    def store_opened(self, spider=None):
+        self.confirm = True
+
+    def spider_opened(self, spider):
+        reset = self.reset or _flag(getattr(spider, 'deltafetch_reset', False))
+        force = self.force or _flag(getattr(spider, 'deltafetch_force', False))
+        self.state = CrawlState(f"scrapy:{spider.name}", path=self.path, full=force)
+        if reset:
+            self.logger.info(f"Delta-fetch: forgot {self.state.reset()} stored pages")
+        self.known = self.state.urls()
+        self.stats.set_value('deltafetch/known', len(self.known))
+
+    def spider_idle(self, spider):
+        self._flush()
+
+    def spider_closed(self, spider):
+        self._flush()
+        self.state.close()
+        if self._awaiting:
+            self.logger.info(f"Delta-fetch: {len(self._awaiting)} pages not recorded (items not stored)")
+        skipped = self.stats.get_value('deltafetch/skipped', 0)
+        self.logger.info(f"Delta-fetch: skipped {skipped} already-stored pages")
+
+    def item_scraped(self, item, response, spider):
+        """Remember the page an accepted item came from (before any redirect)."""
+        if response is None or response.request is None:
+            return
+        request = response.request
+        key = request.meta.get('deltafetch_key') or canonicalize_url(
+            response.meta.get('redirect_urls', [request.url])[0])
+        adapter = ItemAdapter(item)
+        text = adapter.get('full_text') or ''
+        if self.confirm:
+            if adapter.get('url'):
+                with self._lock:
+                    self._awaiting[adapter['url']] = (key, text)
+            return
+        self._remember([(key, text)])
+
+    def items_stored(self, urls):
+        """Record the pages whose items the storing pipeline has persisted."""
+        with self._lock:
+            found = [self._awaiting.pop(url) for url in urls if url in self._awaiting]
+        self._remember(found)
+
+    def _remember(self, pages):
+        with self._lock:
+            for key, text in pages:
+                if key in self._pending or (key in self.known and not self.state.full):
+                    continue
+                self.known.add(key)
+                self._pending[key] = text
+                self.stats.inc_value('deltafetch/stored')
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            self.state.record_many(pending.items())
+
+    # -- filtering -------------------------------------------------------
+
+    def process_spider_output(self, response, result, spider=None):
+        for x in result:
+            if self._keep(response, x):
+                yield x
+
+    async def process_spider_output_async(self, response, result, spider=None):
+        async for x in result:
+            if self._keep(response, x):
+                yield x
+
+    def _keep(self, response, x):
+        if isinstance(x, Request) and self._key(x) in self.known:
+            self.stats.inc_value('deltafetch/skipped')
+            self.logger.debug(f"Delta-fetch: skipping {x.url}")
+            return False
+        return True
+
+    def _key(self, request):
+        return request.meta.get('deltafetch_key') or canonicalize_url(request.url)
+
+
+def _flag(value):
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
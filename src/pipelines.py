@@ -1,6 +1,29 @@
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
 
 from itemadapter import ItemAdapter
 import logging
+from scrapy import Request
+from scrapy.utils.defer import deferred_from_coro, maybe_deferred_to_future
+from twisted.internet import defer
+from twisted.python.failure import Failure
+
+from src.database.supabase_load import TABLE, build_row
+from src.detect import detect_fraud_batch
+from src.detect.facts import DEFAULT_FACTS_PATH, FactIndex
+from src.detect.parallel import default_workers
+from src.utils.crawl_state import items_stored, store_opened
+from src.utils.image_store import ImageStore, make_thumbnails
 
 
 class FtcScraperPipeline:
@@ -39,3 +62,419 @@ class FtcScraperPipeline:
 class DropItem(Exception):
     """Exception to drop an item from the pipeline"""
     pass
+
+
+# Supabase source/feed labels, matching FILE_SOURCES in supabase_load.py
+SPIDER_SOURCES = {
+    "press_releases": {"source": "ftc_press", "feed": "press"},
+    "data_spotlight": {"source": "ftc_data_spotlight", "feed": "data_spotlight"},
+}
+
+DEFAULT_SQLITE_PATH = "data/cache/supabase_stand_in.sqlite"
+
+_STOP = object()
+
+
+class SupabaseBackend:
+    """Bulk upserts into the Supabase table used by supabase_load.py."""
+
+    def __init__(self, table=TABLE):
+        self.table = table
+
+    def upsert(self, rows):
+        from src.database.supabase_load import get_client
+        get_client().table(self.table).upsert(rows, on_conflict="url").execute()
+
+    def close(self):
+        pass
+
+
+class SQLiteBackend:
+    """Local stand-in for Supabase: the same rows, upserted on url into SQLite."""
+
+    COLUMNS = ("source", "feed", "title", "url", "published_at", "body",
+               "is_fraud", "fraud_hits", "fraud_score", "summary")
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH, table=TABLE):
+        self.path = Path(path)
+        self.table = table
+        self._conn = None
+
+    def _connect(self):
+        # Opened on first upsert, i.e. on the pipeline's writer thread
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            cols = ", ".join("url TEXT PRIMARY KEY" if c == "url" else c for c in self.COLUMNS)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({cols})")
+        return self._conn
+
+    def upsert(self, rows):
+        conn = self._connect()
+        cols = ", ".join(self.COLUMNS)
+        marks = ", ".join("?" * len(self.COLUMNS))
+        updates = ", ".join(f"{c} = excluded.{c}" for c in self.COLUMNS if c != "url")
+        with conn:
+            conn.executemany(
+                f"INSERT INTO {self.table} ({cols}) VALUES ({marks}) "
+                f"ON CONFLICT(url) DO UPDATE SET {updates}",
+                [[json.dumps(row.get(c)) if isinstance(row.get(c), (list, dict)) else row.get(c)
+                  for c in self.COLUMNS] for row in rows],
+            )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class SupabasePipeline:
+    """
+    Buffered, batched storage of scraped articles.
+
+    ``process_item`` only appends the item to an in-memory buffer. A full
+    buffer (SUPABASE_BATCH_SIZE items), or one older than
+    SUPABASE_FLUSH_INTERVAL seconds, goes to a background writer thread,
+    which scores the batch with ``detect_fraud_batch`` and bulk upserts the
+    fraud-related rows on ``url`` (the last item wins within a batch), with
+    retries. ``close_spider`` flushes the rest and waits for the writer.
+    At most SUPABASE_MAX_PENDING batches wait for the writer; beyond that
+    ``process_item`` blocks, so a stalled database cannot grow memory
+    without bound.
+
+    SUPABASE_BACKEND = "sqlite" writes the same rows to a local SQLite table
+    (SUPABASE_SQLITE_PATH) instead of Supabase.
+
+    Each batch that was stored (upserted, or skipped as not fraud-related)
+    is announced with the ``items_stored`` signal, sent from the writer
+    thread; a batch dropped after its retries is not.
+    """
+
+    def __init__(self, backend, batch_size=100, flush_interval=5.0, max_pending=8,
+                 retries=3, stats=None, signals=None):
+        self.backend = backend
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.stats = stats
+        self.signals = signals
+        self.logger = logging.getLogger(__name__)
+        self.source_meta = None
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffer_started = 0.0
+        self._batches = queue.Queue(max(1, max_pending))
+        self._thread = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        table = settings.get("SUPABASE_TABLE", TABLE)
+        if settings.get("SUPABASE_BACKEND", "supabase") == "sqlite":
+            backend = SQLiteBackend(settings.get("SUPABASE_SQLITE_PATH", DEFAULT_SQLITE_PATH), table)
+        else:
+            backend = SupabaseBackend(table)
+        return cls(
+            backend,
+            batch_size=settings.getint("SUPABASE_BATCH_SIZE", 100),
+            flush_interval=settings.getfloat("SUPABASE_FLUSH_INTERVAL", 5.0),
+            max_pending=settings.getint("SUPABASE_MAX_PENDING", 8),
+            retries=settings.getint("SUPABASE_RETRIES", 3),
+            stats=crawler.stats,
+            signals=crawler.signals,
+        )
+
+    def open_spider(self, spider=None):
+        name = getattr(spider, "name", None) or "scrapy"
+        self.source_meta = SPIDER_SOURCES.get(name, {"source": f"ftc_{name}", "feed": name})
+        self._thread = threading.Thread(target=self._writer, name="supabase-writer", daemon=True)
+        self._thread.start()
+        if self.signals is not None:
+            self.signals.send_catch_log(store_opened, spider=spider)
+
+    def process_item(self, item, spider=None):
+        adapter = ItemAdapter(item)
+        record = {
+            "title": adapter.get("title"),
+            "url": adapter.get("url"),
+            "published": adapter.get("published_date"),
+            "body": adapter.get("full_text"),
+            "summary": adapter.get("summary"),
+        }
+        batch = None
+        with self._lock:
+            if not self._buffer:
+                self._buffer_started = time.monotonic()
+            self._buffer.append(record)
+            if len(self._buffer) >= self.batch_size:
+                batch, self._buffer = self._buffer, []
+        if batch:
+            self._batches.put(batch)
+        return item
+
+    def close_spider(self, spider=None):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._batches.put(batch)
+        self._batches.put(_STOP)
+        self._thread.join()
+
+    # -- writer thread ---------------------------------------------------
+
+    def _writer(self):
+        # Wake up often enough to flush a partial buffer about on time
+        tick = max(0.1, self.flush_interval / 2)
+        while True:
+            try:
+                batch = self._batches.get(timeout=tick)
+            except queue.Empty:
+                batch = None
+            if batch is _STOP:
+                self.backend.close()   # connections belong to this thread
+                return
+            for records in (batch, self._take_stale()):
+                if records:
+                    self._store(records)
+
+    def _store(self, records):
+        try:
+            self._flush(records)
+        except Exception as e:
+            # Keep the writer alive, or close_spider would wait on a full queue
+            self.logger.error(f"Failed to store {len(records)} items: {e}")
+            self._inc("supabase/failed_rows", len(records))
+
+    def _take_stale(self):
+        """The buffer, if it has waited longer than the flush interval."""
+        with self._lock:
+            if self._buffer and time.monotonic() - self._buffer_started >= self.flush_interval:
+                batch, self._buffer = self._buffer, []
+                return batch
+        return None
+
+    def _flush(self, records):
+        start = time.perf_counter()
+        scores = detect_fraud_batch(records, min_hits=2)
+        rows = {}
+        for rec, is_fraud, hits, score in zip(records, scores["is_fraud"], scores["fraud_hits"],
+                                              scores["fraud_score"]):
+            row = build_row(rec, self.source_meta, bool(is_fraud), int(hits), float(score))
+            if row["is_fraud"] and row["title"] and row["url"]:
+                rows.pop(row["url"], None)
+                rows[row["url"]] = row
+        self._inc("supabase/items", len(records))
+        self._inc("supabase/skipped", len(records) - len(rows))
+        if not rows:
+            self._stored(records)
+            return
+
+        for attempt in range(self.retries + 1):
+            try:
+                self.backend.upsert(list(rows.values()))
+                break
+            except Exception as e:
+                if attempt == self.retries:
+                    self.logger.error(f"Dropping {len(rows)} rows after {attempt + 1} failed upserts: {e}")
+                    self._inc("supabase/failed_rows", len(rows))
+                    return
+                self.logger.warning(f"Upsert failed ({e}), retrying")
+                time.sleep(min(30.0, 0.5 * 2 ** attempt))
+        self._inc("supabase/batches")
+        self._inc("supabase/rows_upserted", len(rows))
+        self._inc("supabase/flush_ms", round((time.perf_counter() - start) * 1000))
+        self.logger.info(f"Upserted {len(rows)} rows")
+        self._stored(records)
+
+    def _stored(self, records):
+        if self.signals is not None:
+            self.signals.send_catch_log(items_stored, urls=[rec["url"] for rec in records if rec["url"]])
+
+    def _inc(self, key, count=1):
+        if self.stats is not None:
+            self.stats.inc_value(key, count)
+
+
+class ImageStorePipeline:
+    """
+    Downloads ``image_urls`` into a content-addressed ``ImageStore``
+    (IMAGES_STORE) and fills ``images`` like Scrapy's ImagesPipeline.
+
+    - an image is stored once per content hash, whichever URLs serve it
+    - a URL fetched within IMAGES_EXPIRES days is not requested again;
+      after that it is revalidated with If-None-Match / If-Modified-Since
+    - thumbnails (IMAGES_THUMBS) are made in a thread pool
+      (IMAGES_THUMB_WORKERS), off the reactor thread
+    - the store's manifest links each item URL to the images it uses
+
+    Each ``images`` entry has url, path, checksum (sha256) and status:
+    downloaded, duplicate (stored before under another URL), uptodate
+    (known URL, no request) or not_modified (304 on revalidation).
+    """
+
+    def __init__(self, crawler, root, thumbs, expires_days=90, workers=None):
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.root = root
+        self.thumbs = thumbs
+        self.expires = expires_days * 86400
+        self.workers = workers or default_workers()
+        self.logger = logging.getLogger(__name__)
+        self.store = None
+        self.pool = None
+        self._inflight = {}   # url -> Deferreds waiting for its download
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            crawler,
+            root=settings.get("IMAGES_STORE", "data/images"),
+            thumbs=settings.getdict("IMAGES_THUMBS") or {"small": (320, 320)},
+            expires_days=settings.getfloat("IMAGES_EXPIRES", 90),
+            workers=settings.getint("IMAGES_THUMB_WORKERS", 0) or None,
+        )
+
+    def open_spider(self, spider=None):
+        self.store = ImageStore(self.root)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbs")
+
+    def close_spider(self, spider=None):
+        self.pool.shutdown(wait=True)
+        summary = self.store.summary()
+        self.store.close()
+        self.logger.info(f"Image store: {summary['images']} images ({summary['bytes'] / 1024:,.0f} KB) "
+                         f"for {summary['urls']} URLs")
+
+    async def process_item(self, item, spider=None):
+        adapter = ItemAdapter(item)
+        urls = list(dict.fromkeys(adapter.get("image_urls") or []))
+        if not urls:
+            return item
+        results = await maybe_deferred_to_future(defer.DeferredList(
+            [self._image_once(url) for url in urls], consumeErrors=True))
+        images = []
+        for url, (ok, result) in zip(urls, results):
+            if ok and result is not None:
+                images.append(result)
+            else:
+                self.stats.inc_value("images/failed")
+                self.logger.warning(f"Image failed: {url} ({result.value if not ok else 'no image'})")
+        with suppress(KeyError):
+            adapter["images"] = images
+        if adapter.get("url"):
+            self.store.link(adapter["url"], [img["checksum"] for img in images])
+        return item
+
+    def _image_once(self, url):
+        """``_image(url)``, shared by items that want the same URL at the same time."""
+        waiters = self._inflight.get(url)
+        if waiters is not None:
+            d = defer.Deferred()
+            waiters.append(d)
+            return d.addCallback(
+                lambda r: r and self._result(url, r["checksum"], r["path"], "uptodate"))
+        waiters = self._inflight[url] = []
+
+        def fire(result):
+            del self._inflight[url]
+            for d in waiters:
+                if isinstance(result, Failure):
+                    d.errback(result)
+                else:
+                    d.callback(result)
+            return result
+
+        return deferred_from_coro(self._image(url)).addBoth(fire)
+
+    async def _image(self, url):
+        entry = self.store.url_entry(url)
+        headers = {}
+        if entry is not None:
+            if time.time() - entry.fetched_at < self.expires:
+                return self._result(url, entry.sha, entry.path, "uptodate")
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = await self._download(Request(url, headers=headers, dont_filter=True))
+        if response.status == 304 and entry is not None:
+            self.store.touch_url(url)
+            return self._result(url, entry.sha, entry.path, "not_modified")
+        if response.status != 200 or not response.body:
+            return None
+
+        content_type = response.headers.get("Content-Type", b"").decode("latin-1")
+        sha, path, new = self.store.put(response.body, content_type, url)
+        self.store.record_url(url, sha, _header(response, "ETag"), _header(response, "Last-Modified"))
+        if new:
+            self.stats.inc_value("images/stored_bytes", len(response.body))
+            if not path.endswith(".svg"):
+                try:
+                    width, height = await self._in_pool(
+                        make_thumbnails, str(self.store.root / path), str(self.store.root), sha, self.thumbs)
+                    self.store.set_dimensions(sha, width, height)
+                except Exception as e:
+                    self.logger.warning(f"No thumbnails for {url}: {e}")
+        return self._result(url, sha, path, "downloaded" if new else "duplicate")
+
+    async def _download(self, request):
+        engine = self.crawler.engine
+        if hasattr(engine, "download_async"):
+            return await engine.download_async(request)
+        return await maybe_deferred_to_future(engine.download(request))
+
+    def _in_pool(self, fn, *args):
+        """Run ``fn`` in the thread pool; the result is delivered on the reactor thread."""
+        from twisted.internet import reactor
+        d = defer.Deferred()
+
+        def done(fut):
+            if fut.exception() is not None:
+                reactor.callFromThread(d.errback, fut.exception())
+            else:
+                reactor.callFromThread(d.callback, fut.result())
+
+        self.pool.submit(fn, *args).add_done_callback(done)
+        return maybe_deferred_to_future(d)
+
+    def _result(self, url, sha, path, status):
+        self.stats.inc_value(f"images/{status}")
+        return {"url": url, "path": path, "checksum": sha, "status": status}
+
+
+class FactIndexPipeline:
+    """
+    Stores each item's ``facts`` (see src/detect/facts.py) in the
+    FactIndex at FACTS_INDEX_PATH, replacing the facts stored for its URL.
+    """
+
+    def __init__(self, path=DEFAULT_FACTS_PATH, stats=None):
+        self.path = path
+        self.stats = stats
+        self.index = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.get("FACTS_INDEX_PATH", DEFAULT_FACTS_PATH), crawler.stats)
+
+    def open_spider(self, spider=None):
+        self.index = FactIndex(self.path)
+
+    def close_spider(self, spider=None):
+        self.index.close()
+
+    def process_item(self, item, spider=None):
+        adapter = ItemAdapter(item)
+        facts = adapter.get("facts")
+        if adapter.get("url") and facts is not None:
+            self.index.add(adapter["url"], facts)
+            if self.stats is not None:
+                self.stats.inc_value("facts/indexed", len(facts))
+        return item
+
+
+def _header(response, name):
+    value = response.headers.get(name)
+    return value.decode("latin-1") if value else None
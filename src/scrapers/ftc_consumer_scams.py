@@ -5,52 +5,59 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import argparse
-import time
-from bs4 import BeautifulSoup
-from src.utils import session, save_jsonl
+from src.utils import session, save_jsonl, append_jsonl
+from src.utils.crawl_state import CrawlState
+from src.utils.extract import extract_article, extract_links
+from src.utils.async_fetch import DEFAULT_RATE
+from src.utils.pipeline import ScrapePipeline, DEFAULT_FETCH_WORKERS
 
 BASE = "https://consumer.ftc.gov/scams"
 
+def parse_scam(url, html, meta):
+    """Build the record for a scam article page (runs in pipeline workers)."""
+    article = extract_article(html, "scams")
+    return {"title": meta["title"], "url": url, "published": article.published, "body": article.body}
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--limit", type=int, default=20)
     ap.add_argument("--out", default="data/ftc_consumer_scams.jsonl")
+    ap.add_argument("--full", action="store_true",
+                    help="Re-crawl everything instead of skipping already-collected URLs")
+    ap.add_argument("--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS,
+                    help="Threads downloading article pages")
+    ap.add_argument("--parse-workers", type=int, default=None,
+                    help="Processes parsing and scoring article pages (default: CPU count)")
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                    help="Max requests/second to consumer.ftc.gov")
     args = ap.parse_args()
 
-    sess = session()
+    sess = session(pool_connections=args.fetch_workers, pool_maxsize=args.fetch_workers,
+                   revalidate=args.full)
+    state = CrawlState("ftc_consumer_scams", full=args.full)
     r = sess.get(BASE)
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-
-    cards = soup.select("h3 a")
-    out = []
-    for a in cards:
-        href = a.get("href")
-        if not href or href.startswith("#"):
-            continue
-        url = href if href.startswith("http") else ("https://consumer.ftc.gov" + href)
-        body = ""
-        pub = ""
-        try:
-            ar = sess.get(url)
-            ar.raise_for_status()
-            asoup = BeautifulSoup(ar.text, "html.parser")
-            main = asoup.select_one("main") or asoup.select_one("article") or asoup.body
-            if main:
-                paras = [p.get_text(" ", strip=True) for p in main.find_all("p")]
-                body = "\n".join([p for p in paras if p])
-            dt = asoup.select_one("time[datetime]") or asoup.select_one("time")
-            if dt:
-                pub = dt.get("datetime") or dt.get_text(" ", strip=True)
-        except Exception:
-            pass
-        out.append({"title": a.get_text(strip=True), "url": url, "published": pub, "body": body})
-        if len(out) >= args.limit:
-            break
-        time.sleep(0.35)
-
-    save_jsonl(args.out, out)
-    print(f"Wrote {len(out)} items to {args.out}")
+    cards = extract_links(r.text, ("//h3//a",), BASE)
+
+    pipeline = ScrapePipeline(parse_scam, sess=sess,
+                              write=lambda rec: print(f"Scraped: {rec['title']}"),
+                              fetch_workers=args.fetch_workers,
+                              parse_workers=args.parse_workers, rate=args.rate)
+    jobs = [(url, {"title": title}) for url, title in state.new_only(cards)]
+    out = pipeline.run(jobs, limit=args.limit)
+    print(pipeline.summary())
+
+    if args.full:
+        save_jsonl(args.out, out)
+        print(f"Wrote {len(out)} items to {args.out}")
+    else:
+        added = append_jsonl(args.out, out, replace=True)
+        print(f"Appended {added} new items to {args.out}")
+    # Only now that the records are on disk
+    state.record_many((rec["url"], rec["body"]) for rec in out)
+    print(state.summary())
+    state.close()
+    print(sess.stats.summary())
 
 if __name__ == "__main__":
     main()
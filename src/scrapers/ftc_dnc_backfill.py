@@ -0,0 +1,255 @@
+"""
+FTC Do Not Call CSV backfill
+Ingests many daily DNC complaint files in parallel into date-partitioned output
+
+The FTC publishes one complaint CSV per business day. This backfill takes a
+date range (one URL per day) or a directory of downloaded CSVs and runs
+each file through ``DNCCSVScraper`` in its own worker process, so a year of
+files scales with cores instead of running file by file.
+
+Records are written per ``Created_Date`` day:
+
+    <output>/created_date=2025-11-13/DNC_Complaint_Numbers_2025-11-13.jsonl
+
+Each source file owns its own fragment in every partition it touches, so
+workers never share an output file and re-ingesting a file replaces its
+fragments. ``<output>/_manifest.jsonl`` records every ingested file; later
+runs skip those (and local files whose size and mtime are unchanged)
+unless ``--force`` is given. Days that fail (e.g. no file on a weekend)
+are not recorded and are retried next time.
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from src.detect.parallel import default_workers
+from src.scrapers.ftc_dnc_csv import DNCCSVScraper
+from src.utils.jsonl import JsonlStore
+
+DAILY_URL = "https://www.ftc.gov/sites/default/files/DNC_Complaint_Numbers_{date}.csv"
+DEFAULT_OUTPUT = 'data/dnc'
+MANIFEST = '_manifest.jsonl'
+UNKNOWN_DATE = 'unknown'
+
+_ISO_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+_US_DATE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+
+
+class Source(NamedTuple):
+    """One CSV to ingest: a file name plus a local path or a URL."""
+    name: str
+    location: str
+    is_url: bool = False
+
+
+def daily_sources(start: date, end: date, url_template: str = DAILY_URL) -> List[Source]:
+    """One source per day from ``start`` to ``end`` (inclusive)."""
+    sources = []
+    day = start
+    while day <= end:
+        url = url_template.format(date=day.isoformat())
+        sources.append(Source(url.rsplit('/', 1)[-1], url, True))
+        day += timedelta(days=1)
+    return sources
+
+
+def dir_sources(directory) -> List[Source]:
+    """Every .csv file in ``directory``, by name."""
+    return [Source(p.name, str(p)) for p in sorted(Path(directory).glob('*.csv'))]
+
+
+def partition_key(created_date: str) -> str:
+    """``YYYY-MM-DD`` for a Created_Date value (ISO or M/D/YYYY), else 'unknown'."""
+    m = _ISO_DATE.match(created_date or '')
+    if m:
+        return m.group(0)
+    m = _US_DATE.match(created_date or '')
+    if m:
+        month, day, year = m.groups()
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+    return UNKNOWN_DATE
+
+
+def partition_path(output_dir, key: str, source_name: str) -> Path:
+    return Path(output_dir) / f"created_date={key}" / (Path(source_name).stem + '.jsonl')
+
+
+def file_signature(source: Source) -> Optional[dict]:
+    """Size and mtime of a local source, so an edited file is ingested again."""
+    if source.is_url:
+        return None
+    st = os.stat(source.location)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def ingest_file(source: Source, output_dir: str, old_partitions: Iterable[str] = ()) -> dict:
+    """
+    Worker task: stream one CSV into its partition fragments. Fragments are
+    written under temp names and renamed into place only once the whole
+    file was read, so a failed file leaves the previous output untouched
+    (and no temp files behind).
+    """
+    start = time.perf_counter()
+    scraper = DNCCSVScraper(csv_file=None if source.is_url else source.location)
+    if source.is_url:
+        scraper.csv_url = source.location
+
+    # Temp fragments left by an earlier run of this file that was killed
+    for stale in Path(output_dir).glob(f"created_date=*/{Path(source.name).stem}.jsonl.tmp"):
+        stale.unlink()
+
+    files: Dict[str, object] = {}
+    counts: Dict[str, int] = {}
+    ok = False
+    try:
+        for complaint in scraper.iter_complaints():
+            record = scraper.process_complaint(complaint)
+            if record is None:
+                continue
+            key = partition_key(record['published'])
+            f = files.get(key)
+            if f is None:
+                path = partition_path(output_dir, key, source.name)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                f = files[key] = open(f"{path}.tmp", 'w', encoding='utf-8')
+                counts[key] = 0
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            counts[key] += 1
+        for f in files.values():
+            f.close()
+        if scraper.error is not None or not scraper.rows_read:
+            return {'file': source.name, 'error': scraper.error or 'No complaints retrieved'}
+        for key in files:
+            path = partition_path(output_dir, key, source.name)
+            os.replace(f"{path}.tmp", path)
+        ok = True
+    finally:
+        # On any failure close every handle and drop the temp fragments
+        for f in files.values():
+            f.close()
+        if not ok:
+            for key in files:
+                tmp = Path(f"{partition_path(output_dir, key, source.name)}.tmp")
+                if tmp.exists():
+                    tmp.unlink()
+
+    # Fragments from an earlier version of this file that no longer apply
+    for key in set(old_partitions) - set(files):
+        path = partition_path(output_dir, key, source.name)
+        if path.exists():
+            path.unlink()
+    return {
+        'file': source.name,
+        'location': source.location,
+        'rows': scraper.rows_read,
+        'records': sum(counts.values()),
+        'partitions': dict(sorted(counts.items())),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+class DNCBackfill:
+    """Parallel, resumable ingestion of many DNC CSV files."""
+
+    def __init__(self, output_dir=DEFAULT_OUTPUT, workers: int = None, force: bool = False):
+        self.output_dir = Path(output_dir)
+        self.workers = workers or default_workers()
+        self.force = force
+        self.manifest = JsonlStore(self.output_dir / MANIFEST, key='file', compact_ratio=0.5)
+        self.ingested = {rec['file']: rec for rec in self.manifest.latest()}
+
+    def pending(self, sources: Iterable[Source]) -> List[Source]:
+        """Sources not ingested yet (all of them with ``force``)."""
+        if self.force:
+            return list(sources)
+        todo = []
+        for source in sources:
+            done = self.ingested.get(source.name)
+            if done is None:
+                todo.append(source)
+            elif not source.is_url and done.get('signature') != file_signature(source):
+                todo.append(source)
+        return todo
+
+    def run(self, sources: Iterable[Source]) -> dict:
+        """Ingest ``sources``; returns counts of ingested, skipped and failed files."""
+        sources = list(sources)
+        todo = self.pending(sources)
+        skipped = len(sources) - len(todo)
+        if skipped:
+            print(f"Skipping {skipped} already ingested files (use --force to re-ingest)")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        start = time.perf_counter()
+        done, failed, records = 0, [], 0
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {}
+            for source in todo:
+                old = self.ingested.get(source.name, {}).get('partitions', {})
+                futures[pool.submit(ingest_file, source, str(self.output_dir), list(old))] = source
+            for fut in as_completed(futures):
+                source = futures[fut]
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    result = {'file': source.name, 'error': str(e)}
+                if 'error' in result:
+                    failed.append(source.name)
+                    print(f"✗ {source.name}: {result['error']}")
+                    continue
+                # Only the parent writes the manifest, one finished file at a time
+                result['signature'] = file_signature(source)
+                result['ingested_at'] = time.time()
+                self.manifest.append([result], replace=True)
+                self.ingested[source.name] = result
+                done += 1
+                records += result['records']
+                print(f"✓ {source.name}: {result['records']}/{result['rows']} complaints "
+                      f"in {len(result['partitions'])} partitions")
+
+        elapsed = time.perf_counter() - start
+        print(f"✅ Ingested {done} files ({records} fraud-related complaints) into "
+              f"{self.output_dir} in {elapsed:.1f}s with {self.workers} workers"
+              + (f"; {len(failed)} failed" if failed else ""))
+        return {'ingested': done, 'skipped': skipped, 'failed': failed, 'records': records,
+                'seconds': round(elapsed, 3)}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Backfill FTC DNC complaint CSVs into date partitions')
+    parser.add_argument('--dir', help='Directory of downloaded DNC CSV files')
+    parser.add_argument('--start', type=date.fromisoformat, help='First day to download (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Last day to download (default: --start)')
+    parser.add_argument('--url-template', default=DAILY_URL,
+                        help='Daily file URL with a {date} placeholder')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Output directory')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Re-ingest files listed in the manifest')
+
+    args = parser.parse_args()
+    if bool(args.dir) == bool(args.start):
+        parser.error('give either --dir or --start [--end]')
+
+    if args.dir:
+        sources = dir_sources(args.dir)
+    else:
+        sources = daily_sources(args.start, args.end or args.start, args.url_template)
+    if not sources:
+        print("No CSV files to ingest")
+        return
+    DNCBackfill(args.output, workers=args.workers, force=args.force).run(sources)
+
+
+if __name__ == "__main__":
+    main()
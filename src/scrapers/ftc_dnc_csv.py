@@ -2,35 +2,250 @@
 FTC Do Not Call CSV Data Scraper
 Alternative method using weekly CSV files from FTC
 """
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import requests
+import codecs
 import csv
 import json
-from pathlib import Path
-from datetime import datetime
-import io
+import os
+import re
+import tempfile
+import time
+from itertools import chain, islice
+import numpy as np
+from src.detect.taxonomy import FRAUD_TAXONOMY
+from src.utils.jsonl import JsonlStore, save_jsonl
 
+CHUNK_SIZE = 10_000            # records per write
+DOWNLOAD_CHUNK = 1 << 20       # bytes per network read
+BLOCK_BYTES = 16 << 20         # CSV bytes per Arrow batch in the columnar path
 
-def save_jsonl(data, filename):
-    """Save data to JSONL file"""
-    filepath = Path(filename)
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        for item in data:
-            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+COMPLAINT_URL = "https://www.ftc.gov/policy/public-comments/do-not-call-complaint"
+SOURCE = 'FTC DNC Complaints'
+
+# CSV columns and the value used when a column is missing
+COLUMNS = {
+    'Company_Phone_Number': 'Unknown',
+    'Created_Date': '',
+    'Violation_Date': '',
+    'Consumer_City': '',
+    'Consumer_State': '',
+    'Consumer_Area_Code': '',
+    'Subject': 'Unknown',
+    'Recorded_Message_Or_Robocall': 'N',
+}
+# Columns in complaint_body argument order
+BODY_FIELDS = ('Company_Phone_Number', 'Created_Date', 'Violation_Date', 'Consumer_City',
+               'Consumer_State', 'Consumer_Area_Code', 'Subject')
+
+
+def is_fraud(text, mask=None):
+    """
+    True if text contains any DNC fraud term (taxonomy list 'dnc'). Pass the
+    category ``mask`` from an existing taxonomy scan to read it from there;
+    otherwise only the 'dnc' terms are searched for.
+    """
+    if mask is None:
+        return bool(FRAUD_TAXONOMY.matcher_for("list", "dnc").search(text))
+    return FRAUD_TAXONOMY.has(mask, "list", "dnc")
+
+
+def complaint_body(phone_number, created_date, violation_date, city, state, area_code,
+                   subject, is_robocall):
+    """Descriptive body text for one complaint"""
+    return f"""
+Do Not Call Complaint Report
+
+Phone Number: {phone_number}
+Date Reported: {created_date}
+Violation Date: {violation_date}
+Location: {city}, {state} (Area Code: {area_code})
+Subject: {subject}
+Robocall: {'Yes' if is_robocall else 'No'}
+
+This complaint was filed with the FTC regarding unwanted calls. 
+The caller used number {phone_number} and the subject was related to {subject}.
+{'This was reported as an automated robocall.' if is_robocall else 'This was reported as a live caller.'}
+            """.strip()
+
+
+def iter_text_lines(chunks, encoding='utf-8-sig'):
+    """
+    Decode a stream of byte chunks into text lines that keep their line
+    endings, so csv can still parse quoted fields spanning several lines.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    tail = ""
+    for chunk in chunks:
+        *lines, tail = (tail + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_batches(items, size=CHUNK_SIZE):
+    """Yield successive lists of up to ``size`` items."""
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+# -- columnar path (pyarrow) -------------------------------------------------
+# Optional: needs pyarrow. Rows stay in Arrow arrays end to end, so the
+# CSV parse, string building and output run in C++ a batch at a time.
+
+def _arrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.csv
+    except ImportError:
+        raise ImportError("The columnar DNC path needs pyarrow: uv sync --extra columnar")
+    return pyarrow
+
+
+def body_template(is_robocall):
+    """
+    complaint_body as [(literal text, column or None), ...], found by
+    rendering it once with marker values in place of the columns.
+    """
+    marks = [f"\x00{i}\x00" for i in range(len(BODY_FIELDS))]
+    parts = re.split("\x00(\\d+)\x00", complaint_body(*marks, is_robocall))
+    return [(parts[i], BODY_FIELDS[int(parts[i + 1])] if i + 1 < len(parts) else None)
+            for i in range(0, len(parts), 2)]
+
+
+def batch_columns(batch):
+    """Complaint columns of a RecordBatch (defaults for missing ones) and the robocall flags"""
+    pa = _arrow()
+    names = batch.schema.names
+    cols = {name: batch.column(names.index(name)) if name in names
+            else pa.array([default] * batch.num_rows, pa.string())
+            for name, default in COLUMNS.items()}
+    robocall = pa.compute.equal(pa.compute.utf8_upper(cols['Recorded_Message_Or_Robocall']), 'Y')
+    return cols, robocall
+
+
+def fraud_mask(cols, robocall):
+    """
+    ``is_fraud(body)`` for every row without building the bodies. Terms
+    cannot span a column and the template text around it, so the template
+    is checked once per robocall flag and each column once per distinct
+    value (the Subject column has ~20), and the results are broadcast.
+    """
+    pc = _arrow().compute
+    flags = robocall.to_numpy(zero_copy_only=False)
+    mask = np.zeros(len(flags), dtype=bool)
+    for flag in (True, False):
+        if is_fraud("".join(text for text, _ in body_template(flag))):
+            mask |= flags == flag
+    for name in BODY_FIELDS:
+        if mask.all():
+            break
+        encoded = pc.dictionary_encode(cols[name])
+        hits = np.fromiter((is_fraud(v) for v in encoded.dictionary.to_pylist()),
+                           dtype=bool, count=len(encoded.dictionary))
+        mask |= hits[encoded.indices.to_numpy(zero_copy_only=False)]
+    return mask
+
+
+def _json_chars(arr):
+    """A string array JSON-escaped (without quotes); only values that need it go through json"""
+    pa = _arrow()
+    needs = pa.compute.match_substring_regex(arr, r'["\\\x00-\x1f]')
+    if not pa.compute.any(needs).as_py():
+        return arr
+    values = arr.to_pylist()
+    for i in np.flatnonzero(needs.to_numpy(zero_copy_only=False)):
+        values[i] = json.dumps(values[i], ensure_ascii=False)[1:-1]
+    return pa.array(values, pa.string())
+
+
+def _pieces(template_yes, template_no, cols, robocall, escape=False):
+    """Literal text and columns to join for the body, with robocall-dependent text chosen per row"""
+    pc = _arrow().compute
+    out = []
+    for (yes, name), (no, _) in zip(template_yes, template_no):
+        if escape:
+            yes, no = (json.dumps(t, ensure_ascii=False)[1:-1] for t in (yes, no))
+        out.append(yes if yes == no else pc.if_else(robocall, yes, no))
+        if name:
+            out.append(cols[name])
+    return out
+
+
+def _join(pieces):
+    """Row-wise concatenation of string arrays and literals in one pass"""
+    pa = _arrow()
+    return pa.compute.binary_join_element_wise(
+        *(pa.scalar(p) if isinstance(p, str) else p for p in pieces), "")
+
+
+def batch_jsonl(batch):
+    """UTF-8 JSONL (same bytes as the row path) for the fraud-related rows of a batch"""
+    pa = _arrow()
+    cols, robocall = batch_columns(batch)
+    keep = pa.array(fraud_mask(cols, robocall))
+    cols = {name: col.filter(keep) for name, col in cols.items()}
+    robocall = robocall.filter(keep)
+    if not len(robocall):
+        return b"", 0
+    esc = {name: _json_chars(col) for name, col in cols.items()}
+    body = _pieces(body_template(True), body_template(False), esc, robocall, escape=True)
+    lines = _join([
+        '{"title": "DNC Complaint: ', esc['Subject'], ' - ', esc['Company_Phone_Number'],
+        f'", "url": "{COMPLAINT_URL}", "published": "', esc['Created_Date'],
+        '", "body": "', *body,
+        f'", "source": "{SOURCE}", "metadata": {{"phone_number": "', esc['Company_Phone_Number'],
+        '", "violation_date": "', esc['Violation_Date'],
+        '", "location": "', esc['Consumer_City'], ', ', esc['Consumer_State'],
+        '", "area_code": "', esc['Consumer_Area_Code'],
+        '", "subject": "', esc['Subject'],
+        '", "is_robocall": ', pa.compute.if_else(robocall, 'true', 'false'), '}}\n',
+    ])
+    # The joined rows are contiguous in the array's data buffer
+    offsets = np.frombuffer(lines.buffers()[1], dtype=np.int32,
+                            count=len(lines) + 1, offset=lines.offset * 4)
+    return lines.buffers()[2].to_pybytes()[offsets[0]:offsets[-1]], len(lines)
+
+
+def batch_table(batch):
+    """Arrow table of the fraud-related rows (record fields, metadata as a struct)"""
+    pa = _arrow()
+    cols, robocall = batch_columns(batch)
+    keep = pa.array(fraud_mask(cols, robocall))
+    cols = {name: col.filter(keep) for name, col in cols.items()}
+    robocall = robocall.filter(keep)
+    n = len(robocall)
+    metadata = pa.StructArray.from_arrays([
+        cols['Company_Phone_Number'],
+        cols['Violation_Date'],
+        _join([cols['Consumer_City'], ', ', cols['Consumer_State']]),
+        cols['Consumer_Area_Code'],
+        cols['Subject'],
+        robocall,
+    ], names=['phone_number', 'violation_date', 'location', 'area_code', 'subject', 'is_robocall'])
+    return pa.Table.from_arrays([
+        _join(['DNC Complaint: ', cols['Subject'], ' - ', cols['Company_Phone_Number']]),
+        pa.array([COMPLAINT_URL] * n, pa.string()),
+        cols['Created_Date'],
+        _join(_pieces(body_template(True), body_template(False), cols, robocall)),
+        pa.array([SOURCE] * n, pa.string()),
+        metadata,
+    ], names=['title', 'url', 'published', 'body', 'source', 'metadata'])
 
 
-def is_fraud(text):
-    """Simple fraud keyword detection"""
-    fraud_keywords = [
-        'fraud', 'scam', 'phishing', 'identity theft', 'robocall',
-        'impersonat', 'deceptive', 'unauthorized', 'fake', 'illegal',
-        'telemarket', 'spam', 'spoofing', 'theft', 'debt', 'medicare',
-        'social security', 'irs', 'warranty', 'prize', 'sweepstakes'
-    ]
-    text_lower = text.lower()
-    return any(keyword in text_lower for keyword in fraud_keywords)
+class ReadError(Exception):
+    """The CSV read or download stopped partway (see ``DNCCSVScraper.error``)"""
 
 
 class DNCCSVScraper:
@@ -43,135 +258,258 @@ class DNCCSVScraper:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+        self.rows_read = 0
+        self.error = None   # why the last read stopped early, if it failed
     
-    def fetch_csv_data(self):
-        """Load CSV data from local file or download"""
+    def iter_complaints(self):
+        """Yield CSV rows one at a time from the local file or the download"""
         
         # If local file provided, use that
         if self.csv_file:
             print(f"Loading DNC complaints from local file: {self.csv_file}")
             try:
-                with open(self.csv_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    complaints = list(reader)
-                print(f"✓ Loaded {len(complaints)} complaints from local file")
-                return complaints
+                with open(self.csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+                    for row in csv.DictReader(f):
+                        self.rows_read += 1
+                        yield row
             except FileNotFoundError:
-                print(f"✗ Error: File not found: {self.csv_file}")
-                return []
+                self.error = f"File not found: {self.csv_file}"
+                print(f"✗ Error: {self.error}")
             except Exception as e:
-                print(f"✗ Error reading file: {e}")
-                return []
+                self.error = f"Error reading file: {e}"
+                print(f"✗ {self.error}")
+            return
         
-        # Otherwise try to download
+        # Otherwise stream the download
         print(f"Downloading DNC complaints CSV from FTC...")
         print(f"URL: {self.csv_url}")
         
         try:
-            response = self.session.get(self.csv_url, timeout=60)
-            response.raise_for_status()
-            
-            # Parse CSV
-            csv_content = response.content.decode('utf-8')
-            reader = csv.DictReader(io.StringIO(csv_content))
-            
-            complaints = list(reader)
-            print(f"Downloaded {len(complaints)} complaints from CSV")
-            
-            return complaints
+            with self.session.get(self.csv_url, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                lines = iter_text_lines(response.iter_content(chunk_size=DOWNLOAD_CHUNK))
+                for row in csv.DictReader(lines):
+                    self.rows_read += 1
+                    yield row
             
         except requests.exceptions.Timeout:
+            self.error = "Request timed out"
             print("Error: Request timed out")
             print("The FTC website may be slow. Try again later.")
-            return []
         except requests.exceptions.RequestException as e:
-            print(f"Error downloading CSV: {e}")
-            return []
+            self.error = f"Error downloading CSV: {e}"
+            print(self.error)
         except Exception as e:
-            print(f"Error parsing CSV: {e}")
-            return []
+            self.error = f"Error parsing CSV: {e}"
+            print(self.error)
     
-    def process_complaints(self, complaints):
-        """Process CSV complaints into standardized format"""
-        processed = []
-        
-        for complaint in complaints:
-            # Use exact column names from your CSV
-            phone_number = complaint.get('Company_Phone_Number', 'Unknown')
-            created_date = complaint.get('Created_Date', '')
-            violation_date = complaint.get('Violation_Date', '')
-            city = complaint.get('Consumer_City', '')
-            state = complaint.get('Consumer_State', '')
-            area_code = complaint.get('Consumer_Area_Code', '')
-            subject = complaint.get('Subject', 'Unknown')
-            is_robocall = complaint.get('Recorded_Message_Or_Robocall', 'N').upper() == 'Y'
-            
-            # Create descriptive body
-            body = f"""
-Do Not Call Complaint Report
-
-Phone Number: {phone_number}
-Date Reported: {created_date}
-Violation Date: {violation_date}
-Location: {city}, {state} (Area Code: {area_code})
-Subject: {subject}
-Robocall: {'Yes' if is_robocall else 'No'}
-
-This complaint was filed with the FTC regarding unwanted calls. 
-The caller used number {phone_number} and the subject was related to {subject}.
-{'This was reported as an automated robocall.' if is_robocall else 'This was reported as a live caller.'}
-            """.strip()
-            
-            title = f"DNC Complaint: {subject} - {phone_number}"
-            
-            # Create standardized record
-            record = {
-                'title': title,
-                'url': f"https://www.ftc.gov/policy/public-comments/do-not-call-complaint",
-                'published': created_date,
-                'body': body,
-                'source': 'FTC DNC Complaints',
-                'metadata': {
-                    'phone_number': phone_number,
-                    'violation_date': violation_date,
-                    'location': f"{city}, {state}",
-                    'area_code': area_code,
-                    'subject': subject,
-                    'is_robocall': is_robocall
-                }
-            }
+    def iter_batches(self, limit=None):
+        """CSV rows as Arrow RecordBatches (all columns as strings), read incrementally"""
+        pa = _arrow()
+        read = pa.csv.ReadOptions(block_size=BLOCK_BYTES)
+        convert = pa.csv.ConvertOptions(column_types={name: pa.string() for name in COLUMNS},
+                                        strings_can_be_null=False)
+        try:
+            if self.csv_file:
+                print(f"Loading DNC complaints from local file: {self.csv_file}")
+                with pa.csv.open_csv(self.csv_file, read_options=read,
+                                     convert_options=convert) as reader:
+                    yield from self._take(reader, limit)
+                return
             
-            # Check if fraud-related
-            if is_fraud(body) or is_fraud(subject):
-                processed.append(record)
-        
-        return processed
+            print(f"Downloading DNC complaints CSV from FTC...")
+            print(f"URL: {self.csv_url}")
+            with self.session.get(self.csv_url, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with pa.csv.open_csv(response.raw, read_options=read,
+                                     convert_options=convert) as reader:
+                    yield from self._take(reader, limit)
+        except FileNotFoundError:
+            self.error = f"File not found: {self.csv_file}"
+            print(f"✗ Error: {self.error}")
+        except requests.exceptions.RequestException as e:
+            self.error = f"Error downloading CSV: {e}"
+            print(self.error)
+        except (pa.ArrowInvalid, OSError) as e:
+            self.error = f"Error parsing CSV: {e}"
+            print(self.error)
+    
+    def _take(self, reader, limit):
+        for batch in reader:
+            if limit is not None and self.rows_read + batch.num_rows > limit:
+                batch = batch.slice(0, limit - self.rows_read)
+            if batch.num_rows:
+                self.rows_read += batch.num_rows
+                yield batch
+            if limit is not None and self.rows_read >= limit:
+                return
     
-    def run(self, output_file='data/dnc_complaints.jsonl', limit=None):
-        """Main method to download and save DNC complaints"""
-        # Fetch CSV data
-        complaints = self.fetch_csv_data()
+    def run_columnar(self, output_file='data/dnc_complaints.jsonl', limit=None):
+        """
+        Columnar version of ``run`` (needs pyarrow): same records, built a
+        batch at a time. Writes Parquet when ``output_file`` ends in
+        .parquet, else JSONL. Returns the number of records written.
+        """
+        _arrow()
+        start = time.perf_counter()
+        path = Path(output_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+        os.close(fd)
+        try:
+            if path.suffix == '.parquet':
+                written = self._write_parquet(tmp, limit)
+            else:
+                written = self._write_jsonl(tmp, limit)
+            # A read that failed partway keeps the previous output
+            if self.rows_read and self.error is None:
+                os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
         
-        if not complaints:
+        if self.error is not None:
+            print(f"✗ Read failed after {self.rows_read} rows; {output_file} left unchanged")
+            return 0
+        if not self.rows_read:
             print("No complaints retrieved")
-            return []
+            return 0
+        print(f"✓ Processed {self.rows_read} complaints in {time.perf_counter() - start:.1f}s")
+        print(f"✅ Saved {written} fraud-related complaints to {output_file}")
+        return written
+    
+    def _write_jsonl(self, tmp, limit):
+        written = 0
+        with open(tmp, 'wb') as f:
+            for batch in self.iter_batches(limit):
+                data, count = batch_jsonl(batch)
+                f.write(data)
+                written += count
+            f.flush()
+            os.fsync(f.fileno())
+        return written
+    
+    def _write_parquet(self, tmp, limit):
+        import pyarrow.parquet as pq
+        written, writer = 0, None
+        try:
+            for batch in self.iter_batches(limit):
+                table = batch_table(batch)
+                writer = writer or pq.ParquetWriter(tmp, table.schema)
+                writer.write_table(table)
+                written += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return written
+    
+    def process_complaints(self, complaints):
+        """Yield the fraud-related complaints in standardized format"""
+        for complaint in complaints:
+            record = self.process_complaint(complaint)
+            if record is not None:
+                yield record
+    
+    def process_complaint(self, complaint):
+        """Standardized record for one CSV row, or None if it is not fraud-related"""
+        # Use exact column names from your CSV
+        phone_number = complaint.get('Company_Phone_Number', 'Unknown')
+        created_date = complaint.get('Created_Date', '')
+        violation_date = complaint.get('Violation_Date', '')
+        city = complaint.get('Consumer_City', '')
+        state = complaint.get('Consumer_State', '')
+        area_code = complaint.get('Consumer_Area_Code', '')
+        subject = complaint.get('Subject', 'Unknown')
+        is_robocall = complaint.get('Recorded_Message_Or_Robocall', 'N').upper() == 'Y'
         
-        # Limit if specified
-        if limit:
-            complaints = complaints[:limit]
-            print(f"Limited to {limit} complaints")
+        # Create descriptive body
+        body = complaint_body(phone_number, created_date, violation_date, city, state,
+                              area_code, subject, is_robocall)
         
-        # Process complaints
-        processed = self.process_complaints(complaints)
+        title = f"DNC Complaint: {subject} - {phone_number}"
         
-        print(f"Filtered to {len(processed)} fraud-related complaints")
+        # Create standardized record
+        record = {
+            'title': title,
+            'url': COMPLAINT_URL,
+            'published': created_date,
+            'body': body,
+            'source': SOURCE,
+            'metadata': {
+                'phone_number': phone_number,
+                'violation_date': violation_date,
+                'location': f"{city}, {state}",
+                'area_code': area_code,
+                'subject': subject,
+                'is_robocall': is_robocall
+            }
+        }
+        
+        # Check if fraud-related (the body already contains the subject)
+        return record if is_fraud(body) else None
+    
+    def _checked(self, records):
+        """``records``, then ReadError if the read behind them stopped on an error"""
+        yield from records
+        if self.error is not None:
+            raise ReadError(self.error)
+    
+    def _append(self, output_file, records):
+        """
+        Append ``records`` once all of them were read: they are spooled to a
+        temp file first, so a read that fails partway appends nothing.
+        """
+        path = Path(output_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+        os.close(fd)
+        try:
+            save_jsonl(tmp, records)
+            with open(tmp, 'r', encoding='utf-8') as f:
+                spooled = (json.loads(line) for line in f)
+                # DNC records share one URL, so dedupe on the whole record
+                store = JsonlStore(path, key=None, compact_ratio=0.5)
+                return sum(store.append(batch) for batch in iter_batches(spooled))
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+    
+    def run(self, output_file='data/dnc_complaints.jsonl', limit=None, append=False):
+        """
+        Stream complaints from the CSV into the output file, one chunk of
+        records at a time. Returns the number of records written. A read
+        that fails partway leaves the output file unchanged.
+        """
+        # Rows are read lazily, so --limit stops the read (and the download) early
+        rows = self.iter_complaints()
+        complaints = islice(rows, limit) if limit else rows
+        processed = self._checked(self.process_complaints(complaints))
         
         # Save to JSONL
-        if processed:
-            save_jsonl(processed, output_file)
-            print(f"✅ Saved {len(processed)} complaints to {output_file}")
+        try:
+            if append:
+                written = self._append(output_file, processed)
+            else:
+                first = next(processed, None)
+                written = save_jsonl(output_file, chain([first], processed)) if first else 0
+        except ReadError:
+            print(f"✗ Read failed after {self.rows_read} rows; {output_file} left unchanged")
+            return 0
+        finally:
+            rows.close()   # stop the download once --limit rows were read
         
-        return processed
+        if not self.rows_read:
+            print("No complaints retrieved")
+            return 0
+        print(f"✓ Read {self.rows_read} complaints" + (f" (limit {limit})" if limit else ""))
+        if append:
+            print(f"✅ Appended {written} new fraud-related complaints to {output_file}")
+        elif written:
+            print(f"✅ Saved {written} fraud-related complaints to {output_file}")
+        else:
+            print("No fraud-related complaints found")
+        return written
 
 
 def main():
@@ -181,11 +519,20 @@ def main():
     parser.add_argument('--file', help='Path to local CSV file')
     parser.add_argument('--limit', type=int, help='Limit number of complaints to process')
     parser.add_argument('--output', default='data/dnc_complaints.jsonl', help='Output file')
+    parser.add_argument('--append', action='store_true',
+                        help='Append complaints not already in the output instead of rewriting it')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Process the CSV in Arrow batches, needs pyarrow (use a .parquet output for Parquet)')
     
     args = parser.parse_args()
     
     scraper = DNCCSVScraper(csv_file=args.file)
-    scraper.run(output_file=args.output, limit=args.limit)
+    if args.columnar:
+        if args.append:
+            parser.error('--columnar rewrites the output; it cannot be combined with --append')
+        scraper.run_columnar(output_file=args.output, limit=args.limit)
+    else:
+        scraper.run(output_file=args.output, limit=args.limit, append=args.append)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 """
 Scraper for FTC Legal Library Cases related to fraud/scams
+
+Case pages are downloaded by fetch threads and parsed and scored in a
+process pool (see src/utils/pipeline.py).
 """
 import sys
 from pathlib import Path
@@ -8,9 +11,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import argparse
-import time
-from bs4 import BeautifulSoup
-from src.utils import session, save_jsonl, is_fraud
+from src.utils import session, save_jsonl, append_jsonl, is_fraud
+from src.utils.crawl_state import CrawlState
+from src.utils.extract import has_class, extract_article, extract_links
+from src.utils.async_fetch import DEFAULT_RATE
+from src.utils.pipeline import ScrapePipeline, DEFAULT_FETCH_WORKERS
 
 # Specific case URLs you want to scrape
 CASE_URLS = [
@@ -20,6 +25,20 @@ CASE_URLS = [
 ]
 
 BASE = "https://www.ftc.gov/legal-library/browse/cases-proceedings"
+CASE_LINKS = ("//article//h3//a", "//article//h2//a", f"//*[{has_class('views-row')}]//h3//a")
+
+def parse_case(url, html, meta=None):
+    """Build the record for a legal case page (runs in pipeline workers)."""
+    article = extract_article(html, "legal")
+    title, pub, body = article.title, article.published, article.body
+    
+    return {
+        "title": title,
+        "url": url,
+        "published": pub,
+        "body": body,
+        "source": "FTC Legal Library"
+    }
 
 def scrape_case(sess, url):
     """Scrape a single legal case page"""
@@ -30,46 +49,7 @@ def scrape_case(sess, url):
         print(f"Error fetching {url}: {e}")
         return None
     
-    soup = BeautifulSoup(r.text, "html.parser")
-    
-    # Extract title
-    title_elem = soup.select_one("h1") or soup.select_one(".page-title")
-    title = title_elem.get_text(strip=True) if title_elem else "No title"
-    
-    # Extract date
-    pub = ""
-    date_elem = soup.select_one("time[datetime]") or soup.select_one(".date")
-    if date_elem:
-        pub = date_elem.get("datetime") or date_elem.get_text(strip=True)
-    
-    # Extract main content
-    body_parts = []
-    
-    # Look for case description/overview
-    overview = soup.select_one(".case-overview") or soup.select_one(".field--name-field-case-overview")
-    if overview:
-        for p in overview.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text and len(text) > 20:
-                body_parts.append(text)
-    
-    # Get main content area
-    main = soup.select_one("article") or soup.select_one(".region-content") or soup.select_one("main")
-    if main:
-        for p in main.find_all("p"):
-            text = p.get_text(" ", strip=True)
-            if text and len(text) > 20 and text not in body_parts:
-                body_parts.append(text)
-    
-    body = "\n\n".join(body_parts)
-    
-    return {
-        "title": title,
-        "url": url,
-        "published": pub,
-        "body": body,
-        "source": "FTC Legal Library"
-    }
+    return parse_case(url, r.text)
 
 def main():
     ap = argparse.ArgumentParser()
@@ -77,65 +57,72 @@ def main():
     ap.add_argument("--out", default="data/ftc_legal_cases.jsonl")
     ap.add_argument("--specific-only", action="store_true", 
                     help="Only scrape the specific case URLs listed in the script")
+    ap.add_argument("--full", action="store_true",
+                    help="Re-crawl everything instead of skipping already-collected URLs")
+    ap.add_argument("--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS,
+                    help="Threads downloading case pages")
+    ap.add_argument("--parse-workers", type=int, default=None,
+                    help="Processes parsing and scoring case pages (default: CPU count)")
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                    help="Max requests/second to ftc.gov")
     args = ap.parse_args()
     
-    sess = session()
-    out = []
-    
+    sess = session(pool_connections=args.fetch_workers, pool_maxsize=args.fetch_workers,
+                   revalidate=args.full)
+    state = CrawlState("ftc_legal_cases", full=args.full)
+
+    def write(case_data):
+        print(f"Scraped: {case_data['title']}")
+
+    pipeline = ScrapePipeline(parse_case, sess=sess, write=write,
+                              fetch_workers=args.fetch_workers,
+                              parse_workers=args.parse_workers, rate=args.rate)
+    limit = None
+
+    def specific():
+        return [(url, {}) for url in state.new_only(CASE_URLS, url=lambda u: u)]
+
     if args.specific_only:
         # Just scrape the specific URLs you listed
         print(f"Scraping {len(CASE_URLS)} specific cases...")
-        for url in CASE_URLS:
-            print(f"Scraping: {url}")
-            case_data = scrape_case(sess, url)
-            if case_data:
-                out.append(case_data)
-            time.sleep(0.5)
+        jobs = specific()
     else:
         # Try to scrape from the browse page
         print("Fetching cases from legal library...")
         try:
             r = sess.get(BASE)
             r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
             
             # Find case links
-            case_links = soup.select("article h3 a, article h2 a, .views-row h3 a")
-            
-            for a in case_links:
-                if len(out) >= args.limit:
-                    break
-                
-                href = a.get("href")
-                if not href:
-                    continue
-                
-                url = href if href.startswith("http") else ("https://www.ftc.gov" + href)
-                title = a.get_text(strip=True)
-                
+            case_links = []
+            for url, title in extract_links(r.text, CASE_LINKS, BASE):
                 # Filter for fraud-related cases
                 if not is_fraud(title):
                     continue
-                
-                print(f"Scraping: {title}")
-                case_data = scrape_case(sess, url)
-                if case_data:
-                    out.append(case_data)
-                
-                time.sleep(0.5)
+                case_links.append((url, title))
+            
+            jobs = [(url, {"title": title}) for url, title in state.new_only(case_links)]
+            limit = args.limit
         
         except Exception as e:
             print(f"Error fetching case list: {e}")
             print("Falling back to specific case URLs...")
-            for url in CASE_URLS:
-                print(f"Scraping: {url}")
-                case_data = scrape_case(sess, url)
-                if case_data:
-                    out.append(case_data)
-                time.sleep(0.5)
+            jobs = specific()
+
+    out = pipeline.run(jobs, limit=limit)
+    print(pipeline.summary())
     
-    save_jsonl(args.out, out)
-    print(f"\nWrote {len(out)} legal cases to {args.out}")
+    if args.full:
+        save_jsonl(args.out, out)
+        print(f"\nWrote {len(out)} legal cases to {args.out}")
+    else:
+        added = append_jsonl(args.out, out, replace=True)
+        print(f"\nAppended {added} new legal cases to {args.out}")
+    # Only now that the records are on disk
+    state.record_many((rec["url"], rec["body"]) for rec in out)
+    print(state.summary())
+    state.close()
+    print(sess.stats.summary())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
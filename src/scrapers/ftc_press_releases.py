@@ -1,6 +1,12 @@
 #!/usr/bin/env python
 """
 Scraper for FTC Press Releases related to fraud/scams
+
+Usage:
+    python src/scrapers/ftc_press_releases.py --limit 20 --pages 3
+    python src/scrapers/ftc_press_releases.py --limit 20 --pages 3 --async --concurrency 8
+    python src/scrapers/ftc_press_releases.py --limit 20 --pages 3 --pipeline --parse-workers 4
+    python src/scrapers/ftc_press_releases.py --full   # ignore crawl state, re-fetch everything
 """
 import sys
 from pathlib import Path
@@ -8,109 +14,257 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import argparse
+import asyncio
 import time
-from bs4 import BeautifulSoup
-from src.utils import session, save_jsonl, is_fraud
+from src.utils import session, save_jsonl, append_jsonl, is_fraud
+from src.utils.crawl_state import CrawlState
+from src.utils.extract import extract_article, extract_links
+from src.utils.async_fetch import AsyncFetcher, DEFAULT_CONCURRENCY, DEFAULT_RATE
+from src.utils.pipeline import ScrapePipeline, DEFAULT_FETCH_WORKERS
 
 BASE = "https://www.ftc.gov/news-events/news/press-releases"
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--limit", type=int, default=20)
-    ap.add_argument("--out", default="data/ftc_press_releases.jsonl")
-    ap.add_argument("--pages", type=int, default=3, help="Number of listing pages to scrape")
-    args = ap.parse_args()
-    
-    sess = session()
+def page_url(base, page_num):
+    return f"{base}?page={page_num}" if page_num > 0 else base
+
+LISTING_LINKS = ("//article//h3//a", "//article//h2//a")
+
+def parse_listing(html, url):
+    """
+    Fraud-related (url, title) pairs on a listing page, in page order.
+    Returns None when the page has no articles at all.
+    """
+    # Find all press release links
+    # FTC uses article tags with links inside
+    links = extract_links(html, LISTING_LINKS, url)
+    if not links:
+        return None
+
+    # Check if title indicates fraud/scam content
+    return [(link, title) for link, title in links if is_fraud(title)]
+
+def parse_article(html):
+    """(published, body) from a press release page."""
+    article = extract_article(html, "press")
+    return article.published, article.body
+
+def make_record(url, title, pub, body):
+    return {
+        "title": title,
+        "url": url,
+        "published": pub,
+        "body": body,
+        "source": "FTC Press Releases"
+    }
+
+def parse_record(url, html, meta):
+    """Pipeline parse step: press release page -> record."""
+    pub, body = parse_article(html)
+    return make_record(url, meta["title"], pub, body)
+
+def new_candidates(candidates, state):
+    """
+    Candidates not collected before, and whether pagination should stop
+    (the page had candidates and every one of them was already known).
+    """
+    if state is None:
+        return candidates, False
+    fresh = state.new_only(candidates)
+    return fresh, bool(candidates) and not fresh
+
+def scrape(base=BASE, limit=20, pages=3, sess=None, state=None):
+    """
+    Fetch listing pages and articles one at a time. With a ``CrawlState``,
+    known articles are skipped and pagination stops at the first page
+    holding only known articles. The caller records the returned articles
+    in the state once they are saved.
+    """
+    sess = sess or session()
     out = []
-    
+
     # Scrape multiple pages of press releases
-    for page_num in range(args.pages):
-        page_url = f"{BASE}?page={page_num}" if page_num > 0 else BASE
+    for page_num in range(pages):
+        url = page_url(base, page_num)
         print(f"Fetching page {page_num + 1}...")
-        
+
         try:
-            r = sess.get(page_url)
+            r = sess.get(url)
             r.raise_for_status()
         except Exception as e:
             print(f"Error fetching page {page_num}: {e}")
             break
-            
-        soup = BeautifulSoup(r.text, "html.parser")
-        
-        # Find all press release links
-        # FTC uses article tags with links inside
-        articles = soup.select("article h3 a, article h2 a")
-        
-        if not articles:
+
+        candidates = parse_listing(r.text, url)
+        if candidates is None:
             print(f"No articles found on page {page_num + 1}")
             break
-        
-        for a in articles:
-            if len(out) >= args.limit:
+        candidates, caught_up = new_candidates(candidates, state)
+        if caught_up:
+            print(f"Page {page_num + 1} has no new articles, stopping")
+            break
+
+        for article_url, title in candidates:
+            if len(out) >= limit:
                 break
-                
-            href = a.get("href")
-            if not href or href.startswith("#"):
-                continue
-                
-            url = href if href.startswith("http") else ("https://www.ftc.gov" + href)
-            title = a.get_text(strip=True)
-            
-            # Check if title indicates fraud/scam content
-            if not is_fraud(title):
-                continue
-            
+
             print(f"Scraping: {title}")
-            
-            body = ""
-            pub = ""
-            
             try:
-                ar = sess.get(url)
+                ar = sess.get(article_url)
                 ar.raise_for_status()
-                asoup = BeautifulSoup(ar.text, "html.parser")
-                
-                # Extract publication date
-                dt = asoup.select_one("time[datetime]") or asoup.select_one(".date")
-                if dt:
-                    pub = dt.get("datetime") or dt.get_text(strip=True)
-                
-                # Extract main content
-                # FTC press releases use specific content areas
-                main = (asoup.select_one("article.node--press-release") or 
-                       asoup.select_one(".region-content") or
-                       asoup.select_one("main") or 
-                       asoup.body)
-                
-                if main:
-                    # Get all paragraphs
-                    paras = []
-                    for p in main.find_all("p"):
-                        text = p.get_text(" ", strip=True)
-                        if text and len(text) > 20:  # Filter out very short paragraphs
-                            paras.append(text)
-                    body = "\n\n".join(paras)
-                
+                pub, body = parse_article(ar.text)
                 time.sleep(0.5)  # Be polite to the server
-                
             except Exception as e:
-                print(f"Error scraping {url}: {e}")
+                print(f"Error scraping {article_url}: {e}")
                 continue
-            
-            out.append({
-                "title": title,
-                "url": url,
-                "published": pub,
-                "body": body,
-                "source": "FTC Press Releases"
-            })
-            
-        if len(out) >= args.limit:
+
+            out.append(make_record(article_url, title, pub, body))
+
+        if len(out) >= limit:
             break
-    
-    save_jsonl(args.out, out)
-    print(f"\nWrote {len(out)} fraud-related press releases to {args.out}")
+    return out
+
+async def scrape_async(base=BASE, limit=20, pages=3, concurrency=DEFAULT_CONCURRENCY,
+                       rate=DEFAULT_RATE, sess=None, state=None):
+    """
+    Same pages, same records and same order as ``scrape``, with article
+    fetches running concurrently.
+
+    Listing pages are still fetched in turn (the next one is only needed if
+    ``limit`` is not yet reached). On each page, exactly as many articles
+    as are still missing are fetched at once; failures are topped up from
+    the following candidates, so nothing beyond ``limit`` is requested.
+    """
+    out = []
+    async with AsyncFetcher(sess, concurrency=concurrency, rate=rate) as fetcher:
+        for page_num in range(pages):
+            url = page_url(base, page_num)
+            print(f"Fetching page {page_num + 1}...")
+
+            try:
+                html = await fetcher.get_text(url)
+            except Exception as e:
+                print(f"Error fetching page {page_num}: {e}")
+                break
+
+            candidates = parse_listing(html, url)
+            if candidates is None:
+                print(f"No articles found on page {page_num + 1}")
+                break
+            candidates, caught_up = new_candidates(candidates, state)
+            if caught_up:
+                print(f"Page {page_num + 1} has no new articles, stopping")
+                break
+
+            pos = 0
+            while len(out) < limit and pos < len(candidates):
+                wave = candidates[pos:pos + limit - len(out)]
+                pos += len(wave)
+                for _, title in wave:
+                    print(f"Scraping: {title}")
+                pages_html = await fetcher.gather_text(u for u, _ in wave)
+                for (article_url, title), html in zip(wave, pages_html):
+                    if isinstance(html, Exception):
+                        print(f"Error scraping {article_url}: {html}")
+                        continue
+                    try:
+                        pub, body = parse_article(html)
+                    except Exception as e:
+                        print(f"Error scraping {article_url}: {e}")
+                        continue
+                    out.append(make_record(article_url, title, pub, body))
+
+            if len(out) >= limit:
+                break
+    return out
+
+def iter_candidates(base, pages, sess, state):
+    """(url, meta) jobs from the listing pages, fetched only as they are needed."""
+    for page_num in range(pages):
+        url = page_url(base, page_num)
+        print(f"Fetching page {page_num + 1}...")
+
+        try:
+            r = sess.get(url)
+            r.raise_for_status()
+        except Exception as e:
+            print(f"Error fetching page {page_num}: {e}")
+            return
+
+        candidates = parse_listing(r.text, url)
+        if candidates is None:
+            print(f"No articles found on page {page_num + 1}")
+            return
+        candidates, caught_up = new_candidates(candidates, state)
+        if caught_up:
+            print(f"Page {page_num + 1} has no new articles, stopping")
+            return
+        for article_url, title in candidates:
+            yield article_url, {"title": title}
+
+def scrape_pipeline(base=BASE, limit=20, pages=3, sess=None, state=None,
+                    fetch_workers=DEFAULT_FETCH_WORKERS, parse_workers=None, rate=DEFAULT_RATE):
+    """
+    Same records and order as ``scrape``, through the staged pipeline:
+    fetch threads, a process pool for parsing and fraud scoring, and one
+    writer reporting progress. Records also carry the fraud scores.
+    """
+    sess = sess or session(pool_connections=fetch_workers, pool_maxsize=fetch_workers)
+
+    def write(rec):
+        print(f"Scraped: {rec['title']}")
+
+    pipeline = ScrapePipeline(parse_record, sess=sess, write=write, fetch_workers=fetch_workers,
+                              parse_workers=parse_workers, rate=rate)
+    out = pipeline.run(iter_candidates(base, pages, sess, state), limit=limit)
+    print(pipeline.summary())
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--limit", type=int, default=20)
+    ap.add_argument("--out", default="data/ftc_press_releases.jsonl")
+    ap.add_argument("--pages", type=int, default=3, help="Number of listing pages to scrape")
+    ap.add_argument("--base", default=BASE, help="Listing URL (e.g. a local test server)")
+    ap.add_argument("--async", dest="use_async", action="store_true",
+                    help="Fetch articles concurrently with per-host rate limiting")
+    ap.add_argument("--pipeline", action="store_true",
+                    help="Fetch in threads and parse/score in a process pool")
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                    help="Max requests in flight in --async/--pipeline mode")
+    ap.add_argument("--parse-workers", type=int, default=None,
+                    help="Parser processes in --pipeline mode (default: CPU count)")
+    ap.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                    help="Max requests/second per host in --async/--pipeline mode")
+    ap.add_argument("--full", action="store_true",
+                    help="Re-crawl everything instead of skipping already-collected URLs")
+    args = ap.parse_args()
+
+    state = CrawlState("ftc_press_releases", full=args.full)
+
+    sess = session(pool_connections=args.concurrency, pool_maxsize=args.concurrency,
+                   revalidate=args.full)
+    if args.use_async:
+        out = asyncio.run(scrape_async(args.base, args.limit, args.pages,
+                                       concurrency=args.concurrency, rate=args.rate, sess=sess,
+                                       state=state))
+    elif args.pipeline:
+        out = scrape_pipeline(args.base, args.limit, args.pages, sess=sess, state=state,
+                              fetch_workers=args.concurrency, parse_workers=args.parse_workers,
+                              rate=args.rate)
+    else:
+        out = scrape(args.base, args.limit, args.pages, sess=sess, state=state)
+
+    if args.full:
+        save_jsonl(args.out, out)
+        print(f"\nWrote {len(out)} fraud-related press releases to {args.out}")
+    else:
+        added = append_jsonl(args.out, out, replace=True)
+        print(f"\nAppended {added} new fraud-related press releases to {args.out}")
+    # Only now that the records are on disk
+    state.record_many((rec["url"], rec["body"]) for rec in out)
+    print(state.summary())
+    state.close()
+    print(sess.stats.summary())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
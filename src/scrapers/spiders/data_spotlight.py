@@ -4,10 +4,15 @@ FTC Data Spotlight Spider
 Scrapes data spotlight articles from https://www.ftc.gov/news-events/data-visualizations/data-spotlight
 Scrapes all 2 pages (30 total articles)
 """
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
 import scrapy
 from datetime import datetime
 from items import DataSpotlightItem
-import re
+from src.detect.facts import extract_facts
 
 
 class DataSpotlightSpider(scrapy.Spider):
@@ -27,9 +32,12 @@ class DataSpotlightSpider(scrapy.Spider):
                 'indent': 2,
             },
         },
+        # Content-addressed store; see ImageStorePipeline in pipelines.py
         'IMAGES_STORE': 'data/images',
+        'IMAGES_THUMBS': {'small': (320, 320)},
         'ITEM_PIPELINES': {
-            'scrapy.pipelines.images.ImagesPipeline': 1,
+            'pipelines.ImageStorePipeline': 1,
+            'pipelines.FactIndexPipeline': 200,
             'pipelines.SupabasePipeline': 300,
         },
     }
@@ -143,12 +151,13 @@ class DataSpotlightSpider(scrapy.Spider):
             image_urls.append(abs_url)
 
         item['image_urls'] = image_urls
-        item['images'] = []  # Will be populated by ImagesPipeline
+        item['images'] = []  # Will be populated by ImageStorePipeline
 
         # Extract sources and statistics
         sources_data = self.extract_sources_and_stats(response)
         item['relevant_data'] = sources_data.get('all_data', [])
         item['sources'] = sources_data.get('sources', [])
+        item['facts'] = sources_data.get('facts', [])
 
         yield item
 
@@ -164,7 +173,8 @@ class DataSpotlightSpider(scrapy.Spider):
         """Extract sources and statistics from the article"""
         sources_data = {
             'sources': [],
-            'all_data': []
+            'all_data': [],
+            'facts': []
         }
 
         # Look for sources section 
@@ -208,36 +218,21 @@ class DataSpotlightSpider(scrapy.Spider):
                 if sources_data['sources']:
                     break
 
-        # Also look for any standalone statistics in the content
-        stat_pattern = r'\b\d+(?:,\d{3})*(?:\.\d+)?(?:\s*(?:%|percent|million|billion|thousand))?\b'
+        # Typed statistics from the whole article, one pass over its text
         all_text = ' '.join(response.css('article ::text, .content ::text').getall())
+        facts = extract_facts(all_text)
+        sources_data['facts'] = [fact._asdict() for fact in facts]
 
-        # Find sentences with numbers that might be statistics
-        sentences_with_stats = re.findall(r'[^.!?]*\d+[^.!?]*[.!?]', all_text)
-
-        if sentences_with_stats and not sources_data['all_data']:
-            sources_data['all_data'] = [s.strip() for s in sentences_with_stats[:10]]  # Limit to 10
+        if facts and not sources_data['all_data']:
+            # Sentences containing statistics, in order, limit 10
+            sentences = list(dict.fromkeys(fact.sentence for fact in facts if fact.unit != 'year'))
+            sources_data['all_data'] = sentences[:10]
 
         return sources_data
 
     def extract_statistics(self, text):
-        """Extract numerical statistics from text"""
-        stats = []
-
-        # Pattern to match numbers with common statistical formats
-        patterns = [
-            r'\b(\d+(?:,\d{3})*(?:\.\d+)?)\s*(%|percent)\b',  # Percentages
-            r'\b(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion|thousand)\b',  # Large numbers
-            r'\$(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion|thousand)?\b',  # Dollar amounts
-            r'\b(\d+(?:,\d{3})*(?:\.\d+)?)\b',  # Any number
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                stats.extend([' '.join(m) if isinstance(m, tuple) else m for m in matches])
-
-        return list(set(stats))  # Remove duplicates
+        """Extract typed statistics (value, unit, currency, sentence) from text"""
+        return [fact._asdict() for fact in extract_facts(text)]
 
     def parse_date(self, date_text):
         """Parse date string into standardized format"""
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""
+Benchmark AdaptiveConcurrencyMiddleware against a local stand-in FTC server.
+
+The server answers with a fixed latency and returns 429 (with Retry-After)
+whenever more than --capacity requests are in flight, like a rate-limited
+site. The same crawl runs with the fixed settings from src/settings.py
+(DOWNLOAD_DELAY=1, 8 per domain) and with the adaptive middleware, and the
+pages/second, 429 counts and the middleware's ``adaptive/`` stats are
+printed as JSON.
+
+Usage:
+    python src/scripts/benchmark_adaptive_crawl.py
+    python src/scripts/benchmark_adaptive_crawl.py --pages 200 --capacity 6 --latency 0.2
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import scrapy
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.reactor import install_reactor
+
+# Same reactor as src/settings.py
+install_reactor("twisted.internet.asyncioreactor.AsyncioSelectorReactor")
+from twisted.internet import defer, reactor
+
+from src.middlewares import AdaptiveConcurrencyMiddleware
+
+FIXED = {"CONCURRENT_REQUESTS": 16, "CONCURRENT_REQUESTS_PER_DOMAIN": 8, "DOWNLOAD_DELAY": 1}
+
+
+def make_handler(latency, capacity):
+    lock = threading.Lock()
+    state = {"in_flight": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                state["in_flight"] += 1
+                over = state["in_flight"] > capacity
+            try:
+                time.sleep(latency)
+                if over:
+                    self.send_response(429)
+                    self.send_header("Retry-After", "1")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                data = f"<html><body><h1>{self.path}</h1></body></html>".encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            finally:
+                with lock:
+                    state["in_flight"] -= 1
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class PagesSpider(scrapy.Spider):
+    name = "bench_pages"
+
+    def __init__(self, base=None, pages=0, **kw):
+        super().__init__(**kw)
+        self.base = base
+        self.pages = int(pages)
+
+    async def start(self):
+        for req in self.start_requests():
+            yield req
+
+    def start_requests(self):
+        for n in range(self.pages):
+            yield scrapy.Request(f"{self.base}/page/{n}", dont_filter=True)
+
+    def parse(self, response):
+        yield {"url": response.url}
+
+
+def crawl_settings(adaptive):
+    settings = {
+        **FIXED,
+        "LOG_LEVEL": "ERROR",
+        "ROBOTSTXT_OBEY": False,
+        "TELNETCONSOLE_ENABLED": False,
+        "RETRY_TIMES": 10,
+        "RETRY_HTTP_CODES": [429, 500, 502, 503, 504],
+        "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
+    }
+    if adaptive:
+        settings.update({
+            "DOWNLOADER_MIDDLEWARES": {AdaptiveConcurrencyMiddleware: 560},
+            "ADAPTIVE_MIN_DELAY": 0.0,
+            "ADAPTIVE_MAX_CONCURRENCY": 16,
+            "ADAPTIVE_WINDOW": 10,
+            "ADAPTIVE_COOLDOWN": 2.0,
+        })
+    return settings
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark fixed vs adaptive Scrapy concurrency")
+    ap.add_argument("--pages", type=int, default=60, help="Pages to crawl per run")
+    ap.add_argument("--latency", type=float, default=0.1, help="Server response time (seconds)")
+    ap.add_argument("--capacity", type=int, default=6, help="Concurrent requests before the server sends 429")
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency, args.capacity))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = {"pages": args.pages, "latency": args.latency, "capacity": args.capacity}
+
+    @defer.inlineCallbacks
+    def run_all():
+        try:
+            for label, adaptive in (("fixed", False), ("adaptive", True)):
+                runner = CrawlerRunner(crawl_settings(adaptive))
+                crawler = runner.create_crawler(PagesSpider)
+                start = time.perf_counter()
+                yield runner.crawl(crawler, base=base, pages=args.pages)
+                seconds = time.perf_counter() - start
+                stats = crawler.stats.get_stats()
+                results[label] = {
+                    "seconds": round(seconds, 2),
+                    "pages_per_second": round(stats.get("item_scraped_count", 0) / seconds, 2),
+                    "items": stats.get("item_scraped_count", 0),
+                    "responses_429": stats.get("downloader/response_status_count/429", 0),
+                    "adaptive": {k: v for k, v in stats.items() if k.startswith("adaptive/")},
+                }
+        finally:
+            reactor.stop()
+
+    reactor.callWhenRunning(run_all)
+    reactor.run()
+    server.shutdown()
+
+    results["speedup"] = round(results["fixed"]["seconds"] / results["adaptive"]["seconds"], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Benchmark DeltaFetchMiddleware against a local stand-in FTC server.
+
+Serves a paginated listing of synthetic articles, crawls it three times
+with the middleware (first crawl, repeat crawl after --new articles were
+published, and a --force style crawl), and prints how many article
+requests were downloaded and skipped each time, as JSON. The stored pages
+live in a temporary SQLite file, not in data/cache.
+
+Usage:
+    python src/scripts/benchmark_deltafetch.py
+    python src/scripts/benchmark_deltafetch.py --articles 200 --new 10 --latency 0.05
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import scrapy
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.reactor import install_reactor
+
+# Same reactor as src/settings.py
+install_reactor("twisted.internet.asyncioreactor.AsyncioSelectorReactor")
+from twisted.internet import defer, reactor
+
+from src.middlewares import DeltaFetchMiddleware
+
+PER_PAGE = 20
+
+
+def make_handler(latency, published):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            count = published["count"]
+            if parts.path == "/press-releases":
+                page = int(parse_qs(parts.query).get("page", ["0"])[0])
+                # Newest first, like the FTC listing
+                ids = range(count - 1 - page * PER_PAGE, max(-1, count - 1 - (page + 1) * PER_PAGE), -1)
+                links = "".join(f'<h3><a href="/press-releases/{n}">Release {n}</a></h3>' for n in ids)
+                nxt = f'<a rel="next" href="?page={page + 1}">next</a>' if (page + 1) * PER_PAGE < count else ""
+                body = f"<html><body>{links}{nxt}</body></html>"
+            elif parts.path.startswith("/press-releases/"):
+                time.sleep(latency)
+                n = parts.path.rsplit("/", 1)[1]
+                body = f"<html><body><h1>Release {n}</h1><p>Refund scam settlement {n}.</p></body></html>"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class ListingSpider(scrapy.Spider):
+    name = "bench_deltafetch"
+
+    def __init__(self, base=None, **kw):
+        super().__init__(**kw)
+        self.start_urls = [f"{base}/press-releases"]
+
+    def parse(self, response):
+        for href in response.css("h3 a::attr(href)").getall():
+            yield response.follow(href, callback=self.parse_article)
+        next_page = response.css('a[rel="next"]::attr(href)').get()
+        if next_page:
+            yield response.follow(next_page, callback=self.parse)
+
+    def parse_article(self, response):
+        yield {"url": response.url, "title": response.css("h1::text").get(),
+               "full_text": " ".join(response.css("p::text").getall())}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark crawls with and without stored pages")
+    ap.add_argument("--articles", type=int, default=100, help="Articles published before the first crawl")
+    ap.add_argument("--new", type=int, default=5, help="Articles published before the repeat crawl")
+    ap.add_argument("--latency", type=float, default=0.05, help="Article response time (seconds)")
+    args = ap.parse_args()
+
+    published = {"count": args.articles}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency, published))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    results = {"articles": args.articles, "new": args.new, "latency": args.latency}
+    tmp = tempfile.TemporaryDirectory()
+    runs = (("first", {}), ("repeat", {}), ("force", {"DELTAFETCH_FORCE": True}))
+
+    @defer.inlineCallbacks
+    def run_all():
+        try:
+            for label, extra in runs:
+                if label == "repeat":
+                    published["count"] += args.new
+                settings = {
+                    "LOG_LEVEL": "ERROR",
+                    "ROBOTSTXT_OBEY": False,
+                    "TELNETCONSOLE_ENABLED": False,
+                    "CONCURRENT_REQUESTS": 8,
+                    "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
+                    "SPIDER_MIDDLEWARES": {DeltaFetchMiddleware: 100},
+                    "DELTAFETCH_PATH": str(Path(tmp.name) / "crawl_state.sqlite"),
+                    **extra,
+                }
+                runner = CrawlerRunner(settings)
+                crawler = runner.create_crawler(ListingSpider)
+                start = time.perf_counter()
+                yield runner.crawl(crawler, base=base)
+                stats = crawler.stats.get_stats()
+                results[label] = {
+                    "seconds": round(time.perf_counter() - start, 2),
+                    "requests": stats.get("downloader/request_count", 0),
+                    "items": stats.get("item_scraped_count", 0),
+                    "skipped": stats.get("deltafetch/skipped", 0),
+                    "stored": stats.get("deltafetch/stored", 0),
+                    "known_at_start": stats.get("deltafetch/known", 0),
+                }
+        finally:
+            reactor.stop()
+
+    reactor.callWhenRunning(run_all)
+    reactor.run()
+    server.shutdown()
+    tmp.cleanup()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Detector throughput benchmark.
+
+Generates synthetic FTC-like (press release / legal case prose) and
+DNC-like (templated complaint) corpora and measures records/sec and peak
+memory for each detection entry point. Results are written as JSON so runs
+can be compared over time.
+
+Usage:
+    python src/scripts/benchmark_detection.py
+    python src/scripts/benchmark_detection.py --sizes 1000 100000 --corpus dnc --out bench.json
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+from src.detect.fraud_detector import KEYWORDS, count_hits, detect_fraud_for_record, record_text
+from src.scrapers import ftc_dnc_csv
+from src.utils import keywords
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+BATCH = 10_000
+
+FILLER = (
+    "the commission announced today that a federal court order settles charges against "
+    "company operators consumers agreed pay refunds million dollars settlement marketing "
+    "practices online services subscription customers deceptive claims products program "
+    "agency complaint alleges defendants business opportunity payments website sales "
+    "order requires notice information data privacy protection staff attorneys bureau"
+).split()
+
+FRAUD_PHRASES = KEYWORDS + [
+    "scammer", "identity fraud", "robocall", "impersonating", "telemarketer",
+    "wire transfer", "tech support scam", "personal information", "social security",
+]
+
+DNC_SUBJECTS = [
+    "Other", "Reducing your debt (credit cards, mortgage, student loans)",
+    "Dropped call or no message",
+    "Calls pretending to be government, businesses, or family and friends",
+    "Medical  & prescriptions", "No Subject Provided", "Warranties  & protection plans",
+    "Home improvement  & cleaning", "Energy, solar,  & utilities", "Charities",
+    "Vacation  & timeshares", "Computer  & technical support",
+    "Work from home  & other ways to make money", "Lotteries, prizes  & sweepstakes",
+]
+
+CITIES = [("Cleveland", "Ohio"), ("York", "Pennsylvania"), ("Austin", "Texas"),
+          ("Fresno", "California"), ("Tampa", "Florida"), ("Denver", "Colorado")]
+
+
+def ftc_doc(rng):
+    """Press-release-like prose, ~300 words with a few fraud phrases."""
+    words = [rng.choice(FILLER) for _ in range(rng.randint(200, 400))]
+    for _ in range(rng.randint(0, 6)):
+        words.insert(rng.randrange(len(words)), rng.choice(FRAUD_PHRASES))
+    title_words = [rng.choice(FILLER) for _ in range(8)]
+    if rng.random() < 0.3:
+        title_words.append(rng.choice(FRAUD_PHRASES))
+    return {"title": " ".join(title_words).capitalize(), "body": " ".join(words).capitalize() + "."}
+
+
+def dnc_doc(rng):
+    """Record shaped like ftc_dnc_csv.DNCCSVScraper.process_complaints output."""
+    phone = f"{rng.randint(200, 999)}{rng.randint(0, 9999999):07d}"
+    city, state = rng.choice(CITIES)
+    subject = rng.choice(DNC_SUBJECTS)
+    robocall = rng.random() < 0.6
+    body = (
+        "Do Not Call Complaint Report\n\n"
+        f"Phone Number: {phone}\nDate Reported: 2025-11-13 09:53:26\n"
+        f"Violation Date: 2025-11-13 08:45:00\nLocation: {city}, {state} (Area Code: {phone[:3]})\n"
+        f"Subject: {subject}\nRobocall: {'Yes' if robocall else 'No'}\n\n"
+        "This complaint was filed with the FTC regarding unwanted calls. \n"
+        f"The caller used number {phone} and the subject was related to {subject}.\n"
+        + ("This was reported as an automated robocall." if robocall
+           else "This was reported as a live caller.")
+    )
+    return {"title": f"DNC Complaint: {subject} - {phone}", "body": body}
+
+
+CORPORA = {"ftc": ftc_doc, "dnc": dnc_doc}
+
+
+def generate_batches(kind, n, seed=0, batch=BATCH):
+    """Yield lists of synthetic records totalling ``n``; same seed, same corpus."""
+    rng = random.Random(f"{kind}-{seed}")
+    make = CORPORA[kind]
+    done = 0
+    while done < n:
+        size = min(batch, n - done)
+        yield [make(rng) for _ in range(size)]
+        done += size
+
+
+TARGETS = {
+    "count_hits": lambda recs: [count_hits(record_text(r)) for r in recs],
+    "detect_fraud_for_record": lambda recs: [detect_fraud_for_record(r) for r in recs],
+    "keywords.find_hits": lambda recs: [keywords.find_hits(record_text(r)) for r in recs],
+    "keywords.is_fraud": lambda recs: [keywords.is_fraud(record_text(r)) for r in recs],
+    "ftc_dnc_csv.is_fraud": lambda recs: [ftc_dnc_csv.is_fraud(record_text(r)) for r in recs],
+}
+
+
+def measure(target, kind, n, seed=0):
+    """
+    Time ``target`` over an ``n``-record corpus. Peak memory is traced over
+    a separate full pass, since tracing slows execution.
+    """
+    fn = TARGETS[target]
+    tracemalloc.start()
+    for batch in generate_batches(kind, n, seed):
+        fn(batch)
+    peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    seconds = 0.0
+    for batch in generate_batches(kind, n, seed):
+        start = time.perf_counter()
+        fn(batch)
+        seconds += time.perf_counter() - start
+    return {
+        "target": target,
+        "corpus": kind,
+        "n_docs": n,
+        "seconds": round(seconds, 4),
+        "records_per_sec": round(n / seconds, 1) if seconds else None,
+        "peak_mem_kb": round(peak_kb, 1),
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=Path(__file__).parent, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark fraud detection throughput")
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    ap.add_argument("--corpus", nargs="+", choices=sorted(CORPORA), default=sorted(CORPORA))
+    ap.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="benchmarks/detection.json", help="JSON results file")
+    args = ap.parse_args()
+
+    results = []
+    for kind in args.corpus:
+        for n in args.sizes:
+            for target in args.targets:
+                res = measure(target, kind, n, args.seed)
+                results.append(res)
+                rate = res['records_per_sec']
+                rate = f"{rate:>12,.0f}" if rate is not None else f"{'n/a':>12s}"
+                print(f"{kind:4s} {n:>9,} {target:26s} {rate} rec/s "
+                      f"peak {res['peak_mem_kb']:>9,.0f} KB")
+
+    report = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "keywords": len(KEYWORDS),
+        "seed": args.seed,
+        "results": results,
+    }
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"\nWrote {len(results)} results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Benchmark the DNC backfill against a local stand-in FTC server.
+
+Serves synthetic daily DNC complaint CSVs (one per day, with a
+configurable response delay and some missing days) from a local HTTP
+server, backfills them with one worker and with --workers workers, checks
+that both produce the same partitions, runs the backfill again to check
+that every file is skipped via the manifest, and prints the timings as
+JSON.
+
+Usage:
+    python src/scripts/benchmark_dnc_backfill.py
+    python src/scripts/benchmark_dnc_backfill.py --days 60 --rows 5000 --workers 4 --latency 0.2
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.scrapers.ftc_dnc_backfill import DNCBackfill, daily_sources
+
+START = date(2025, 1, 1)
+SUBJECTS = ["Imposters", "Debt reduction", "Warranties & protection plans", "Medical & prescriptions",
+            "Calls pretending to be government, businesses, or family and friends", "Other"]
+HEADER = ("Company_Phone_Number,Created_Date,Violation_Date,Consumer_City,Consumer_State,"
+          "Consumer_Area_Code,Subject,Recorded_Message_Or_Robocall\n")
+
+
+def daily_csv(day: date, rows: int) -> bytes:
+    rnd = random.Random(day.toordinal())
+    lines = [HEADER]
+    for i in range(rows):
+        # A few complaints are filed just after midnight and land in the next partition
+        created = day + timedelta(days=1) if i % 50 == 0 else day
+        subject = rnd.choice(SUBJECTS)
+        lines.append(f'{rnd.randint(2000000000, 9999999999)},{created} 09:{i % 60:02d}:00,'
+                     f'{day} 08:00:00,Springfield,Ohio,{rnd.randint(200, 999)},"{subject}",'
+                     f'{rnd.choice("YN")}\n')
+    return "".join(lines).encode("utf-8")
+
+
+def make_handler(latency, files):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            data = files.get(self.path.rsplit("/", 1)[-1])
+            if data is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def partitions(root: Path) -> dict:
+    return {str(p.relative_to(root)): p.read_bytes() for p in sorted(root.glob("created_date=*/*.jsonl"))}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark sequential vs parallel DNC backfill")
+    ap.add_argument("--days", type=int, default=28, help="Days in the backfill range")
+    ap.add_argument("--rows", type=int, default=3000, help="Complaints per daily file")
+    ap.add_argument("--latency", type=float, default=0.1, help="Server delay per file (seconds)")
+    ap.add_argument("--workers", type=int, default=4, help="Workers for the parallel run")
+    args = ap.parse_args()
+
+    end = START + timedelta(days=args.days - 1)
+    days = [START + timedelta(days=i) for i in range(args.days)]
+    # Weekends have no file, like the real feed
+    files = {f"DNC_Complaint_Numbers_{day}.csv": daily_csv(day, args.rows)
+             for day in days if day.weekday() < 5}
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency, files))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    template = f"http://127.0.0.1:{server.server_address[1]}/DNC_Complaint_Numbers_{{date}}.csv"
+    sources = daily_sources(START, end, template)
+
+    results = {"days": args.days, "files": len(files), "rows_per_file": args.rows,
+               "latency": args.latency, "workers": args.workers}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = {}
+            for label, workers in (("sequential", 1), ("parallel", args.workers)):
+                out = Path(tmp) / label
+                stats = DNCBackfill(out, workers=workers).run(sources)
+                results[f"{label}_seconds"] = stats["seconds"]
+                results[f"{label}_failed"] = len(stats["failed"])
+                outputs[label] = partitions(out)
+
+            results["speedup"] = round(results["sequential_seconds"] / results["parallel_seconds"], 2)
+            results["partitions"] = len(outputs["parallel"])
+            results["same_output"] = outputs["sequential"] == outputs["parallel"]
+
+            again = DNCBackfill(Path(tmp) / "parallel", workers=args.workers).run(sources)
+            results["rerun_skipped"] = again["skipped"]
+            results["rerun_ingested"] = again["ingested"]
+    finally:
+        server.shutdown()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
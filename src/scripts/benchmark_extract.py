@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+Benchmark per-page article parsing: BeautifulSoup (html.parser) vs the
+shared lxml extractor in src/utils/extract.py.
+
+Builds synthetic FTC-like pages (navigation, footer, scripts and comments
+around the article), parses each one with the BeautifulSoup logic the
+scrapers used before and with ``extract_article``, checks that both give
+the same title, date and body, and prints per-page timings as JSON.
+
+Usage:
+    python src/scripts/benchmark_extract.py
+    python src/scripts/benchmark_extract.py --pages 200 --paragraphs 40
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import time
+
+from bs4 import BeautifulSoup
+
+from src.utils.extract import PROFILES, extract_article
+
+
+def boilerplate(n):
+    nav = "".join(f'<li><a href="/topic/{i}">Topic {i}</a></li>' for i in range(n))
+    script = "<script>var analytics = {" + ",".join(f"k{i}: {i}" for i in range(n)) + "};</script>"
+    return f"<header><nav><ul>{nav}</ul></nav></header>{script}<!-- tracking pixel -->"
+
+
+def page_html(n, paragraphs, wrapper):
+    paras = "".join(f"<p>Paragraph {j} of page {n}: the operators <b>misled consumers</b> "
+                    f"about refunds and owe ${j * 1000:,} in redress.</p>" for j in range(paragraphs))
+    return (f"<!DOCTYPE html><html><head><title>Page {n}</title>{boilerplate(60)}</head><body>"
+            f"{boilerplate(120)}<h1>FTC Case {n}</h1>"
+            f'<time datetime="2025-02-{n % 28 + 1:02d}T09:00:00Z">February 2025</time>'
+            f"{wrapper[0]}<p>Short.</p>{paras}{wrapper[1]}"
+            f"<footer>{boilerplate(80)}<p>Federal Trade Commission, 600 Pennsylvania Ave</p></footer>"
+            f"</body></html>")
+
+
+WRAPPERS = {
+    "press": ('<article class="node node--press-release">', "</article>"),
+    "legal": ('<div class="case-overview"><p>Overview paragraph that is long enough to keep.</p></div>'
+              "<article>", "</article>"),
+    "scams": ("<main>", "</main>"),
+    "body": ('<div class="field field--name-body">', "</div>"),
+}
+
+
+# -- the BeautifulSoup logic the scrapers used before ----------------------
+
+def _bs_date(soup, fallback, sep):
+    el = soup.select_one("time[datetime]") or soup.select_one(fallback)
+    if not el:
+        return ""
+    return el.get("datetime") or (el.get_text(sep, strip=True) if sep else el.get_text(strip=True))
+
+
+def bs_press(html):
+    soup = BeautifulSoup(html, "html.parser")
+    title = ""
+    h1 = soup.select_one("h1")
+    if h1:
+        title = h1.get_text(strip=True)
+    pub = _bs_date(soup, ".date", "")
+    article = (soup.select_one("article.node--press-release") or soup.select_one(".region-content")
+               or soup.select_one("main") or soup.body)
+    paras = []
+    if article:
+        for p in article.find_all("p"):
+            text = p.get_text(" ", strip=True)
+            if text and len(text) > 20:
+                paras.append(text)
+    return title, pub, "\n\n".join(paras)
+
+
+def bs_legal(html):
+    soup = BeautifulSoup(html, "html.parser")
+    title_elem = soup.select_one("h1") or soup.select_one(".page-title")
+    title = title_elem.get_text(strip=True) if title_elem else "No title"
+    pub = _bs_date(soup, ".date", "")
+    parts = []
+    overview = soup.select_one(".case-overview") or soup.select_one(".field--name-field-case-overview")
+    if overview:
+        for p in overview.find_all("p"):
+            text = p.get_text(" ", strip=True)
+            if text and len(text) > 20:
+                parts.append(text)
+    main = soup.select_one("article") or soup.select_one(".region-content") or soup.select_one("main")
+    if main:
+        for p in main.find_all("p"):
+            text = p.get_text(" ", strip=True)
+            if text and len(text) > 20 and text not in parts:
+                parts.append(text)
+    return title, pub, "\n\n".join(parts)
+
+
+def _bs_simple(html, containers):
+    soup = BeautifulSoup(html, "html.parser")
+    h1 = soup.select_one("h1")
+    title = h1.get_text(strip=True) if h1 else ""
+    main = None
+    for sel in containers:
+        main = soup.select_one(sel)
+        if main:
+            break
+    main = main or soup.body
+    paras = [p.get_text(" ", strip=True) for p in (main.find_all("p") if main else [])]
+    return title, _bs_date(soup, "time", " "), "\n".join(p for p in paras if p)
+
+
+BASELINES = {
+    "press": bs_press,
+    "legal": bs_legal,
+    "scams": lambda html: _bs_simple(html, ("main", "article")),
+    "body": lambda html: _bs_simple(html, (".field--name-body", "article")),
+}
+
+
+def per_page_ms(fn, pages):
+    start = time.perf_counter()
+    results = [fn(html) for html in pages]
+    return (time.perf_counter() - start) * 1000 / len(pages), results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark BeautifulSoup vs lxml article extraction")
+    ap.add_argument("--pages", type=int, default=100, help="Pages per profile")
+    ap.add_argument("--paragraphs", type=int, default=25, help="Article paragraphs per page")
+    args = ap.parse_args()
+
+    report = {"pages": args.pages, "paragraphs": args.paragraphs, "profiles": {}}
+    for name in PROFILES:
+        pages = [page_html(n, args.paragraphs, WRAPPERS[name]) for n in range(args.pages)]
+        old_ms, old = per_page_ms(BASELINES[name], pages)
+        new_ms, new = per_page_ms(lambda html: tuple(extract_article(html, name)), pages)
+        report["profiles"][name] = {
+            "bs4_ms_per_page": round(old_ms, 3),
+            "lxml_ms_per_page": round(new_ms, 3),
+            "speedup": round(old_ms / new_ms, 2),
+            "same_output": old == new,
+        }
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark the compiled fact extractor (src/detect/facts.py) against the
+data spotlight spider's previous statistics regexes.
+
+The corpus is data/ftc_data_spotlight.jsonl repeated --copies times (each
+copy gets its own URL). It reports:
+
+- old: four uncompiled ``re.findall`` patterns per paragraph plus a
+  sentence regex over the whole text (untyped strings)
+- facts: one ``extract_facts`` pass per article, serial and with --workers
+- query: "losses > $1 billion" answered by reparsing every article vs by
+  the FactIndex
+
+Usage:
+    python src/scripts/benchmark_facts.py
+    python src/scripts/benchmark_facts.py --copies 500 --workers 4
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import re
+import tempfile
+import time
+
+from src.detect.facts import FactIndex, extract_facts, extract_facts_many
+from src.detect.parallel import default_workers, iter_jsonl
+from src.scripts.spotlight_facts import article_text, article_url
+
+QUERY = "losses > $1 billion"
+
+OLD_PATTERNS = [
+    r'\b(\d+(?:,\d{3})*(?:\.\d+)?)\s*(%|percent)\b',
+    r'\b(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion|thousand)\b',
+    r'\$(\d+(?:,\d{3})*(?:\.\d+)?)\s*(million|billion|thousand)?\b',
+    r'\b(\d+(?:,\d{3})*(?:\.\d+)?)\b',
+]
+
+
+def old_statistics(text):
+    """The spider's previous extract_statistics / sentence scan."""
+    stats = []
+    # Sentences stand in for the source list items it ran on
+    for paragraph in text.split(". "):
+        for pattern in OLD_PATTERNS:
+            matches = re.findall(pattern, paragraph, re.IGNORECASE)
+            stats.extend(' '.join(m) if isinstance(m, tuple) else m for m in matches)
+    sentences = re.findall(r'[^.!?]*\d+[^.!?]*[.!?]', text)
+    return list(set(stats)), sentences
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, round(time.perf_counter() - start, 3)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark statistics extraction for data spotlight articles")
+    ap.add_argument("--input", default="data/ftc_data_spotlight.jsonl", help="Spotlight JSONL")
+    ap.add_argument("--copies", type=int, default=200, help="Times to repeat the corpus")
+    ap.add_argument("--workers", type=int, default=default_workers(), help="Worker processes")
+    args = ap.parse_args()
+
+    records = list(iter_jsonl(args.input))
+    texts = [article_text(rec) for rec in records] * args.copies
+    urls = [f"{article_url(rec)}#{i}" for i in range(args.copies) for rec in records]
+    report = {"articles": len(texts), "mb": round(sum(len(t) for t in texts) / 1e6, 1),
+              "workers": args.workers}
+
+    old, report["old_seconds"] = timed(lambda: [old_statistics(t) for t in texts])
+    facts, report["facts_seconds"] = timed(lambda: [extract_facts(t) for t in texts])
+    parallel, report["facts_parallel_seconds"] = timed(
+        lambda: list(extract_facts_many(texts, workers=args.workers)))
+    report["parallel_matches_serial"] = parallel == facts
+    report["old_values"] = sum(len(stats) for stats, _ in old)
+    report["facts"] = sum(len(found) for found in facts)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = FactIndex(Path(tmp) / "facts.sqlite")
+        _, report["index_seconds"] = timed(lambda: index.add_many(zip(urls, facts)))
+
+        def reparse():
+            return {u for u, t in zip(urls, texts)
+                    if any(f.metric == "losses" and f.unit == "usd" and f.value > 1e9
+                           for f in extract_facts(t))}
+
+        slow, report["query_reparse_seconds"] = timed(reparse)
+        fast, report["query_index_seconds"] = timed(lambda: index.search(QUERY))
+        index.close()
+    report["query"] = QUERY
+    report["query_matches"] = len(fast)
+    report["query_same_articles"] = slow == set(fast)
+    report["extract_speedup"] = round(report["old_seconds"] / max(report["facts_seconds"], 1e-9), 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""
+Benchmark ImageStorePipeline against a local stand-in FTC server.
+
+Serves articles that each embed chart images. Many charts are shared
+between articles under different URLs, and the server supports ETags.
+The same crawl runs three times into one temporary image store:
+
+- first: every image URL is downloaded, but identical images are stored once
+- repeat: known URLs are not requested at all
+- revalidate: IMAGES_EXPIRES=0, so every URL gets a conditional GET (304)
+
+For each run it prints image requests, bytes received, the per-status counts
+and the store size, as JSON.
+
+Usage:
+    python src/scripts/benchmark_image_store.py
+    python src/scripts/benchmark_image_store.py --articles 60 --images 4 --charts 20
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import hashlib
+import io
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import scrapy
+from PIL import Image
+from scrapy.crawler import CrawlerRunner
+from scrapy.utils.reactor import install_reactor
+
+# Same reactor as src/settings.py
+install_reactor("twisted.internet.asyncioreactor.AsyncioSelectorReactor")
+from twisted.internet import defer, reactor
+
+from src.pipelines import ImageStorePipeline
+from src.utils.image_store import ImageStore
+
+
+def chart_png(n):
+    img = Image.new("RGB", (1200, 800), (255, 255, 255))
+    for x in range(0, 1200, 40):
+        height = (x * (n + 3)) % 700
+        img.paste((30 + n * 10 % 200, 90, 160), (x, 800 - height, x + 30, 800))
+    buf = io.BytesIO()
+    img.save(buf, "PNG")
+    return buf.getvalue()
+
+
+def make_handler(args, charts):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path.startswith("/data-spotlight/"):
+                n = int(path.rsplit("/", 1)[1])
+                # Each article links to shared charts, some under a per-article URL
+                imgs = "".join(f'<img src="/files/chart-{(n + i) % args.charts}.png?article={n}">'
+                               if i % 2 else f'<img src="/files/chart-{(n + i) % args.charts}.png">'
+                               for i in range(args.images))
+                self._send(f"<html><body><article><h1>Spotlight {n}</h1>{imgs}</article></body></html>"
+                           .encode("utf-8"), "text/html; charset=utf-8")
+            elif path.startswith("/files/chart-"):
+                data = charts[int(path[len("/files/chart-"):-len(".png")])]
+                etag = f'"{hashlib.md5(data).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self._send(data, "image/png", etag)
+            else:
+                self.send_error(404)
+
+        def _send(self, data, content_type, etag=None):
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class SpotlightSpider(scrapy.Spider):
+    name = "bench_images"
+
+    def __init__(self, base=None, articles=0, **kw):
+        super().__init__(**kw)
+        self.start_urls = [f"{base}/data-spotlight/{n}" for n in range(int(articles))]
+
+    def parse(self, response):
+        yield {"url": response.url,
+               "image_urls": [response.urljoin(src) for src in response.css("img::attr(src)").getall()],
+               "images": []}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the content-addressed image pipeline")
+    ap.add_argument("--articles", type=int, default=30, help="Articles to crawl")
+    ap.add_argument("--images", type=int, default=4, help="Images per article")
+    ap.add_argument("--charts", type=int, default=12, help="Distinct chart images")
+    args = ap.parse_args()
+
+    charts = [chart_png(n) for n in range(args.charts)]
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args, charts))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    tmp = tempfile.TemporaryDirectory()
+    store_dir = Path(tmp.name) / "images"
+    results = {"articles": args.articles, "images_per_article": args.images, "distinct_charts": args.charts,
+               "chart_bytes": sum(len(c) for c in charts)}
+    runs = (("first", {}), ("repeat", {}), ("revalidate", {"IMAGES_EXPIRES": 0}))
+
+    @defer.inlineCallbacks
+    def run_all():
+        try:
+            for label, extra in runs:
+                settings = {
+                    "LOG_LEVEL": "ERROR",
+                    "ROBOTSTXT_OBEY": False,
+                    "TELNETCONSOLE_ENABLED": False,
+                    "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
+                    "ITEM_PIPELINES": {ImageStorePipeline: 1},
+                    "IMAGES_STORE": str(store_dir),
+                    "IMAGES_THUMBS": {"small": (320, 320)},
+                    **extra,
+                }
+                runner = CrawlerRunner(settings)
+                crawler = runner.create_crawler(SpotlightSpider)
+                yield runner.crawl(crawler, base=base, articles=args.articles)
+                stats = crawler.stats.get_stats()
+                results[label] = {
+                    # Article pages are the first --articles requests
+                    "image_requests": stats.get("downloader/request_count", 0) - args.articles,
+                    "bytes_received": stats.get("downloader/response_bytes", 0),
+                    "statuses": {k.split("/", 1)[1]: v for k, v in stats.items()
+                                 if k.startswith("images/") and k != "images/stored_bytes"},
+                    "stored_bytes": stats.get("images/stored_bytes", 0),
+                }
+        finally:
+            reactor.stop()
+
+    reactor.callWhenRunning(run_all)
+    reactor.run()
+    server.shutdown()
+
+    store = ImageStore(store_dir)
+    results["store"] = store.summary()
+    store.close()
+    results["thumbnails"] = len(list(store_dir.glob("thumbs/*/*/*.jpg")))
+    tmp.cleanup()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
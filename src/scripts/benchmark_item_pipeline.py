@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Benchmark SupabasePipeline (buffered background batches) against a
+per-item upsert, both into the local SQLite stand-in backend with a
+simulated database round-trip (--rtt) per upsert call.
+
+Reports how long the crawl is blocked in ``process_item``, the total time
+until ``close_spider`` returns, and checks that both store the same rows.
+
+Usage:
+    python src/scripts/benchmark_item_pipeline.py
+    python src/scripts/benchmark_item_pipeline.py --items 2000 --rtt 0.05 --batch-size 200
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import sqlite3
+import tempfile
+import time
+from collections import defaultdict
+
+from src.database.supabase_load import TABLE, build_row
+from src.detect import detect_fraud_for_record
+from src.pipelines import SQLiteBackend, SupabasePipeline
+
+
+class SlowBackend(SQLiteBackend):
+    """SQLite stand-in with a fixed network round-trip per upsert call."""
+
+    def __init__(self, path, rtt):
+        super().__init__(path)
+        self.rtt = rtt
+        self.calls = 0
+
+    def upsert(self, rows):
+        time.sleep(self.rtt)
+        self.calls += 1
+        super().upsert(rows)
+
+
+class Stats:
+    def __init__(self):
+        self.values = defaultdict(int)
+
+    def inc_value(self, key, count=1):
+        self.values[key] += count
+
+
+class Spider:
+    name = "press_releases"
+
+
+def make_items(n):
+    for i in range(n):
+        # Every fourth item repeats an earlier URL (re-crawled page)
+        url = f"https://www.ftc.gov/news-events/news/press-releases/{i if i % 4 else i // 2}"
+        topic = "scam telemarketing fraud refunds" if i % 3 else "merger review"
+        yield {"title": f"FTC Action {i}: {topic}", "url": url, "published_date": "2025-01-02",
+               "full_text": f"The operators ran a {topic} scheme. " * 20, "summary": None}
+
+
+def per_item(items, backend):
+    """What a naive pipeline does: score and upsert each item as it arrives."""
+    meta = {"source": "ftc_press", "feed": "press"}
+    blocked = 0.0
+    for item in items:
+        start = time.perf_counter()
+        rec = {"title": item["title"], "url": item["url"], "published": item["published_date"],
+               "body": item["full_text"], "summary": item["summary"]}
+        scored = detect_fraud_for_record(rec, min_hits=2)
+        row = build_row(rec, meta, bool(scored["is_fraud"]), int(scored["fraud_hits"]),
+                        float(scored["fraud_score"]))
+        if row["is_fraud"]:
+            backend.upsert([row])
+        blocked += time.perf_counter() - start
+    backend.close()
+    return blocked
+
+
+def buffered(items, backend, batch_size, stats):
+    pipe = SupabasePipeline(backend, batch_size=batch_size, flush_interval=1.0, stats=stats)
+    pipe.open_spider(Spider())
+    blocked = 0.0
+    for item in items:
+        start = time.perf_counter()
+        pipe.process_item(item, Spider())
+        blocked += time.perf_counter() - start
+    start = time.perf_counter()
+    pipe.close_spider(Spider())
+    return blocked, time.perf_counter() - start
+
+
+def stored(path):
+    conn = sqlite3.connect(path)
+    try:
+        return sorted(conn.execute(f"SELECT * FROM {TABLE}").fetchall())
+    finally:
+        conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark buffered vs per-item storage pipelines")
+    ap.add_argument("--items", type=int, default=1000, help="Items to store")
+    ap.add_argument("--rtt", type=float, default=0.02, help="Simulated database round-trip (seconds)")
+    ap.add_argument("--batch-size", type=int, default=100, help="SupabasePipeline batch size")
+    args = ap.parse_args()
+
+    items = list(make_items(args.items))
+    report = {"items": args.items, "rtt": args.rtt, "batch_size": args.batch_size}
+    with tempfile.TemporaryDirectory() as tmp:
+        slow = SlowBackend(Path(tmp) / "per_item.sqlite", args.rtt)
+        start = time.perf_counter()
+        blocked = per_item(items, slow)
+        report["per_item"] = {"blocked_seconds": round(blocked, 3),
+                              "total_seconds": round(time.perf_counter() - start, 3),
+                              "upsert_calls": slow.calls}
+
+        fast = SlowBackend(Path(tmp) / "buffered.sqlite", args.rtt)
+        stats = Stats()
+        start = time.perf_counter()
+        blocked, closing = buffered(items, fast, args.batch_size, stats)
+        report["buffered"] = {"blocked_seconds": round(blocked, 3),
+                              "close_seconds": round(closing, 3),
+                              "total_seconds": round(time.perf_counter() - start, 3),
+                              "upsert_calls": fast.calls,
+                              "stats": dict(stats.values)}
+
+        report["same_rows"] = stored(slow.path) == stored(fast.path)
+        report["rows"] = len(stored(fast.path))
+    report["blocked_speedup"] = round(report["per_item"]["blocked_seconds"]
+                                      / max(report["buffered"]["blocked_seconds"], 1e-9), 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark the press release scraper against a local stand-in FTC server.
+
+Serves synthetic listing and article pages (with a configurable response
+delay) from a local HTTP server, runs the sequential and the asyncio
+scraper (and with --pipeline the staged fetch/parse pipeline) against it,
+checks that they produce the same records in the same order, and prints
+the timings as JSON.
+
+Usage:
+    python src/scripts/benchmark_press_fetch.py
+    python src/scripts/benchmark_press_fetch.py --limit 40 --latency 0.2 --concurrency 16 --rate 20
+    python src/scripts/benchmark_press_fetch.py --pipeline --parse-workers 2 --rate 20
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.scrapers import ftc_press_releases as press
+from src.utils import session
+
+PER_PAGE = 20
+SCORE_FIELDS = ("is_fraud", "fraud_hits", "fraud_score")
+
+
+def listing_html(page):
+    items = []
+    for i in range(PER_PAGE):
+        n = page * PER_PAGE + i
+        # Two out of three titles pass the fraud title filter
+        topic = "Scam" if n % 3 else "Merger"
+        items.append(f'<article><h3><a href="/press-releases/{n}">FTC Action {n}: {topic} '
+                     f'Operators Settle Charges</a></h3></article>')
+    return f"<html><body>{''.join(items)}</body></html>"
+
+
+def article_html(n):
+    paras = "".join(f"<p>Paragraph {j} of press release {n}, describing the fraud scheme "
+                    f"and the settlement terms in detail.</p>" for j in range(8))
+    return (f'<html><body><article class="node--press-release">'
+            f'<time datetime="2025-01-{n % 28 + 1:02d}T12:00:00Z"></time>{paras}'
+            f'</article></body></html>')
+
+
+def make_handler(latency, pages):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/press-releases":
+                page = int(parse_qs(parts.query).get("page", ["0"])[0])
+                body = listing_html(page) if page < pages else "<html><body></body></html>"
+            elif parts.path.startswith("/press-releases/"):
+                time.sleep(latency)
+                body = article_html(int(parts.path.rsplit("/", 1)[1]))
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark sync vs async press release scraping")
+    ap.add_argument("--limit", type=int, default=20)
+    ap.add_argument("--pages", type=int, default=3)
+    ap.add_argument("--latency", type=float, default=0.1, help="Article response delay (s)")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--rate", type=float, default=press.DEFAULT_RATE,
+                    help="Per-host requests/second for the async run")
+    ap.add_argument("--skip-sync", action="store_true", help="Only time the async scraper")
+    ap.add_argument("--pipeline", action="store_true",
+                    help="Also time the staged fetch/parse/write pipeline")
+    ap.add_argument("--parse-workers", type=int, default=None,
+                    help="Parser processes for --pipeline (default: CPU count)")
+    args = ap.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency, args.pages))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/press-releases"
+
+    results = {"limit": args.limit, "pages": args.pages, "latency": args.latency,
+               "concurrency": args.concurrency, "rate": args.rate}
+    try:
+        sync_rows = None
+        if not args.skip_sync:
+            start = time.perf_counter()
+            # No response cache: every run must hit the server
+            sync_rows = press.scrape(base, args.limit, args.pages, sess=session(cache=False))
+            results["sync_seconds"] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        async_rows = asyncio.run(press.scrape_async(base, args.limit, args.pages,
+                                                    concurrency=args.concurrency, rate=args.rate,
+                                                    sess=session(cache=False,
+                                                                 pool_connections=args.concurrency,
+                                                                 pool_maxsize=args.concurrency)))
+        results["async_seconds"] = round(time.perf_counter() - start, 3)
+        results["records"] = len(async_rows)
+        if sync_rows is not None:
+            results["same_output"] = sync_rows == async_rows
+            results["speedup"] = round(results["sync_seconds"] / results["async_seconds"], 2)
+
+        if args.pipeline:
+            start = time.perf_counter()
+            pipe_rows = press.scrape_pipeline(base, args.limit, args.pages,
+                                              sess=session(cache=False,
+                                                           pool_connections=args.concurrency,
+                                                           pool_maxsize=args.concurrency),
+                                              fetch_workers=args.concurrency,
+                                              parse_workers=args.parse_workers, rate=args.rate)
+            results["pipeline_seconds"] = round(time.perf_counter() - start, 3)
+            # Pipeline records also carry fraud scores; compare the scraped fields.
+            scraped = [{k: v for k, v in r.items() if k not in SCORE_FIELDS} for r in pipe_rows]
+            results["pipeline_same_output"] = scraped == async_rows
+    finally:
+        server.shutdown()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
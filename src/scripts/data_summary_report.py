@@ -2,12 +2,16 @@
 Comprehensive Data Summary Report Generator
 Creates a detailed analysis of all fraud data sources
 """
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import json
-from pathlib import Path
 from collections import Counter
 import re
 from datetime import datetime
+from src.detect.taxonomy import FRAUD_TAXONOMY
 
 
 class FraudDataAnalyzer:
@@ -31,12 +35,20 @@ class FraudDataAnalyzer:
                         source_articles.append(article)
                         self.all_articles.append(article)
             
+            self.tag_categories(source_articles)
             source_name = jsonl_file.stem
             self.source_data[source_name] = source_articles
             print(f"  Loaded {len(source_articles)} articles from {source_name}")
         
         print(f"\nTotal articles loaded: {len(self.all_articles)}\n")
     
+    def tag_categories(self, articles):
+        """Store each article's fraud category bitmask (one taxonomy scan per article)"""
+        texts = [f"{a.get('title', '')} {a.get('body', '')}" for a in articles]
+        masks = FRAUD_TAXONOMY.scan_many(texts).categories
+        for article, mask in zip(articles, masks):
+            article['fraud_categories'] = int(mask)
+    
     def extract_keywords(self, texts, top_n=5):
         """Extract top keywords from texts"""
         # Combine all texts
@@ -68,30 +80,11 @@ class FraudDataAnalyzer:
             if subject and subject != 'Unknown':
                 fraud_types.append(subject.lower())
             
-            # Extract fraud types from title and body
-            text = f"{article.get('title', '')} {article.get('body', '')}".lower()
-            
-            # Common fraud patterns
-            patterns = {
-                'robocall': ['robocall', 'robo call', 'automated call'],
-                'telemarketing': ['telemarket', 'unsolicited call'],
-                'debt collection': ['debt', 'collection', 'collector'],
-                'impersonation': ['impersonat', 'pretend', 'posing as', 'claimed to be'],
-                'phishing': ['phishing', 'phish', 'fake email', 'suspicious link'],
-                'identity theft': ['identity theft', 'stolen identity', 'ssn', 'social security'],
-                'investment scam': ['investment', 'crypto', 'bitcoin', 'ponzi', 'pyramid'],
-                'tech support': ['tech support', 'computer', 'virus', 'malware'],
-                'irs/tax scam': ['irs', 'tax', 'revenue service'],
-                'medicare/health': ['medicare', 'health insurance', 'medical'],
-                'warranty scam': ['warranty', 'extended warranty', 'car warranty'],
-                'prize/lottery': ['prize', 'lottery', 'winner', 'sweepstakes'],
-                'romance scam': ['romance', 'dating', 'relationship'],
-                'utility scam': ['utility', 'electric', 'power company']
-            }
-            
-            for fraud_type, keywords in patterns.items():
-                if any(keyword in text for keyword in keywords):
-                    fraud_types.append(fraud_type)
+            # Fraud types from the precomputed taxonomy bitmask
+            mask = article.get('fraud_categories')
+            if mask is None:
+                _, mask = FRAUD_TAXONOMY.scan(f"{article.get('title', '')} {article.get('body', '')}")
+            fraud_types.extend(FRAUD_TAXONOMY.category_labels(mask, 'trend'))
         
         counter = Counter(fraud_types)
         return counter.most_common(top_n)
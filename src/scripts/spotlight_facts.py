@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Index and query typed statistics from data spotlight articles.
+
+``index`` extracts facts (see src/detect/facts.py) from a JSONL file of
+articles in a worker pool and stores them in the fact index. ``query``
+filters the indexed articles without reparsing them.
+
+Usage:
+    python src/scripts/spotlight_facts.py index data/ftc_data_spotlight.jsonl --workers 4
+    python src/scripts/spotlight_facts.py query "losses > $1 billion"
+    python src/scripts/spotlight_facts.py query "reports >= 1 million" --json
+"""
+import sys
+from pathlib import Path
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+import json
+import time
+
+from src.detect.facts import DEFAULT_FACTS_PATH, FactIndex, extract_facts_many
+from src.detect.parallel import iter_jsonl
+from src.utils.extract import parse_html, text_of
+
+
+def article_text(rec):
+    """Title plus body text; RSS summaries are HTML."""
+    body = rec.get("full_text") or rec.get("body") or ""
+    if not body and rec.get("summary"):
+        root = parse_html(rec["summary"])
+        body = text_of(root) if root is not None else ""
+    return ". ".join(part for part in (rec.get("title") or "", body) if part)
+
+
+def article_url(rec):
+    return rec.get("url") or rec.get("link")
+
+
+def run_index(args):
+    records = [rec for rec in iter_jsonl(args.input) if article_url(rec)]
+    start = time.perf_counter()
+    index = FactIndex(args.index)
+    try:
+        facts = extract_facts_many((article_text(rec) for rec in records), workers=args.workers)
+        index.add_many((article_url(rec), found) for rec, found in zip(records, facts))
+        summary = index.summary()
+    finally:
+        index.close()
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    print(json.dumps(summary, indent=2))
+
+
+def run_query(args):
+    index = FactIndex(args.index)
+    try:
+        matches = index.search(args.query)
+    except ValueError as e:
+        sys.exit(f"Bad query: {e}")
+    finally:
+        index.close()
+    if args.json:
+        print(json.dumps({url: [f._asdict() for f in facts] for url, facts in matches.items()}, indent=2))
+        return
+    print(f"{len(matches)} articles match {args.query!r}")
+    for url, facts in matches.items():
+        print(url)
+        for fact in facts:
+            print(f"  {fact.raw}: {fact.sentence}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Index and query data spotlight statistics")
+    ap.add_argument("--index", default=str(DEFAULT_FACTS_PATH), help="Fact index (SQLite) path")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("index", help="Extract facts from a JSONL file of articles")
+    p.add_argument("input", help="JSONL with url/link, title and full_text/body/summary")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p.set_defaults(func=run_index)
+
+    p = sub.add_parser("query", help='Filter articles, e.g. "losses > $1 billion"')
+    p.add_argument("query")
+    p.add_argument("--json", action="store_true", help="Print matching facts as JSON")
+    p.set_defaults(func=run_query)
+
+    args = ap.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,27 @@ USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36
 
 ROBOTSTXT_OBEY = True
 
-CONCURRENT_REQUESTS = 8
+# Global cap; must allow ADAPTIVE_MAX_CONCURRENCY
+CONCURRENT_REQUESTS = 16
 
+# Starting points for AdaptiveConcurrencyMiddleware, which tunes them per domain
 DOWNLOAD_DELAY = 1
 
 CONCURRENT_REQUESTS_PER_DOMAIN = 8
 
+# AIMD bounds and thresholds (see middlewares.py)
+ADAPTIVE_CONCURRENCY_ENABLED = True
+ADAPTIVE_MIN_CONCURRENCY = 1
+ADAPTIVE_MAX_CONCURRENCY = 16
+ADAPTIVE_MIN_DELAY = 0.1
+ADAPTIVE_MAX_DELAY = 30
+ADAPTIVE_DELAY_STEP = 0.25
+ADAPTIVE_TARGET_LATENCY = 2.0
+ADAPTIVE_MAX_ERROR_RATE = 0.1
+ADAPTIVE_WINDOW = 10
+ADAPTIVE_DECREASE_FACTOR = 0.5
+ADAPTIVE_COOLDOWN = 5.0
+
 COOKIES_ENABLED = True
 
 # Disable Telnet Console (enabled by default)
@@ -30,15 +45,24 @@ DEFAULT_REQUEST_HEADERS = {
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
-#    "ftc_scraper.middlewares.FtcScraperSpiderMiddleware": 543,
-#}
+# DeltaFetchMiddleware skips article pages stored on an earlier crawl
+SPIDER_MIDDLEWARES = {
+    "middlewares.DeltaFetchMiddleware": 100,
+}
+
+# Reset or bypass the stored pages with -s DELTAFETCH_RESET=1 / DELTAFETCH_FORCE=1
+# (or -a deltafetch_reset=1 / -a deltafetch_force=1)
+DELTAFETCH_ENABLED = True
+DELTAFETCH_RESET = False
+DELTAFETCH_FORCE = False
+DELTAFETCH_BATCH_SIZE = 100
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
-#    "ftc_scraper.middlewares.FtcScraperDownloaderMiddleware": 543,
-#}
+# AdaptiveConcurrencyMiddleware sits after RetryMiddleware (550) so it sees every attempt
+DOWNLOADER_MIDDLEWARES = {
+    "middlewares.AdaptiveConcurrencyMiddleware": 560,
+}
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -53,6 +77,16 @@ ITEM_PIPELINES = {
     "pipelines.SupabasePipeline": 300,
 }
 
+# SupabasePipeline buffering (see pipelines.py); "sqlite" stores to a local stand-in table
+SUPABASE_BACKEND = "supabase"
+SUPABASE_BATCH_SIZE = 100
+SUPABASE_FLUSH_INTERVAL = 5.0
+SUPABASE_MAX_PENDING = 8
+SUPABASE_RETRIES = 3
+
+# FactIndexPipeline (data spotlight statistics, see src/detect/facts.py)
+FACTS_INDEX_PATH = "data/cache/spotlight_facts.sqlite"
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 #AUTOTHROTTLE_ENABLED = True
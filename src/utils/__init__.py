@@ -1,6 +1,7 @@
 """Utility modules for FTC scrapers."""
 
-from .http import session, save_jsonl
+from .http import session, shared_session
+from .jsonl import JsonlStore, save_jsonl, append_jsonl
 from .keywords import is_fraud, find_hits, FRAUD_TERMS
 
-__all__ = ["session", "save_jsonl", "is_fraud", "find_hits", "FRAUD_TERMS"]
+__all__ = ["session", "shared_session", "JsonlStore", "save_jsonl", "append_jsonl", "is_fraud", "find_hits", "FRAUD_TERMS"]
@@ -0,0 +1,158 @@
+"""
+Persistent crawl state shared by the scrapers.
+
+Records every article URL a scraper has collected, with a hash of the
+extracted content and the fetch time, in data/cache/crawl_state.sqlite.
+Scrapers skip URLs they have already seen and stop paginating once a
+listing page holds nothing new, so daily runs only fetch new releases.
+``full=True`` (the scrapers' ``--full`` flag) ignores what is known but
+still records what is fetched. One connection is kept per instance (shared
+across threads behind a lock); call ``close`` when done.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Set, Tuple
+
+DEFAULT_STATE_PATH = Path(__file__).parent.parent.parent / "data" / "cache" / "crawl_state.sqlite"
+
+_SQL_BATCH = 900
+
+# Scrapy signals from a pipeline that persists items, so pages are only
+# recorded once their items are safe: ``store_opened`` when the spider
+# opens, then ``items_stored`` (``urls``: item URLs) after each stored batch.
+store_opened = object()
+items_stored = object()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CrawlState:
+    """Seen URLs for one scraper, backed by SQLite."""
+
+    def __init__(self, scraper: str, path=DEFAULT_STATE_PATH, full: bool = False):
+        self.scraper = scraper
+        self.full = full
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.skipped = 0
+        self.recorded = 0
+        self.changed = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS crawled (
+                    scraper TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (scraper, url)
+                ) WITHOUT ROWID
+                """
+            )
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock, self._conn:
+            yield self._conn
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def known(self, urls: Iterable[str]) -> Set[str]:
+        """The subset of ``urls`` collected before (empty in full mode)."""
+        if self.full:
+            return set()
+        urls = list(dict.fromkeys(urls))
+        found = set()
+        with self._transaction() as conn:
+            for i in range(0, len(urls), _SQL_BATCH):
+                batch = urls[i:i + _SQL_BATCH]
+                marks = ",".join("?" * len(batch))
+                found.update(url for (url,) in conn.execute(
+                    f"SELECT url FROM crawled WHERE scraper = ? AND url IN ({marks})",
+                    [self.scraper, *batch],
+                ))
+        return found
+
+    def urls(self) -> Set[str]:
+        """Every URL collected before (empty in full mode)."""
+        if self.full:
+            return set()
+        with self._transaction() as conn:
+            return {url for (url,) in conn.execute(
+                "SELECT url FROM crawled WHERE scraper = ?", (self.scraper,))}
+
+    def reset(self) -> int:
+        """Forget everything this scraper collected; returns how many URLs were dropped."""
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM crawled WHERE scraper = ?", (self.scraper,)).rowcount
+
+    def seen(self, url: str) -> bool:
+        return bool(self.known([url]))
+
+    def new_only(self, items, url=lambda item: item[0]):
+        """Drop items whose URL is known, counting them in ``skipped``."""
+        items = list(items)
+        known = self.known(url(it) for it in items)
+        self.skipped += sum(1 for it in items if url(it) in known)
+        return [it for it in items if url(it) not in known]
+
+    def record(self, url: str, content: str = "") -> bool:
+        """Remember ``url`` as collected; True if its content is new or changed."""
+        digest = content_hash(content)
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT content_hash FROM crawled WHERE scraper = ? AND url = ?",
+                (self.scraper, url),
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO crawled (scraper, url, content_hash, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.scraper, url, digest, time.time()),
+            )
+        self.recorded += 1
+        is_new = row is None or row[0] != digest
+        self.changed += is_new
+        return is_new
+
+    def record_many(self, pages: Iterable[Tuple[str, str]]) -> int:
+        """
+        ``record`` for many (url, content) pairs in one transaction; returns
+        how many had new or changed content. Call it only once the pages
+        are saved, so a failed run never marks unsaved URLs as collected.
+        """
+        pages = list(pages)
+        if not pages:
+            return 0
+        now = time.time()
+        changed = 0
+        with self._transaction() as conn:
+            for url, content in pages:
+                digest = content_hash(content)
+                row = conn.execute(
+                    "SELECT content_hash FROM crawled WHERE scraper = ? AND url = ?",
+                    (self.scraper, url),
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO crawled (scraper, url, content_hash, fetched_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.scraper, url, digest, now),
+                )
+                changed += row is None or row[0] != digest
+        self.recorded += len(pages)
+        self.changed += changed
+        return changed
+
+    def summary(self) -> str:
+        mode = "full re-crawl" if self.full else "incremental"
+        return (f"Crawl state ({mode}): {self.recorded} fetched, "
+                f"{self.skipped} already-seen URLs skipped")
@@ -0,0 +1,156 @@
+"""
+Shared article extraction for the scrapers, built on lxml.
+
+Every scraper used to parse whole pages with BeautifulSoup's pure-Python
+``html.parser`` and then repeat its own selector fallbacks. Here pages are
+parsed once with lxml's C parser (comments and processing instructions
+dropped, no network access) and only the content region chosen by a
+``Profile`` is walked for paragraphs.
+
+Selectors are XPath, so no extra CSS-selector package is needed.
+"""
+from typing import List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin
+
+from lxml import etree, html as lhtml
+
+_PARSER = lhtml.HTMLParser(encoding="utf-8", remove_comments=True, remove_pis=True,
+                           no_network=True, recover=True)
+
+
+def has_class(name: str) -> str:
+    """XPath predicate for elements carrying CSS class ``name``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class Profile(NamedTuple):
+    """Where a site keeps its title, date and body."""
+    content: Tuple[str, ...]                         # body regions, first match wins
+    title: Tuple[str, ...] = ("//h1",)
+    date: Tuple[str, ...] = ("//time[@datetime]", f"//*[{has_class('date')}]")
+    lead: Tuple[str, ...] = ()                       # region read before ``content`` (e.g. a case overview)
+    min_len: int = 0                                 # keep paragraphs longer than this
+    dedupe: bool = False                             # drop body paragraphs already collected
+    joiner: str = "\n\n"
+    date_sep: str = ""                               # separator for a date element's text
+    default_title: str = ""
+
+
+PROFILES = {
+    # ftc.gov press releases
+    "press": Profile(
+        content=(f"//article[{has_class('node--press-release')}]", f"//*[{has_class('region-content')}]",
+                 "//main", "//body"),
+        min_len=20,
+    ),
+    # ftc.gov legal library case pages
+    "legal": Profile(
+        content=("//article", f"//*[{has_class('region-content')}]", "//main"),
+        title=("//h1", f"//*[{has_class('page-title')}]"),
+        lead=(f"//*[{has_class('case-overview')}]", f"//*[{has_class('field--name-field-case-overview')}]"),
+        min_len=20,
+        dedupe=True,
+        default_title="No title",
+    ),
+    # consumer.ftc.gov scam articles
+    "scams": Profile(
+        content=("//main", "//article", "//body"),
+        date=("//time[@datetime]", "//time"),
+        joiner="\n",
+        date_sep=" ",
+    ),
+    # generic ftc.gov node body (RSS items, legal library search results)
+    "body": Profile(
+        content=(f"//*[{has_class('field--name-body')}]", "//article", "//body"),
+        date=("//time[@datetime]", "//time"),
+        joiner="\n",
+        date_sep=" ",
+    ),
+}
+
+
+class Article(NamedTuple):
+    title: str
+    published: str
+    body: str
+
+
+def parse_html(page) -> Optional[etree._Element]:
+    """Parse a page (str or bytes) into an lxml tree; None if it is empty."""
+    if isinstance(page, str):
+        page = page.encode("utf-8")
+    if not page or not page.strip():
+        return None
+    return lhtml.fromstring(page, parser=_PARSER)
+
+
+def text_of(el, sep: str = " ") -> str:
+    """Element text like BeautifulSoup's ``get_text(sep, strip=True)``."""
+    return sep.join(s.strip() for s in el.itertext() if s.strip())
+
+
+def _first(root, paths):
+    for path in paths:
+        found = root.xpath(path)
+        if found:
+            return found[0]
+    return None
+
+
+def _paragraphs(region, min_len: int) -> List[str]:
+    out = []
+    for p in region.iter("p"):
+        text = text_of(p)
+        if text and len(text) > min_len:
+            out.append(text)
+    return out
+
+
+def extract_article(page, profile="press") -> Article:
+    """Title, publication date and body text of an article page."""
+    if isinstance(profile, str):
+        profile = PROFILES[profile]
+    root = parse_html(page)
+    if root is None:
+        return Article(profile.default_title, "", "")
+
+    el = _first(root, profile.title)
+    title = text_of(el, "") if el is not None else profile.default_title
+
+    published = ""
+    el = _first(root, profile.date)
+    if el is not None:
+        published = el.get("datetime") or text_of(el, profile.date_sep)
+
+    paras: List[str] = []
+    if profile.lead:
+        lead = _first(root, profile.lead)
+        if lead is not None:
+            paras.extend(_paragraphs(lead, profile.min_len))
+    region = _first(root, profile.content)
+    if region is not None:
+        if profile.dedupe:
+            seen = set(paras)
+            for p in _paragraphs(region, profile.min_len):
+                if p not in seen:
+                    seen.add(p)
+                    paras.append(p)
+        else:
+            paras.extend(_paragraphs(region, profile.min_len))
+    return Article(title, published, profile.joiner.join(paras))
+
+
+def extract_links(page, paths: Tuple[str, ...], base_url: str = "",
+                  sep: str = "") -> List[Tuple[str, str]]:
+    """``(absolute url, link text)`` for the links matched by ``paths``, in page order."""
+    root = parse_html(page)
+    if root is None:
+        return []
+    xpath = " | ".join(paths)
+    links = []
+    for a in root.xpath(xpath):
+        href = a.get("href")
+        if not href or href.startswith("#"):
+            continue
+        links.append((urljoin(base_url, href), text_of(a, sep)))
+    return links
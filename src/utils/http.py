@@ -1,19 +1,261 @@
-import os, json, requests
+import os, random, threading, time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .http_cache import ResponseCache
 
 UA = {"User-Agent": "USAA-Fraud-News/1.0 (+student project)"}
 
-def session(timeout=15):
-    s = requests.Session()
-    s.headers.update(UA)
-    _orig = s.request
-    def _request(method, url, **kw):
-        kw.setdefault("timeout", timeout)
-        return _orig(method, url, **kw)
-    s.request = _request
-    return s
-
-def save_jsonl(path, rows):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+_shared = None
+_shared_lock = threading.Lock()
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without sending a request while a host's circuit is open."""
+
+
+class FetchStats:
+    """Thread-safe request counters, reported by scrapers at the end of a run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.cache_hits = 0
+        self.not_modified = 0
+        self.statuses = defaultdict(int)
+        self.hosts = defaultdict(lambda: {"requests": 0, "bytes": 0, "seconds": 0.0})
+
+    def record(self, host, status, nbytes, seconds):
+        with self._lock:
+            self.requests += 1
+            self.bytes += nbytes
+            self.seconds += seconds
+            self.statuses[status] += 1
+            h = self.hosts[host]
+            h["requests"] += 1
+            h["bytes"] += nbytes
+            h["seconds"] += seconds
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_cache_hit(self, revalidated=False):
+        with self._lock:
+            if revalidated:
+                self.not_modified += 1
+            else:
+                self.cache_hits += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "errors": self.errors,
+                "bytes": self.bytes,
+                "seconds": round(self.seconds, 3),
+                "cache_hits": self.cache_hits,
+                "not_modified": self.not_modified,
+                "statuses": dict(self.statuses),
+                "hosts": {h: dict(v) for h, v in self.hosts.items()},
+            }
+
+    def summary(self):
+        with self._lock:
+            avg = self.seconds / self.requests if self.requests else 0.0
+            return (f"HTTP: {self.requests} requests, {self.retries} retries, "
+                    f"{self.errors} errors, {self.bytes / 1024:,.0f} KB, "
+                    f"{avg * 1000:.0f} ms avg, {self.cache_hits} served from cache, "
+                    f"{self.not_modified} not modified")
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: after ``threshold`` consecutive failures the host is
+    skipped for ``cooldown`` seconds, then one trial request is let through.
+    """
+
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = defaultdict(int)
+        self._opened = {}
+
+    def allow(self, host):
+        with self._lock:
+            opened = self._opened.get(host)
+            if opened is None:
+                return True
+            if time.monotonic() - opened >= self.cooldown:
+                # Half-open: let one request probe the host.
+                self._opened[host] = time.monotonic()
+                return True
+            return False
+
+    def success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened.pop(host, None)
+
+    def failure(self, host):
+        with self._lock:
+            self._failures[host] += 1
+            if self.threshold and self._failures[host] >= self.threshold:
+                self._opened[host] = time.monotonic()
+
+
+def retry_after_seconds(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Session(requests.Session):
+    """
+    requests.Session with a default timeout, sized connection pools,
+    retries with exponential backoff and jitter (honouring Retry-After),
+    a per-host circuit breaker and request counters in ``.stats``.
+    With a ``ResponseCache``, GETs are served from disk while fresh and
+    revalidated with conditional requests afterwards (always, with
+    ``revalidate=True``).
+    Safe to share between worker threads for GET requests.
+    """
+
+    def __init__(self, timeout=15, retries=3, backoff=0.5, max_backoff=30.0,
+                 max_retry_after=60.0, pool_connections=10, pool_maxsize=10,
+                 breaker_threshold=5, breaker_cooldown=30.0, cache=None, revalidate=False):
+        super().__init__()
+        self.cache = cache
+        self.revalidate = revalidate
+        self.headers.update(UA)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self.stats = FetchStats()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def _delay(self, attempt, response=None):
+        """Backoff before retry ``attempt`` (1-based); None means give up."""
+        if response is not None:
+            wait = retry_after_seconds(response.headers.get("Retry-After"))
+            if wait is not None:
+                return wait if wait <= self.max_retry_after else None
+        cap = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)  # full jitter
+
+    def request(self, method, url, **kw):
+        if (self.cache is None or method.upper() != "GET"
+                or kw.get("stream") or kw.get("params")):
+            return self._send(method, url, **kw)
+
+        entry = self.cache.get(url)
+        if entry is not None:
+            if not self.revalidate and self.cache.is_fresh(entry):
+                self.stats.record_cache_hit()
+                return entry.response()
+            kw["headers"] = {**entry.validators(), **(kw.get("headers") or {})}
+        r = self._send(method, url, **kw)
+        if entry is not None and r.status_code == 304:
+            self.cache.touch(url, r)
+            self.stats.record_cache_hit(revalidated=True)
+            return entry.response(r.request)
+        self.cache.put(url, r)
+        return r
+
+    def _send(self, method, url, **kw):
+        kw.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        retries = self.retries if method.upper() in RETRY_METHODS else 0
+        attempt = 0
+        while True:
+            if not self.breaker.allow(host):
+                self.stats.record_error()
+                raise CircuitOpenError(f"Circuit open for {host}")
+            start = time.perf_counter()
+            try:
+                r = super().request(method, url, **kw)
+            except (requests.ConnectionError, requests.Timeout):
+                self.stats.record_error()
+                self.breaker.failure(host)
+                attempt += 1
+                delay = self._delay(attempt) if attempt <= retries else None
+                if delay is None:
+                    raise
+                self.stats.record_retry()
+                time.sleep(delay)
+                continue
+
+            nbytes = len(r.content) if not kw.get("stream") else int(r.headers.get("Content-Length") or 0)
+            self.stats.record(host, r.status_code, nbytes, time.perf_counter() - start)
+            if r.status_code not in RETRY_STATUSES:
+                self.breaker.success(host)
+                return r
+            self.breaker.failure(host)
+            attempt += 1
+            delay = self._delay(attempt, r) if attempt <= retries else None
+            if delay is None:
+                return r
+            self.stats.record_retry()
+            r.close()
+            time.sleep(delay)
+
+
+def session(timeout=15, cache=True, **kw):
+    """
+    New client; see ``Session`` for the retry, pool and breaker options.
+    ``cache=True`` uses the shared on-disk cache in data/cache/http.sqlite
+    (disable with ``cache=False`` or FTC_HTTP_CACHE=0); a ``ResponseCache``
+    instance can be passed instead.
+    """
+    if cache is True:
+        cache = default_cache() if os.getenv("FTC_HTTP_CACHE", "1") != "0" else None
+    return Session(timeout=timeout, cache=cache or None, **kw)
+
+
+_default_cache = None
+
+def default_cache():
+    global _default_cache
+    with _shared_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
+
+
+def shared_session():
+    """Process-wide client for code that fans out across worker threads."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = session()
+        return _shared
+
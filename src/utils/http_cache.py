@@ -0,0 +1,164 @@
+"""
+On-disk HTTP response cache with conditional revalidation.
+
+Successful GET responses are stored in SQLite with their ETag and
+Last-Modified validators. A cached page younger than its TTL is served
+straight from disk; an older one is revalidated with If-None-Match /
+If-Modified-Since, and a 304 answer is served from disk as well. TTLs are
+chosen per URL pattern: listing pages change often, articles rarely.
+"""
+import json
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_HTTP_CACHE_PATH = Path(__file__).parent.parent.parent / "data" / "cache" / "http.sqlite"
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# First matching pattern wins; searched against the full URL.
+DEFAULT_TTLS: Sequence[Tuple[str, float]] = (
+    (r"[?&]page=\d+", 15 * MINUTE),                           # paginated listings
+    (r"/news-events/news/press-releases/?$", 15 * MINUTE),    # listing first pages
+    (r"/legal-library/browse/cases-proceedings/?$", 15 * MINUTE),
+    (r"/legal-library/search", 15 * MINUTE),
+    (r"consumer\.ftc\.gov/scams/?$", 15 * MINUTE),
+    (r"\.(xml|rss|csv)(\?|$)", HOUR),                          # feeds and exports
+    (r"/news-events/news/press-releases/\d{4}/", 30 * DAY),   # articles
+    (r"/legal-library/browse/cases-proceedings/.+", 7 * DAY),
+    (r"consumer\.ftc\.gov/.+", 7 * DAY),
+)
+DEFAULT_TTL = 0.0   # unknown URLs: always revalidate
+
+# Headers worth keeping to rebuild a response from disk.
+_KEEP_HEADERS = ("content-type", "etag", "last-modified", "content-language")
+
+
+class CachedEntry(NamedTuple):
+    url: str
+    status: int
+    headers: dict
+    body: bytes
+    encoding: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    def validators(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def response(self, request=None) -> requests.Response:
+        """Rebuild a ``requests.Response`` (marked ``from_cache``)."""
+        r = requests.Response()
+        r.status_code = self.status
+        r.url = self.url
+        r.headers = CaseInsensitiveDict(self.headers)
+        r._content = self.body
+        r.encoding = self.encoding
+        r.request = request
+        r.reason = "OK"
+        r.from_cache = True
+        return r
+
+
+class ResponseCache:
+    """SQLite-backed store of GET responses keyed by URL."""
+
+    def __init__(self, path=DEFAULT_HTTP_CACHE_PATH, ttls: Sequence[Tuple[str, float]] = DEFAULT_TTLS,
+                 default_ttl: float = DEFAULT_TTL):
+        self.path = Path(path)
+        self.rules = [(re.compile(pattern), float(ttl)) for pattern, ttl in ttls]
+        self.default_ttl = default_ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    encoding TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits (or rolls back) on exit and is then closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def ttl_for(self, url: str) -> float:
+        for pattern, ttl in self.rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def is_fresh(self, entry: CachedEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl_for(entry.url)
+
+    def get(self, url: str) -> Optional[CachedEntry]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT url, status, headers, body, encoding, etag, last_modified, fetched_at "
+                "FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        url, status, headers, body, encoding, etag, last_modified, fetched_at = row
+        return CachedEntry(url, status, json.loads(headers), bytes(body), encoding,
+                           etag, last_modified, fetched_at)
+
+    def put(self, url: str, response: requests.Response) -> bool:
+        """Store a 200 response; returns False if it may not be cached."""
+        if response.status_code != 200:
+            return False
+        if "no-store" in response.headers.get("Cache-Control", "").lower():
+            return False
+        headers = {k: v for k, v in response.headers.items() if k.lower() in _KEEP_HEADERS}
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, status, headers, body, encoding, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.status_code, json.dumps(headers), response.content,
+                 response.encoding, response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"), time.time()),
+            )
+        return True
+
+    def touch(self, url: str, response: requests.Response = None):
+        """Mark a revalidated entry as fresh, picking up any new validators."""
+        etag = response.headers.get("ETag") if response is not None else None
+        modified = response.headers.get("Last-Modified") if response is not None else None
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET fetched_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (time.time(), etag, modified, url),
+            )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
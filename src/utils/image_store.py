@@ -0,0 +1,189 @@
+"""
+Content-addressed image store for the Scrapy spiders.
+
+Images are stored once per content hash, whatever URL they came from:
+
+    <root>/full/ab/<sha256>.png
+    <root>/thumbs/<size name>/ab/<sha256>.jpg
+
+``<root>/manifest.sqlite`` links it together in three small tables: the
+stored images (hash -> path, size, dimensions), the URLs seen (URL -> hash,
+ETag, Last-Modified, fetch time) so known URLs need no download or only a
+conditional request, and which images each item uses.
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+}
+
+
+class UrlEntry(NamedTuple):
+    sha: str
+    path: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+def content_sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def extension_for(content_type: str, url: str) -> str:
+    ext = EXTENSIONS.get((content_type or "").split(";")[0].strip().lower())
+    if ext:
+        return ext
+    suffix = Path(url.split("?", 1)[0]).suffix.lower()
+    return suffix if suffix in EXTENSIONS.values() or suffix == ".jpeg" else ".img"
+
+
+def _atomic_write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def make_thumbnails(path: str, root: str, sha: str,
+                    sizes: Dict[str, Tuple[int, int]]) -> Tuple[int, int]:
+    """
+    Worker task: write a JPEG thumbnail per size for a stored image and
+    return its (width, height). Runs off the crawl thread; Pillow releases
+    the GIL while decoding and resizing.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        width, height = img.size
+        for name, size in sizes.items():
+            out = Path(root) / "thumbs" / name / sha[:2] / f"{sha}.jpg"
+            if out.exists():
+                continue
+            thumb = img.convert("RGB")
+            thumb.thumbnail(size)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            tmp = out.with_name(out.name + ".tmp")
+            thumb.save(tmp, "JPEG", quality=85)
+            os.replace(tmp, out)
+    return width, height
+
+
+class ImageStore:
+    """Stored images and their manifest under ``root``."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.root / "manifest.sqlite", timeout=30)
+        with self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS images (
+                    sha TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    width INTEGER,
+                    height INTEGER
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    sha TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS item_images (
+                    item_url TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    sha TEXT NOT NULL,
+                    PRIMARY KEY (item_url, position)
+                ) WITHOUT ROWID;
+                """
+            )
+
+    def close(self):
+        self._conn.close()
+
+    # -- lookups ---------------------------------------------------------
+
+    def url_entry(self, url: str) -> Optional[UrlEntry]:
+        """What ``url`` resolved to last time, if its image is still on disk."""
+        row = self._conn.execute(
+            "SELECT u.sha, i.path, u.etag, u.last_modified, u.fetched_at "
+            "FROM urls u JOIN images i ON i.sha = u.sha WHERE u.url = ?", (url,)
+        ).fetchone()
+        if row is None or not (self.root / row[1]).exists():
+            return None
+        return UrlEntry(*row)
+
+    def has_image(self, sha: str) -> Optional[str]:
+        row = self._conn.execute("SELECT path FROM images WHERE sha = ?", (sha,)).fetchone()
+        if row is None or not (self.root / row[0]).exists():
+            return None
+        return row[0]
+
+    # -- writes ----------------------------------------------------------
+
+    def put(self, data: bytes, content_type: str = "", url: str = "") -> Tuple[str, str, bool]:
+        """Store ``data`` once; returns (sha, relative path, newly written)."""
+        sha = content_sha(data)
+        path = self.has_image(sha)
+        if path is not None:
+            return sha, path, False
+        path = f"full/{sha[:2]}/{sha}{extension_for(content_type, url)}"
+        _atomic_write(self.root / path, data)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO images (sha, path, bytes) VALUES (?, ?, ?)",
+                (sha, path, len(data)),
+            )
+        return sha, path, True
+
+    def set_dimensions(self, sha: str, width: int, height: int):
+        with self._conn:
+            self._conn.execute("UPDATE images SET width = ?, height = ? WHERE sha = ?",
+                               (width, height, sha))
+
+    def record_url(self, url: str, sha: str, etag: str = None, last_modified: str = None):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO urls (url, sha, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, sha, etag, last_modified, time.time()),
+            )
+
+    def touch_url(self, url: str):
+        with self._conn:
+            self._conn.execute("UPDATE urls SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def link(self, item_url: str, shas: Iterable[str]):
+        """Record the images an item uses, in order (replacing earlier links)."""
+        with self._conn:
+            self._conn.execute("DELETE FROM item_images WHERE item_url = ?", (item_url,))
+            self._conn.executemany(
+                "INSERT INTO item_images (item_url, position, sha) VALUES (?, ?, ?)",
+                [(item_url, i, sha) for i, sha in enumerate(shas)],
+            )
+
+    def summary(self) -> dict:
+        images, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM images").fetchone()
+        urls = self._conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+        items = self._conn.execute("SELECT COUNT(DISTINCT item_url) FROM item_images").fetchone()[0]
+        return {"images": images, "bytes": total, "urls": urls, "items": items}
@@ -0,0 +1,362 @@
+"""
+Crash-safe JSONL output files.
+
+``JsonlStore`` wraps one JSONL file plus a small key index next to it
+(``<file>.idx``), so scrapers can append without rewriting:
+
+- ``append`` adds only records whose key (a field such as ``url``, or a
+  hash of the whole record) is not in the file yet, as a single write
+  followed by fsync. A torn last line from a crash is dropped on open
+  (a complete last record missing only its newline is kept), and
+  malformed lines elsewhere are skipped and counted in ``bad_lines``.
+- The index starts with a header naming the data file it describes (inode
+  plus a hash of its first bytes) and its last entry is checked against
+  the data on open, so a file replaced or rewritten by another tool gets
+  its index rebuilt instead of trusted.
+- ``write`` replaces the whole file atomically (temp file, fsync, rename),
+  so a crash leaves either the old or the new data, never half of it.
+- ``compact`` rewrites the file atomically as a deduplicated segment sorted
+  by key, keeping the newest version of each record. With
+  ``compact_ratio`` it runs automatically once superseded lines pile up.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+
+# Bytes of the data file hashed into the index header
+_HEAD_BYTES = 4096
+
+
+def record_hash(rec: dict) -> str:
+    data = json.dumps(rec, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _dumps(rec: dict) -> str:
+    return json.dumps(rec, ensure_ascii=False) + "\n"
+
+
+def _atomic_write(path: Path, lines: Iterable[str]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class JsonlStore:
+    """Append-only, deduplicated JSONL file with a persistent key index."""
+
+    def __init__(self, path, key: Optional[str] = "url", compact_ratio: Optional[float] = None):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.key = key
+        self.compact_ratio = compact_ratio
+        self._keys: Dict[str, int] = {}   # key -> line count seen (>1 means superseded copies)
+        self.superseded = 0
+        self.bad_lines = 0
+        self._head_len = 0   # data bytes covered by the index header's hash
+        self._load()
+
+    # -- keys and index -------------------------------------------------
+
+    def key_of(self, rec: dict) -> str:
+        """The record's ``key`` field, or a hash of the record without one."""
+        if self.key:
+            value = rec.get(self.key)
+            if value:
+                return str(value)
+        return record_hash(rec)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _repair_tail(self) -> int:
+        """
+        Finish the file's last line. A complete record that only lacks its
+        newline gets one; a partial line left by an interrupted append is
+        truncated.
+        """
+        size = self.path.stat().st_size
+        if size == 0:
+            return 0
+        with self.path.open("rb+") as f:
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return size
+            pos = size
+            while pos > 0:
+                step = min(65536, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                nl = chunk.rfind(b"\n")
+                if nl != -1:
+                    pos += nl + 1
+                    break
+            f.seek(pos)
+            try:
+                json.loads(f.read(size - pos))
+            except ValueError:
+                f.truncate(pos)
+                return pos
+            f.seek(size)
+            f.write(b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            return size + 1
+
+    def _load(self):
+        if not self.path.exists():
+            if self.index_path.exists():
+                self.index_path.unlink()
+            return
+        size = self._repair_tail()
+
+        covered = self._read_index(size)
+        if covered < size:
+            self._catch_up(covered)
+
+    def _identity(self, head_len: int = _HEAD_BYTES) -> str:
+        """Index header line: the data file's inode and a hash of its first bytes."""
+        with self.path.open("rb") as f:
+            head = f.read(head_len)
+            ino = os.fstat(f.fileno()).st_ino
+        digest = hashlib.blake2b(head, digest_size=16).hexdigest()
+        return f"#\t{ino}\t{len(head)}\t{digest}\n"
+
+    def _read_index(self, size: int) -> int:
+        """
+        Load keys from the index if it still describes the data file;
+        returns the data offset it covers (0 when it must be rebuilt).
+        """
+        if not self.index_path.exists():
+            return 0
+        covered, last_start, last_key = 0, 0, None
+        with self.index_path.open("r", encoding="utf-8") as f:
+            header = f.readline()
+            fields = header.rstrip("\n").split("\t")
+            if len(fields) != 4 or fields[0] != "#" or not fields[2].isdigit():
+                return 0
+            if self._identity(int(fields[2])) != header:
+                # Replaced or rewritten since the index was written
+                return 0
+            for line in f:
+                end, sep, key = line.rstrip("\n").partition("\t")
+                if not sep or not end.isdigit():
+                    continue
+                if int(end) > size:
+                    # Index is ahead of the data file: it was replaced.
+                    return self._forget()
+                self._count(key)
+                last_start, covered, last_key = covered, max(covered, int(end)), key
+        if last_key is not None:
+            # The last indexed line must still hold the record it names
+            with self.path.open("rb") as f:
+                f.seek(last_start)
+                try:
+                    rec = json.loads(f.read(covered - last_start))
+                except ValueError:
+                    return self._forget()
+            if not isinstance(rec, dict) or self.key_of(rec) != last_key:
+                return self._forget()
+        self._head_len = int(fields[2])
+        return covered
+
+    def _forget(self) -> int:
+        self._keys.clear()
+        self.superseded = 0
+        return 0
+
+    def _append_index(self, entries):
+        """
+        Append index entries. A new index, or one whose header hashed fewer
+        than _HEAD_BYTES of a file that has grown since, is rewritten with a
+        fresh header instead.
+        """
+        if self.index_path.exists() and self._head_len >= _HEAD_BYTES:
+            with self.index_path.open("a", encoding="utf-8") as f:
+                f.writelines(entries)
+            return
+        old = []
+        if self.index_path.exists():
+            with self.index_path.open("r", encoding="utf-8") as f:
+                old = f.readlines()[1:]
+        self._write_index(old + list(entries))
+
+    def _write_index(self, entries):
+        header = self._identity()
+        self._head_len = int(header.split("\t")[2])
+        _atomic_write(self.index_path, [header, *entries])
+
+    def _count(self, key: str):
+        n = self._keys.get(key, 0)
+        if n:
+            self.superseded += 1
+        self._keys[key] = n + 1
+
+    def _catch_up(self, offset: int):
+        """Index records written after ``offset`` (e.g. by a crash or another tool)."""
+        if offset == 0:
+            self._keys.clear()
+            self.superseded = 0
+        entries = []
+        with self.path.open("rb") as f:
+            f.seek(offset)
+            pos = offset
+            for raw in f:
+                pos += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    # Left in place for the caller to inspect; never indexed
+                    self.bad_lines += 1
+                    continue
+                key = self.key_of(rec)
+                self._count(key)
+                entries.append(f"{pos}\t{key}\n")
+        if offset == 0:
+            self._write_index(entries)
+        else:
+            self._append_index(entries)
+
+    # -- reading --------------------------------------------------------
+
+    def __iter__(self) -> Iterator[dict]:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def latest(self) -> Iterator[dict]:
+        """Each record once, in its newest version."""
+        newest: Dict[str, dict] = {}
+        for rec in self:
+            key = self.key_of(rec)
+            newest.pop(key, None)
+            newest[key] = rec
+        return iter(newest.values())
+
+    # -- writing --------------------------------------------------------
+
+    def append(self, rows: Iterable[dict], replace: bool = False) -> int:
+        """
+        Append ``rows`` whose key is not stored yet; returns how many were
+        written. With ``replace=True`` known keys are appended too, as newer
+        versions that win on ``latest`` and ``compact``.
+        """
+        lines, entries, batch = [], [], set()
+        for rec in rows:
+            key = self.key_of(rec)
+            if key in batch or (key in self._keys and not replace):
+                continue
+            batch.add(key)
+            lines.append(_dumps(rec).encode("utf-8"))
+            entries.append(key)
+        if not lines:
+            return 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as f:
+            start = f.tell()
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        pos = start
+        index = []
+        for line, key in zip(lines, entries):
+            pos += len(line)
+            index.append(f"{pos}\t{key}\n")
+            self._count(key)
+        self._append_index(index)
+
+        if self.compact_ratio is not None and self.superseded > self.compact_ratio * len(self._keys):
+            self.compact()
+        return len(lines)
+
+    def write(self, rows: Iterable[dict]) -> int:
+        """Atomically replace the file with ``rows`` (first copy of each key kept)."""
+        seen = set()
+        kept = []
+        for rec in rows:
+            key = self.key_of(rec)
+            if key not in seen:
+                seen.add(key)
+                kept.append((key, rec))
+        self._rewrite(kept)
+        return len(kept)
+
+    def compact(self, sort_key: Callable[[dict], object] = None) -> int:
+        """
+        Atomically rewrite the file as one deduplicated segment, sorted by
+        key (or ``sort_key(record)``), keeping the newest version of each
+        record. Returns the number of records kept.
+        """
+        records = [(self.key_of(rec), rec) for rec in self.latest()]
+        if sort_key is None:
+            records.sort(key=lambda kr: kr[0])
+        else:
+            records.sort(key=lambda kr: sort_key(kr[1]))
+        self._rewrite(records)
+        return len(records)
+
+    def _rewrite(self, keyed_records):
+        lines = [_dumps(rec) for _, rec in keyed_records]
+        # Drop the index first: a crash before it is rewritten only costs a
+        # rebuild on the next open, never a stale index over new data.
+        if self.index_path.exists():
+            self.index_path.unlink()
+        _atomic_write(self.path, lines)
+        pos = 0
+        index = []
+        for (key, _), line in zip(keyed_records, lines):
+            pos += len(line.encode("utf-8"))
+            index.append(f"{pos}\t{key}\n")
+        self._write_index(index)
+        self._keys = {key: 1 for key, _ in keyed_records}
+        self.superseded = 0
+
+
+def save_jsonl(path, rows):
+    """Atomically replace ``path`` with ``rows`` (any iterable; written as it is consumed)."""
+    path = Path(path)
+    index = path.with_name(path.name + ".idx")
+    if index.exists():
+        index.unlink()   # rebuilt on the next JsonlStore open
+    count = 0
+
+    def lines():
+        nonlocal count
+        for rec in rows:
+            count += 1
+            yield _dumps(rec)
+
+    _atomic_write(path, lines())
+    return count
+
+
+def append_jsonl(path, rows, key: Optional[str] = "url", replace: bool = False,
+                 compact_ratio: Optional[float] = 0.5) -> int:
+    """Append new ``rows`` to ``path``, skipping keys already stored."""
+    return JsonlStore(path, key=key, compact_ratio=compact_ratio).append(rows, replace=replace)
@@ -1,26 +1,33 @@
-import re
-from typing import Iterable, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-FRAUD_TERMS: List[str] = [
-    "fraud", "scam", "scams", "scammer", "scammers",
-    "phishing", 
-    "identity theft", "identity fraud"
-]
+from src.detect.cascade import FraudCascade
+from src.detect.matcher import get_matcher
+from src.detect.taxonomy import FRAUD_TAXONOMY, DocScan
 
-PATTERNS: List[re.Pattern] = [
-    re.compile(rf"\b{re.escape(term)}\b", re.IGNORECASE) for term in FRAUD_TERMS
-]
+FRAUD_TERMS: List[str] = list(FRAUD_TAXONOMY.terms_in("list", "scraper"))
 
-def find_hits(text: str) -> List[Tuple[str, Tuple[int, int]]]:
-    """Return [(term, (start, end)), ...] for each match."""
-    if not text:
-        return []
-    hits: List[Tuple[str, Tuple[int, int]]] = []
-    for term, pat in zip(FRAUD_TERMS, PATTERNS):
-        for m in pat.finditer(text):
-            hits.append((term, (m.start(), m.end())))
-    return hits
+_CASCADES: Dict[int, FraudCascade] = {}
+
+def find_hits(text: str, doc: Optional[DocScan] = None) -> List[Tuple[str, Tuple[int, int]]]:
+    """
+    Return [(term, (start, end)), ...] for each match. Pass ``doc`` (from
+    ``FRAUD_TAXONOMY.scan_doc(text)``) to read the spans of a scan already done.
+    """
+    if doc is None:
+        if not text:
+            return []
+        doc = FRAUD_TAXONOMY.scan_doc(text)
+    return [(term, (start, end))
+            for term, start, end in FRAUD_TAXONOMY.spans_in(doc.spans, "list", "scraper")]
+
+def fraud_cascade(min_hits: int = 1) -> FraudCascade:
+    """Shared FRAUD_TERMS cascade behind is_fraud; see its .report() for stage stats."""
+    cascade = _CASCADES.get(min_hits)
+    if cascade is None:
+        cascade = _CASCADES[min_hits] = FraudCascade(min_hits=min_hits,
+                                                     matcher=get_matcher(FRAUD_TERMS))
+    return cascade
 
 def is_fraud(text: str, *, min_hits: int = 1) -> bool:
     """True if text contains >= min_hits fraud-related terms."""
-    return len(find_hits(text)) >= min_hits
+    return fraud_cascade(min_hits).check(text)
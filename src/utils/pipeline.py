@@ -0,0 +1,311 @@
+"""
+Staged scrape pipeline for the requests-based scrapers.
+
+    jobs -> fetch threads -> [parse queue] -> process pool (parse + detect)
+         -> [write queue] -> single writer
+
+Fetch threads download pages while worker processes parse earlier ones
+with the scraper's ``parse`` function and score the record with
+``detect_fraud_for_record``, so slow parsing no longer holds up the next
+request and parsing uses every core. One writer thread hands finished
+records to ``write`` (e.g. progress output), so SQLite and output
+files only ever see a single writer.
+
+Every queue is bounded and at most ``2 * parse_workers`` pages are being
+parsed at once, so a slow stage blocks the stage before it instead of
+buffering pages in memory. With ``limit``, jobs are only started while
+they could still be needed and failures are topped up from the following
+jobs, so exactly the records the sequential loop would keep are fetched.
+Records come back in job order.
+"""
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.detect.fraud_detector import detect_fraud_for_record
+from src.detect.parallel import default_workers
+
+from .async_fetch import DEFAULT_RATE
+from .http import session
+
+DEFAULT_FETCH_WORKERS = 4
+DEFAULT_QUEUE_SIZE = 16
+
+_DONE = object()
+
+# A job is (url, meta); ``meta`` is passed through to ``parse`` (e.g. the listing title).
+Job = Tuple[str, dict]
+
+
+def parse_and_detect(parse, url: str, html: str, meta: dict, min_hits: int):
+    """Worker task: parse one page and score the record; returns (record, seconds)."""
+    start = time.perf_counter()
+    rec = parse(url, html, meta)
+    if rec is not None:
+        rec = detect_fraud_for_record(rec, min_hits)
+    return rec, time.perf_counter() - start
+
+
+def _worker_context():
+    # Fetch threads are already running when the pool starts: forking then
+    # could copy a held lock into a worker, so workers start fresh.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class StageStats:
+    """Items, busy time and queue depth for one pipeline stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.items = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_depth = 0
+        self._depth_total = 0
+        self._samples = 0
+
+    def record(self, seconds: float = 0.0, depth: int = 0, error: bool = False):
+        with self._lock:
+            if error:
+                self.errors += 1
+            else:
+                self.items += 1
+            self.seconds += seconds
+            self.max_depth = max(self.max_depth, depth)
+            self._depth_total += depth
+            self._samples += 1
+
+    def as_dict(self, wall: float) -> dict:
+        with self._lock:
+            return {
+                "items": self.items,
+                "errors": self.errors,
+                "busy_seconds": round(self.seconds, 3),
+                "per_second": round(self.items / wall, 2) if wall else 0.0,
+                "avg_queue_depth": round(self._depth_total / self._samples, 2) if self._samples else 0.0,
+                "max_queue_depth": self.max_depth,
+            }
+
+
+class HostPacer:
+    """Thread-safe per-host request pacing (at most ``rate`` requests/second)."""
+
+    def __init__(self, rate: float = DEFAULT_RATE):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next: Dict[str, float] = {}
+
+    def wait(self, url: str):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ScrapePipeline:
+    """
+    Fetch, parse/detect and write stages connected by bounded queues.
+
+    ``parse(url, html, meta)`` must be a module-level function (it runs in
+    worker processes) returning a record dict, or None to drop the page.
+    ``write(record)`` runs on the writer thread for every kept record.
+    """
+
+    def __init__(self, parse: Callable[[str, str, dict], Optional[dict]], sess=None,
+                 write: Callable[[dict], None] = None, fetch_workers: int = DEFAULT_FETCH_WORKERS,
+                 parse_workers: int = None, queue_size: int = DEFAULT_QUEUE_SIZE,
+                 rate: float = DEFAULT_RATE, min_hits: int = 2):
+        self.parse = parse
+        self.fetch_workers = max(1, fetch_workers)
+        self.sess = sess or session(pool_connections=self.fetch_workers,
+                                    pool_maxsize=self.fetch_workers)
+        self.write = write
+        self.parse_workers = parse_workers or default_workers()
+        self.queue_size = max(1, queue_size)
+        self.pacer = HostPacer(rate)
+        self.min_hits = min_hits
+        self.stats = {name: StageStats(name) for name in ("fetch", "parse", "write")}
+        self.wall = 0.0
+
+    # -- stages ------------------------------------------------------------
+
+    def _feed(self, jobs: Iterable[Job], fetch_q: queue.Queue, limit: Optional[int]):
+        seq = 0
+        try:
+            for url, meta in jobs:
+                if limit is not None:
+                    with self._cond:
+                        # Only start a job that could still be needed.
+                        while self._started - self._failed >= limit and self._kept < limit:
+                            self._cond.wait()
+                        if self._kept >= limit:
+                            break
+                        self._started += 1
+                fetch_q.put((seq, url, meta))
+                seq += 1
+        except Exception as e:
+            print(f"Error listing pages: {e}")
+        finally:
+            for _ in range(self.fetch_workers):
+                fetch_q.put(_DONE)
+
+    def _fetch(self, fetch_q: queue.Queue, parse_q: queue.Queue):
+        stats = self.stats["fetch"]
+        while True:
+            job = fetch_q.get()
+            if job is _DONE:
+                break
+            seq, url, meta = job
+            depth = fetch_q.qsize()
+            self.pacer.wait(url)
+            start = time.perf_counter()
+            try:
+                r = self.sess.get(url)
+                r.raise_for_status()
+                html = r.text
+            except Exception as e:
+                print(f"Error fetching {url}: {e}")
+                stats.record(time.perf_counter() - start, depth, error=True)
+                self._fail()
+                continue
+            stats.record(time.perf_counter() - start, depth)
+            parse_q.put((seq, url, meta, html))   # blocks while parsing is behind
+        with self._cond:
+            self._fetchers_left -= 1
+            last = self._fetchers_left == 0
+        if last:
+            parse_q.put(_DONE)
+
+    def _parse(self, parse_q: queue.Queue, write_q: queue.Queue):
+        stats = self.stats["parse"]
+
+        def finish(seq, url, result):
+            try:
+                rec, seconds = result()
+            except Exception as e:
+                print(f"Error parsing {url}: {e}")
+                stats.record(depth=parse_q.qsize(), error=True)
+                self._fail()
+                return
+            stats.record(seconds, parse_q.qsize())
+            write_q.put((seq, url, rec))          # blocks while the writer is behind
+
+        try:
+            if self.parse_workers <= 1:
+                while True:
+                    item = parse_q.get()
+                    if item is _DONE:
+                        break
+                    seq, url, meta, html = item
+                    finish(seq, url, partial(parse_and_detect, self.parse, url, html, meta,
+                                             self.min_hits))
+            else:
+                # Results are handed on as they complete; the semaphore keeps at
+                # most 2 * parse_workers pages in the pool.
+                slots = threading.BoundedSemaphore(2 * self.parse_workers)
+
+                def done(seq, url, fut):
+                    try:
+                        finish(seq, url, fut.result)
+                    finally:
+                        slots.release()
+
+                with ProcessPoolExecutor(max_workers=self.parse_workers,
+                                         mp_context=_worker_context()) as pool:
+                    while True:
+                        item = parse_q.get()
+                        if item is _DONE:
+                            break
+                        seq, url, meta, html = item
+                        slots.acquire()
+                        fut = pool.submit(parse_and_detect, self.parse, url, html, meta,
+                                          self.min_hits)
+                        fut.add_done_callback(partial(done, seq, url))
+        except BaseException as e:
+            self._error = e   # re-raised by run()
+        finally:
+            write_q.put(_DONE)
+
+    def _fail(self):
+        with self._cond:
+            self._failed += 1
+            self._cond.notify_all()
+
+    # -- driver ------------------------------------------------------------
+
+    def run(self, jobs: Iterable[Job], limit: int = None) -> List[dict]:
+        """Run ``jobs`` through the stages; returns the kept records in job order."""
+        self._cond = threading.Condition()
+        self._started = self._failed = self._kept = 0
+        self._fetchers_left = self.fetch_workers
+        self._error = None
+        fetch_q = queue.Queue(self.queue_size)
+        parse_q = queue.Queue(self.queue_size)
+        write_q = queue.Queue(self.queue_size)
+
+        threads = [threading.Thread(target=self._feed, args=(jobs, fetch_q, limit),
+                                    name="pipeline-feed", daemon=True)]
+        threads += [threading.Thread(target=self._fetch, args=(fetch_q, parse_q),
+                                     name=f"pipeline-fetch-{i}", daemon=True)
+                    for i in range(self.fetch_workers)]
+        threads.append(threading.Thread(target=self._parse, args=(parse_q, write_q),
+                                        name="pipeline-parse", daemon=True))
+
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+
+        # Writer stage runs on the calling thread.
+        stats = self.stats["write"]
+        kept = []
+        while True:
+            item = write_q.get()
+            if item is _DONE:
+                break
+            seq, url, rec = item
+            depth = write_q.qsize()
+            if rec is None:
+                stats.record(depth=depth, error=True)
+                self._fail()
+                continue
+            t0 = time.perf_counter()
+            if self.write is not None:
+                self.write(rec)
+            stats.record(time.perf_counter() - t0, depth)
+            kept.append((seq, rec))
+            with self._cond:
+                self._kept += 1
+                self._cond.notify_all()
+
+        if self._error is not None:
+            raise self._error
+        for t in threads:
+            t.join()
+        self.wall = time.perf_counter() - start
+        kept.sort(key=lambda sr: sr[0])
+        return [rec for _, rec in kept]
+
+    def report(self) -> dict:
+        return {"wall_seconds": round(self.wall, 3),
+                **{name: s.as_dict(self.wall) for name, s in self.stats.items()}}
+
+    def summary(self) -> str:
+        parts = []
+        for name, s in self.report().items():
+            if name == "wall_seconds":
+                continue
+            parts.append(f"{name} {s['items']} ({s['per_second']}/s, queue avg "
+                         f"{s['avg_queue_depth']} max {s['max_queue_depth']})")
+        return f"Pipeline ({self.wall:.1f}s): " + ", ".join(parts)